@@ -0,0 +1,304 @@
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from correlations import numeric_columns, split_column
+from game_store import DATA_PATH, CACHE_DIR, CHUNK_ROWS, SEASON_YEAR, derive_columns, grade_map, read_chunks
+
+STATE_PATH = os.path.join(CACHE_DIR, 'accumulator.npz')
+
+# Lexical order so ties in the most-common grade resolve like Series.mode()
+grade_vocab = sorted(grade_map)
+
+# Bytes of already-consumed CSV that are re-hashed to detect edits to history
+_GUARD_BYTES = 4096
+
+# Bytes read back from the end of the log at a time when looking for its last full row
+_TAIL_BYTES = 1 << 16
+
+
+class GameAccumulator:
+    """
+    Running per-result sums for every numeric column of the game log.
+
+    Partition 0 holds losses and partition 1 wins. Each game costs O(columns) to add
+    (O(columns^2) with track_cross), and every mean, win/loss split, most-common grade
+    and Win correlation the reports print is answered from the sums alone.
+    """
+
+    def __init__(self, columns, grade_columns=(), track_cross=False):
+        self.columns = list(columns)
+        self.grade_columns = list(grade_columns)
+        self.track_cross = track_cross
+
+        p = len(self.columns)
+        self.count = np.zeros((2, p))        # non-missing values per column
+        self.total = np.zeros((2, p))
+        self.total_sq = np.zeros((2, p))
+        self.cross = np.zeros((2, p, p)) if track_cross else None
+        self.grade_counts = np.zeros((2, len(self.grade_columns), len(grade_vocab)), dtype=np.int64)
+        self.games = np.zeros(2, dtype=np.int64)
+
+        # Where the last CSV ingest stopped (see update_from_csv)
+        self.source = {}
+
+    @classmethod
+    def from_frame(cls, df, track_cross=False):
+        grade_columns = [col for col in df.columns if col.endswith('_Grade')]
+        acc = cls(numeric_columns(df), grade_columns, track_cross=track_cross)
+        acc.add_games(df)
+        return acc
+
+    # -- updates -------------------------------------------------------------
+
+    def add_games(self, df):
+        """Fold a derived frame (see game_store.derive_columns) into the sums."""
+        if len(df) == 0:
+            return self
+        X = df[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        win = df['Win'].to_numpy().astype(bool)
+        present = ~np.isnan(X)
+        Xz = np.where(present, X, 0.0)
+
+        grades = None
+        if self.grade_columns:
+            codes = pd.Categorical(df[self.grade_columns].to_numpy().ravel(), categories=grade_vocab).codes
+            grades = codes.reshape(len(df), len(self.grade_columns))
+
+        for part in (0, 1):
+            rows = win if part else ~win
+            if not rows.any():
+                continue
+            self.games[part] += rows.sum()
+            self.count[part] += present[rows].sum(axis=0)
+            self.total[part] += Xz[rows].sum(axis=0)
+            self.total_sq[part] += (Xz[rows] ** 2).sum(axis=0)
+            if self.track_cross:
+                self.cross[part] += Xz[rows].T @ Xz[rows]
+            if grades is not None:
+                g = grades[rows]
+                for j in range(g.shape[1]):
+                    known = g[:, j] >= 0
+                    self.grade_counts[part, j] += np.bincount(g[known, j], minlength=len(grade_vocab))
+        return self
+
+    def add_game(self, row):
+        """Fold a single raw game (dict or Series keyed like a CSV row)."""
+        return self.add_games(derive_columns(pd.DataFrame([dict(row)])))
+
+    # -- queries -------------------------------------------------------------
+
+    def record(self):
+        return int(self.games[1]), int(self.games[0])
+
+    def means(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.total / self.count
+
+    def split_table(self):
+        """Avg_In_Wins / Avg_In_Losses / Difference / Correlation for every column."""
+        means = self.means()
+        players, stat_names = zip(*(split_column(col) for col in self.columns))
+        return pd.DataFrame({
+            'Column': self.columns,
+            'Player': list(players),
+            'Stat': list(stat_names),
+            'Avg_In_Wins': means[1],
+            'Avg_In_Losses': means[0],
+            'Difference': means[1] - means[0],
+            'Correlation': self.win_correlations(),
+        })
+
+    def win_correlations(self):
+        # Win is 0/1, so its sums are just the win counts per column
+        n = self.count.sum(axis=0)
+        sx = self.total.sum(axis=0)
+        sxx = self.total_sq.sum(axis=0)
+        sy = self.count[1]
+        sxy = self.total[1]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = n * sxy - sx * sy
+            var = (n * sxx - sx * sx) * (n * sy - sy * sy)
+            corr = cov / np.sqrt(var)
+        corr[~(var > 0)] = np.nan
+        return corr
+
+    def correlation_matrix(self):
+        if not self.track_cross:
+            raise ValueError('accumulator was built without track_cross=True')
+        # Pairwise counts are not tracked, so this assumes a log without missing values
+        n = self.games.sum()
+        sx = self.total.sum(axis=0)
+        cov = self.cross.sum(axis=0) - np.outer(sx, sx) / n
+        sd = np.sqrt(np.diag(cov))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = cov / np.outer(sd, sd)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def grade_modes(self):
+        """Most common letter grade per grade column in wins and losses."""
+        modes = {}
+        for j, col in enumerate(self.grade_columns):
+            modes[col] = tuple(
+                grade_vocab[int(np.argmax(counts))] if counts.any() else 'N/A'
+                for counts in (self.grade_counts[1, j], self.grade_counts[0, j])
+            )
+        return pd.DataFrame.from_dict(modes, orient='index', columns=['Mode_In_Wins', 'Mode_In_Losses'])
+
+    # -- persistence ---------------------------------------------------------
+
+    def save(self, path=STATE_PATH):
+        meta = {
+            'columns': self.columns,
+            'grade_columns': self.grade_columns,
+            'track_cross': self.track_cross,
+            'source': self.source,
+        }
+        arrays = dict(count=self.count, total=self.total, total_sq=self.total_sq,
+                      grade_counts=self.grade_counts, games=self.games,
+                      __meta__=np.array(json.dumps(meta)))
+        if self.track_cross:
+            arrays['cross'] = self.cross
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = path + '.tmp.npz'
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=STATE_PATH):
+        with np.load(path, allow_pickle=False) as z:
+            meta = json.loads(str(z['__meta__']))
+            acc = cls(meta['columns'], meta['grade_columns'], track_cross=meta['track_cross'])
+            acc.count, acc.total, acc.total_sq = z['count'], z['total'], z['total_sq']
+            acc.grade_counts, acc.games = z['grade_counts'], z['games']
+            if acc.track_cross:
+                acc.cross = z['cross']
+        acc.source = meta['source']
+        return acc
+
+    # -- CSV tailing ---------------------------------------------------------
+
+    def update_from_csv(self, path=DATA_PATH, chunk_rows=CHUNK_ROWS, frames=None):
+        """
+        Fold in only the rows appended to `path` since the last call.
+
+        The new rows are parsed `chunk_rows` at a time with the declared schema, so
+        folding a multi-season archive in from scratch never holds more than one chunk.
+        Only newline-terminated rows are read; a last row without its newline is picked
+        up once it has one. The derived new games are appended to the list `frames`
+        when one is given, for callers that keep the log in memory. Returns the number of games added, or None when the
+        already-consumed part of the file changed (an edited row) and the caller must
+        rebuild from scratch.
+        """
+        src = self.source
+        with open(path, 'rb') as f:
+            header = f.readline()
+            size = os.fstat(f.fileno()).st_size
+            # States saved before the year and row were kept can't carry them on: rebuild
+            if src and (src.get('header') != header.decode() or size < src['offset'] or 'rows' not in src):
+                return None
+            start = src['offset'] if src else f.tell()
+            if src:
+                f.seek(max(start - _GUARD_BYTES, 0))
+                if _digest(f.read(start - f.tell())) != src['guard']:
+                    return None
+            end = _last_row_end(f, start, size)
+
+        # Dates carry no year, so the span picks up the year, month and row count where
+        # the last one stopped (a span starting in January after December rolls over)
+        year, month = src.get('year', SEASON_YEAR), src.get('month')
+        rows = src.get('rows', 0)
+        added = 0
+        if end > start:
+            for chunk in read_chunks(path, chunk_rows, season_year=year, span=(start, end),
+                                     last_month=month, first_row=rows + 1):
+                chunk = derive_columns(chunk)
+                self.add_games(chunk)
+                if frames is not None:
+                    frames.append(chunk)
+                added += len(chunk)
+                stamps = chunk['Date'].dropna()
+                if len(stamps):
+                    year, month = int(stamps.iloc[-1].year), int(stamps.iloc[-1].month)
+        rows += added
+
+        offset = end
+        with open(path, 'rb') as f:
+            f.seek(max(offset - _GUARD_BYTES, 0))
+            guard = _digest(f.read(offset - f.tell()))
+        self.source = {'path': os.path.abspath(path), 'header': header.decode(),
+                       'offset': offset, 'guard': guard, 'year': year, 'month': month, 'rows': rows}
+        return added
+
+
+def _digest(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def _last_row_end(f, start, size):
+    # Only consume whole lines: an unterminated tail may be a row still being written
+    # (`...,W,10` before the rest of `103`), so it waits for the next call, however
+    # complete it looks. Reads back from the end of the file until it finds the last newline.
+    tail_start = size
+    while True:
+        tail_start = max(start, tail_start - _TAIL_BYTES)
+        f.seek(tail_start)
+        tail = f.read(size - tail_start)
+        cut = tail.rfind(b'\n') + 1
+        if cut or tail_start == start:
+            break
+    return tail_start + cut
+
+
+def state_path_for(path=DATA_PATH):
+    """Where the running sums of the log at `path` are saved; every log gets its own file."""
+    if os.path.abspath(path) == os.path.abspath(DATA_PATH):
+        return STATE_PATH
+    name = os.path.splitext(os.path.basename(path))[0]
+    key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f'accumulator_{name}_{key}.npz')
+
+
+def refresh(path=DATA_PATH, state_path=None, track_cross=False, chunk_rows=CHUNK_ROWS):
+    """Load the saved accumulator, fold in new CSV rows, save it and return it."""
+    state_path = state_path or state_path_for(path)
+    acc = None
+    if os.path.exists(state_path):
+        acc = GameAccumulator.load(state_path)
+        if acc.track_cross != track_cross or acc.update_from_csv(path, chunk_rows) is None:
+            acc = None
+    if acc is None:
+        # First run, or history was edited: rebuild from the full log, streamed in chunks
+        sample = derive_columns(next(read_chunks(path, 100)))
+        acc = GameAccumulator.from_frame(sample.iloc[:0], track_cross=track_cross)
+        acc.update_from_csv(path, chunk_rows)
+    acc.save(state_path)
+    return acc
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh running win/loss aggregates from the game log.')
+    parser.add_argument('--csv', default=DATA_PATH)
+    parser.add_argument('--state', default=None, help="saved sums (default: one file per log under data/.cache)")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="games parsed at a time")
+    args = parser.parse_args()
+
+    acc = refresh(args.csv, args.state, chunk_rows=args.chunk_rows)
+    wins, losses = acc.record()
+    table = acc.split_table()
+
+    print("=" * 80)
+    print(f"RECORD: {wins} Wins - {losses} Losses")
+    print("=" * 80)
+    print(table[['Column', 'Avg_In_Wins', 'Avg_In_Losses', 'Difference', 'Correlation']]
+          .to_string(index=False, float_format=lambda x: f'{x:.3f}'))
+    print()
+    print(acc.grade_modes().to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from correlations import numeric_columns, win_correlations
+from game_store import (CACHE_DIR, clear_cache, derive_columns, load_games, opponent_totals, read_chunks, read_log,
+                        stats, team_players)
+from memo import disabled as memo_disabled
+from significance import win_significance
+from splits import result_splits
+from synth import write_games
+from thresholds import threshold_columns, win_thresholds
+from tidy import melt_games, win_loss_means
+
+BENCH_DIR = os.path.join(CACHE_DIR, 'bench')
+RESULTS_DIR = './bench_results'
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# A stage this much slower than the baseline is reported as a regression
+REGRESSION_THRESHOLD = 1.25
+
+
+def timed(func, repeat=1):
+    """Best wall time of `repeat` calls, plus the last call's result."""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def synthetic_log(n_games, seed=0):
+    # Generated once per (size, seed) and reused by later runs
+    path = os.path.join(BENCH_DIR, f'games_{n_games}_seed{seed}.csv')
+    if not os.path.exists(path):
+        os.makedirs(BENCH_DIR, exist_ok=True)
+        write_games(path, n_games, seed=seed)
+    return path
+
+
+def _report_jobs(df, win_corr, win_sig, splits, thresholds):
+    # Every report's analysis and figure jobs, from shared intermediates (as pipeline.py does)
+    import final_data
+    import four_quad_char
+    import nba_player_update
+    import opp
+    import team_data
+    import team_stats
+
+    analyses = {
+        'team_stats': lambda: team_stats.analyze(df, win_corr, splits),
+        'team_data': lambda: team_data.analyze(df, win_corr),
+        'four_quad': lambda: four_quad_char.analyze(df, win_corr),
+        'opp': lambda: opp.analyze(df, splits, thresholds),
+        'final': lambda: final_data.analyze(df, win_corr, win_sig),
+        'build': lambda: nba_player_update.analyze(df, win_corr, win_sig, splits),
+    }
+    wins = df['Win'].sum()
+    losses = len(df) - wins
+    figures = {
+        'team_stats': lambda corr_splits: team_stats.figures(corr_splits[0]),
+        'team_data': lambda grade_corr_df: team_data.figures(df, grade_corr_df),
+        'four_quad': four_quad_char.figures,
+        'opp': lambda opp_df: opp.figures(df, opp_df),
+        'final': lambda result: final_data.figures(result[2], result[1], wins, losses,
+                                                   final_data.scoring_target(df, thresholds)),
+        'build': lambda analysis_df: nba_player_update.figures(
+            analysis_df, nba_player_update.recommend(analysis_df)),
+    }
+    return analyses, figures
+
+
+def bench_size(n_games, repeat=3, resamples=200, render=True, pairplot=False, seed=0):
+    """Time every stage of the analyses on a synthetic log of `n_games`; returns {stage: seconds}."""
+    path = synthetic_log(n_games, seed)
+    timings = {}
+
+    def stage(name, func, times=repeat):
+        timings[name], result = timed(func, times)
+        return result
+
+    # -- load --------------------------------------------------------------------
+    raw = stage('parse_csv', lambda: read_log(path))
+    stage('parse_chunks', lambda: sum(len(chunk) for chunk in read_chunks(path)))
+    stage('derive', lambda: derive_columns(raw.copy()))
+    stage('load_uncached', lambda: load_games(path, use_cache=False))
+    clear_cache(path)
+    stage('load_cache_write', lambda: load_games(path), times=1)
+    df = stage('load_cached', lambda: load_games(path))
+
+    # -- shared intermediates ----------------------------------------------------
+    stage('opponent_totals', lambda: opponent_totals(df))
+    win_corr = stage('correlate', lambda: win_correlations(df, numeric_columns(df)))
+    long_df = stage('melt', lambda: melt_games(df, stats=stats))
+    stage('win_loss_splits', lambda: win_loss_means(long_df))
+    splits = stage('result_splits', lambda: result_splits(df))
+    thresholds = stage('thresholds', lambda: win_thresholds(df, threshold_columns(), n_resamples=resamples, seed=0),
+                       times=1)
+    columns = ([f'{player}_{stat}' for player in team_players for stat in stats] +
+               [f'Opp_Total_{stat}' for stat in stats])
+    win_sig = stage('significance', lambda: win_significance(df, columns, n_resamples=resamples, seed=0), times=1)
+
+    # -- per-report analysis and rendering -----------------------------------------
+    analyses, figures = _report_jobs(df, win_corr, win_sig, splits, thresholds)
+    results = {name: stage(f'analyze.{name}', func) for name, func in analyses.items()}
+
+    if render:
+        from rendering import _render_one, use_headless
+
+        use_headless()
+        stage('import_plotting', lambda: __import__('matplotlib.pyplot'), times=1)
+        jobs = [job for name in analyses for job in figures[name](results[name])]
+        if pairplot:
+            import snsplot
+            jobs += snsplot.figures(snsplot.team_stat_frame(df))
+
+        out_dir = tempfile.mkdtemp(prefix='bench_render_')
+        try:
+            with warnings.catch_warnings():
+                # Emoji glyphs the default font lacks; the scripts themselves still show these
+                warnings.filterwarnings('ignore', message='Glyph .* missing')
+                for job in jobs:
+                    job = job._replace(path=os.path.join(out_dir, job.path))
+                    stage(f'render.{os.path.basename(job.path)}', lambda: _render_one(job), times=1)
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+    return timings
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """Rows of (size, stage, baseline s, current s, ratio) for stages present in both runs."""
+    rows = []
+    for size, timings in current['sizes'].items():
+        base = baseline['sizes'].get(size, {})
+        for name, seconds in timings.items():
+            if name in base:
+                rows.append((size, name, base[name], seconds, seconds / base[name] if base[name] else np.nan))
+    table = pd.DataFrame(rows, columns=['Games', 'Stage', 'Baseline_s', 'Current_s', 'Ratio'])
+    table['Regression'] = table['Ratio'] > threshold
+    return table
+
+
+def print_timings(results):
+    table = pd.DataFrame(results['sizes']).rename_axis('Stage')
+    print("=" * 80)
+    print("BENCHMARK (best of {repeat}, seconds)".format(repeat=results['repeat']))
+    print("=" * 80)
+    print(table.to_string(float_format=lambda x: f'{x:.4f}'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time load, analysis and rendering stages on synthetic logs.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="games per synthetic log")
+    parser.add_argument('--repeat', type=int, default=3, help="take the best of this many runs per stage")
+    parser.add_argument('--resamples', type=int, default=200, help="bootstrap/permutation resamples")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-render', action='store_true', help="skip the figure rendering stages")
+    parser.add_argument('--pairplot', action='store_true', help="also render the (slow) pairplot")
+    parser.add_argument('--out', help="results JSON (default: bench_results/bench_<timestamp>.json)")
+    parser.add_argument('--compare', metavar='BASELINE', help="results JSON from an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="slowdown ratio reported as a regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'repeat': args.repeat,
+        'resamples': args.resamples,
+        'seed': args.seed,
+        'sizes': {},
+    }
+    # Memoized analyses would time a pickle load, not the analysis
+    with memo_disabled():
+        for n_games in args.sizes:
+            results['sizes'][str(n_games)] = bench_size(n_games, args.repeat, args.resamples,
+                                                        render=not args.no_render, pairplot=args.pairplot,
+                                                        seed=args.seed)
+
+    print_timings(results)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"bench_{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(results, f, indent=1)
+    print(f"\nResults written to {out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        table = compare(results, baseline, args.threshold)
+        print("\n" + "=" * 80)
+        print(f"COMPARED WITH {args.compare}")
+        print("=" * 80)
+        print(table.to_string(index=False, float_format=lambda x: f'{x:.4f}'))
+        regressions = table[table['Regression']]
+        if len(regressions):
+            print(f"\n⚠️  {len(regressions)} stage(s) slower than {args.threshold}x baseline")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
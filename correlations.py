@@ -0,0 +1,126 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from instrument import timed
+
+_stat_col = re.compile(r'^(?P<player>.+)_(?P<stat>Grade|Points|Rebounds|Assists|FGM)(?P<numeric>_Numeric)?$')
+
+
+def numeric_columns(df, exclude=('Win', 'Game #')):
+    return [col for col in df.columns
+            if col not in exclude and pd.api.types.is_numeric_dtype(df[col])
+            and not pd.api.types.is_bool_dtype(df[col])]
+
+
+def split_column(col):
+    """'AbuTalibaan_Rebounds' -> ('AbuTalibaan', 'Rebounds'); Opp_Total_* -> ('Opponent', stat)."""
+    if col.startswith('Opp_Total_'):
+        return 'Opponent', col[len('Opp_Total_'):]
+    m = _stat_col.match(col)
+    if m:
+        return m['player'], m['stat']
+    return None, col
+
+
+def _as_matrix(df, columns):
+    return df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _standardize(X):
+    # Center and scale each column to unit norm; constant columns become NaN
+    Xc = X - X.mean(axis=0)
+    norms = np.sqrt((Xc * Xc).sum(axis=0))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return Xc / np.where(norms > 0, norms, np.nan)
+
+
+def _corr_with_missing(X, y):
+    # Pairwise-complete correlation of every column with y, still as matrix products
+    mask = ~np.isnan(X) & ~np.isnan(y)[:, None]
+    Xz = np.where(mask, X, 0.0)
+    yz = np.where(np.isnan(y), 0.0, y)
+    M = mask.astype(np.float64)
+
+    n = M.sum(axis=0)
+    sx = Xz.sum(axis=0)
+    sy = M.T @ yz
+    sxx = (Xz * Xz).sum(axis=0)
+    syy = M.T @ (yz * yz)
+    sxy = Xz.T @ yz
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = n * sxy - sx * sy
+        var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+        corr = cov / np.sqrt(var)
+    corr[(n < 2) | ~(var > 0)] = np.nan
+    return corr
+
+
+def corr_vector(X, y):
+    """Correlation of every column of X with y as one matrix-vector product."""
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if np.isnan(X).any() or np.isnan(y).any():
+        return _corr_with_missing(X, y)
+    return _standardize(X).T @ _standardize(y[:, None])[:, 0]
+
+
+@timed('correlate')
+def win_correlations(df, columns=None, target='Win'):
+    """
+    Correlate every stat column with `target` in a single BLAS product.
+
+    Returns a tidy frame with Column, Player, Stat and Correlation, in column order.
+    """
+    columns = list(columns) if columns is not None else numeric_columns(df, exclude=(target, 'Game #'))
+    corr = corr_vector(_as_matrix(df, columns), df[target].to_numpy(dtype=np.float64))
+
+    players, stat_names = zip(*(split_column(col) for col in columns)) if columns else ((), ())
+    return pd.DataFrame({
+        'Column': columns,
+        'Player': list(players),
+        'Stat': list(stat_names),
+        'Correlation': corr,
+    })
+
+
+def correlation_matrix(df, columns=None):
+    """Full stat x stat correlation matrix from one standardized Gram product."""
+    columns = list(columns) if columns is not None else numeric_columns(df, exclude=())
+    X = _as_matrix(df, columns)
+    if np.isnan(X).any():
+        # Fall back to pandas' pairwise-complete handling for gappy logs
+        return df[columns].corr()
+    Z = _standardize(X)
+    return pd.DataFrame(Z.T @ Z, index=columns, columns=columns)
+
+
+def select_columns(table, columns):
+    """Rows of a per-column table (win_correlations, win_significance) for `columns`, in order."""
+    return table.set_index('Column').loc[list(columns)].reset_index()
+
+
+def grouped_corr(frame, keys, x, y):
+    """
+    Correlation of column `x` with column `y` within every group of `keys`.
+
+    All groups come out of one grouped sum of (n, x, y, x*x, y*y, x*y), so thousands of
+    teams cost the same pass as one. Rows missing either value are left out of their group.
+    """
+    xs = frame[x].to_numpy(dtype=np.float64, na_value=np.nan)
+    ys = frame[y].to_numpy(dtype=np.float64, na_value=np.nan)
+    present = ~np.isnan(xs) & ~np.isnan(ys)
+    xs = np.where(present, xs, 0.0)
+    ys = np.where(present, ys, 0.0)
+    sums = pd.DataFrame({
+        'n': present.astype(np.float64), 'sx': xs, 'sy': ys,
+        'sxx': xs * xs, 'syy': ys * ys, 'sxy': xs * ys,
+    }, index=frame.index).groupby([frame[key] for key in keys], observed=True, sort=False).sum()
+
+    n, sx, sy = sums['n'], sums['sx'], sums['sy']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = (n * sums['sxx'] - sx * sx) * (n * sums['syy'] - sy * sy)
+        corr = (n * sums['sxy'] - sx * sy) / np.sqrt(var)
+    return corr.where((n >= 2) & (var > 0)).rename('Correlation')
@@ -0,0 +1,222 @@
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from game_store import DATA_PATH, file_signature, load_games
+
+HOST = '127.0.0.1'
+PORT = 8050
+CHART_DIR = '.'
+
+# Seconds between checks of the log and chart files for changes
+POLL_INTERVAL = 1.0
+
+# One prebuilt response: body bytes, gzip'd body (or None) and a strong ETag
+Response = namedtuple('Response', ['content_type', 'body', 'gzipped', 'etag'])
+
+# Everything a request can see, built in full before it replaces the previous snapshot
+Snapshot = namedtuple('Snapshot', ['version', 'created', 'signature', 'routes'])
+
+
+def _response(content_type, body, compress=True):
+    etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+    return Response(content_type, body, gzip.compress(body, 5) if compress else None, etag)
+
+
+def _json(frame_or_obj):
+    if isinstance(frame_or_obj, pd.DataFrame):
+        body = frame_or_obj.to_json(orient='records', double_precision=6)
+    else:
+        body = json.dumps(frame_or_obj)
+    return _response('application/json', body.encode())
+
+
+def sources_signature(path=DATA_PATH, chart_dir=CHART_DIR):
+    """What a snapshot was built from: the log's size/mtime and every chart's."""
+    charts = sorted(glob.glob(os.path.join(chart_dir, '*.png')))
+    return (tuple(file_signature(path).values()),
+            tuple((os.path.basename(chart), os.stat(chart).st_mtime_ns) for chart in charts))
+
+
+def build_tables(df):
+    """The dashboard's tables, from the same pipeline stages the reports use."""
+    import four_quad_char
+    import win_model
+    from pipeline import pipeline
+
+    results = pipeline.run(['correlate', 'significance', 'split', 'recommend', 'win_model', 'thresholds'],
+                           {'load': df})
+
+    sig = results['significance']
+    corr = sig[['Column', 'Player', 'Stat', 'Correlation', 'CI_Low', 'CI_High', 'P_Value']]
+    corr = corr.reindex(corr['Correlation'].abs().sort_values(ascending=False).index)
+
+    quad = four_quad_char.analyze(df, results['correlate'])
+    x_mid, y_mid = four_quad_char.midpoints(quad)
+    codes = four_quad_char.quadrant_codes(quad['Stat_Correlation'], quad['Grade_Correlation'], x_mid, y_mid)
+    quad = quad.assign(Quadrant=np.array([name for _, name, _ in four_quad_char.QUADRANTS])[codes])
+
+    analysis_df, recommendations = results['recommend']
+    notes = recommendations.set_index('Player')[['Build', 'Tier', 'Strengths', 'Weaknesses']]
+    builds = analysis_df.assign(Priority=np.arange(1, len(analysis_df) + 1)).join(notes, on='Player')
+
+    wins = int(df['Win'].sum())
+    return {
+        'summary': {
+            'games': len(df),
+            'wins': wins,
+            'losses': len(df) - wins,
+            'win_rate': wins / len(df) if len(df) else None,
+            'last_game': int(df['Game #'].max()) if len(df) else None,
+        },
+        'correlations': corr,
+        'splits': results['split'].reset_index(),
+        'quadrants': quad,
+        'builds': builds,
+        'win_model': win_model.coefficients(results['win_model']),
+        'thresholds': results['thresholds'],
+    }
+
+
+def _index_page(names, charts):
+    links = ''.join(f'<li><a href="/api/{name}">/api/{name}</a></li>' for name in names)
+    images = ''.join(f'<h3>{chart}</h3><img src="/charts/{chart}" style="max-width:100%">' for chart in charts)
+    return (f'<!doctype html><html><head><meta charset="utf-8"><title>Pro-Am Dashboard</title></head>'
+            f'<body><h1>Pro-Am Dashboard</h1><ul>{links}</ul>{images}</body></html>').encode()
+
+
+def build_snapshot(path=DATA_PATH, chart_dir=CHART_DIR, version=1):
+    signature = sources_signature(path, chart_dir)
+    tables = build_tables(load_games(path))
+    created = datetime.now().isoformat(timespec='seconds')
+    tables['summary'] = dict(tables['summary'], snapshot=version, created=created)
+
+    routes = {f'/api/{name}': _json(table) for name, table in tables.items()}
+    charts = []
+    for chart in sorted(glob.glob(os.path.join(chart_dir, '*.png'))):
+        with open(chart, 'rb') as f:
+            name = os.path.basename(chart)
+            routes[f'/charts/{name}'] = _response('image/png', f.read(), compress=False)
+            charts.append(name)
+    routes['/'] = _response('text/html; charset=utf-8', _index_page(list(tables), charts))
+    return Snapshot(version, created, signature, routes)
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        # One attribute read: the whole request is answered from a single snapshot
+        snapshot = self.server.snapshot
+        response = snapshot.routes.get(self.path.split('?', 1)[0])
+        if response is None:
+            body = json.dumps({'error': f'no such path; try {", ".join(sorted(snapshot.routes))}'}).encode()
+            response = Response('application/json', body, None, None)
+            self.send_response(404)
+        elif self.headers.get('If-None-Match') == response.etag:
+            self.send_response(304)
+            self.send_header('ETag', response.etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        else:
+            self.send_response(200)
+
+        body = response.body
+        if response.gzipped is not None and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = response.gzipped
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Type', response.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if response.etag:
+            self.send_header('ETag', response.etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Snapshot', str(snapshot.version))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DashboardServer(ThreadingHTTPServer):
+    """
+    Serves the prebuilt snapshot to any number of concurrent clients.
+
+    A background thread watches the log and charts; when they change it builds a new
+    snapshot off to the side and swaps it in with one assignment, so every request
+    sees either the old tables or the new ones, never a mix.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, path=DATA_PATH, chart_dir=CHART_DIR, interval=POLL_INTERVAL):
+        self.path = path
+        self.chart_dir = chart_dir
+        self.interval = interval
+        self.snapshot = build_snapshot(path, chart_dir)
+        self._stop = threading.Event()
+        super().__init__(address, DashboardHandler)
+
+    def refresh(self, force=False):
+        """Rebuild the snapshot if the log or any chart changed; returns True when it swapped."""
+        signature = sources_signature(self.path, self.chart_dir)
+        if not force and signature == self.snapshot.signature:
+            return False
+        self.snapshot = build_snapshot(self.path, self.chart_dir, self.snapshot.version + 1)
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                start = time.perf_counter()
+                if self.refresh():
+                    summary = json.loads(self.snapshot.routes['/api/summary'].body)
+                    print(f"Snapshot {self.snapshot.version}: {summary['wins']}-{summary['losses']} "
+                          f"(rebuilt in {time.perf_counter() - start:.2f}s)")
+            except (OSError, ValueError, KeyError) as e:
+                # A half-written log or chart; keep serving the last good snapshot
+                print(f"Snapshot refresh failed ({e}); retrying")
+
+    def serve_forever(self, poll_interval=0.5):
+        watcher = threading.Thread(target=self._watch, daemon=True)
+        watcher.start()
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self._stop.set()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the latest results and charts from memory.')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--csv', default=DATA_PATH, help="game log to watch")
+    parser.add_argument('--charts', default=CHART_DIR, help="folder of report PNGs to serve")
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help="seconds between change checks")
+    args = parser.parse_args(argv)
+
+    server = DashboardServer((args.host, args.port), args.csv, args.charts, args.interval)
+    print(f"Dashboard at http://{args.host}:{args.port}/ (snapshot {server.snapshot.version}, "
+          f"{len(server.snapshot.routes)} routes)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,93 +1,18 @@
+import argparse
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Load your data
-df = pd.read_csv('./data/pro_am_games.csv')
-df['Win'] = (df['Result'] == 'W').astype(int)
-
-# Get top offensive stats
-team_players = ['tymelxss', 'AbuTalibaan', 'Glo4Prezz', 'Yurselln', 'MajinKemboi']
-stats = ['Points', 'Rebounds', 'Assists', 'FGM']
-
-offensive_factors = []
-for player in team_players:
-    for stat in stats:
-        col_name = f"{player}_{stat}"
-        corr = df[col_name].corr(df['Win'])
-        offensive_factors.append({
-            'Factor': f"{player}\n{stat}",
-            'Correlation': corr,
-            'Type': 'Offense'
-        })
-
-# Get defensive vulnerabilities (opponent stats)
-for stat in stats:
-    df[f'Opp_Total_{stat}'] = (df[f'opp1_{stat}'] + df[f'opp2_{stat}'] + 
-                                 df[f'opp3_{stat}'] + df[f'opp4_{stat}'] + 
-                                 df[f'opp5_{stat}'])
-    corr = df[f'Opp_Total_{stat}'].corr(df['Win'])
-    offensive_factors.append({
-        'Factor': f"Opponent\n{stat}",
-        'Correlation': corr,
-        'Type': 'Defense'
-    })
 
-# Create DataFrame and get top factors
-all_factors = pd.DataFrame(offensive_factors)
-all_factors['Abs_Correlation'] = all_factors['Correlation'].abs()
-
-# Get top 5 offensive and top 4 defensive
-top_offense = all_factors[all_factors['Type'] == 'Offense'].nlargest(5, 'Correlation')
-top_defense = all_factors[all_factors['Type'] == 'Defense'].nsmallest(4, 'Correlation')
-
-# Combine
-key_factors = pd.concat([top_defense, top_offense]).reset_index(drop=True)
-
-# Create the comprehensive visualization
-fig = plt.figure(figsize=(16, 10))
-gs = fig.add_gridspec(3, 2, height_ratios=[2, 1, 1], hspace=0.4, wspace=0.3)
-
-# Main chart: What drives wins and losses
-ax1 = fig.add_subplot(gs[0, :])
-
-colors = ['#d32f2f' if x < 0 else '#388e3c' for x in key_factors['Correlation']]
-bars = ax1.barh(range(len(key_factors)), key_factors['Correlation'], 
-                color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
-
-ax1.set_yticks(range(len(key_factors)))
-ax1.set_yticklabels(key_factors['Factor'], fontsize=11, fontweight='bold')
-ax1.set_xlabel('Impact on Winning', fontsize=14, fontweight='bold')
-ax1.set_title('COMPLETE WINNING FORMULA: Top Offensive Strengths vs Defensive Weaknesses', 
-              fontsize=16, fontweight='bold', pad=20)
-ax1.axvline(x=0, color='black', linewidth=2)
-ax1.grid(axis='x', alpha=0.3)
-
-# Add value labels
-for i, (factor, corr, type_) in enumerate(zip(key_factors['Factor'], 
-                                                key_factors['Correlation'],
-                                                key_factors['Type'])):
-    label = f'{corr:.3f}'
-    ax1.text(corr + 0.03 if corr > 0 else corr - 0.03, i, label,
-             ha='left' if corr > 0 else 'right', va='center', 
-             fontweight='bold', fontsize=10)
-
-# Add section labels
-defense_end = len(top_defense) - 0.5
-ax1.axhline(y=defense_end, color='black', linestyle='--', linewidth=2, alpha=0.5)
-ax1.text(ax1.get_xlim()[0] * 0.95, len(key_factors) - 1, 'OFFENSIVE\nSTRENGTHS', 
-         fontsize=12, fontweight='bold', ha='left', va='top', 
-         bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.7))
-ax1.text(ax1.get_xlim()[0] * 0.95, 0, 'DEFENSIVE\nWEAKNESSES', 
-         fontsize=12, fontweight='bold', ha='left', va='bottom',
-         bbox=dict(boxstyle='round', facecolor='lightcoral', alpha=0.7))
-
-# Bottom left: Key takeaways
-ax2 = fig.add_subplot(gs[1, 0])
-ax2.axis('off')
-
-takeaways = """
+from correlations import select_columns, win_correlations
+from game_store import add_log_args, load_games, team_players, stats
+from instrument import add_profile_args, profile_from_args, timed
+from memo import memoized
+from rendering import FigureJob, add_render_args, render_from_args
+from significance import win_significance
+from thresholds import win_thresholds
+import win_model
+
+TAKEAWAYS = """
 🎯 KEY TAKEAWAYS:
 
 1️⃣ DEFENSE > OFFENSE
@@ -99,24 +24,16 @@ takeaways = """
    • tymelxss: Facilitate, don't force shots
    
 3️⃣ DEFENSIVE PRIORITY:
-   • Hold teams under 62 points to win
+   • Hold teams under {target} points to win
    • Contest shots (limit FGM)
    • Disrupt ball movement (limit assists)
 """
 
-ax2.text(0.05, 0.95, takeaways, transform=ax2.transAxes,
-         fontsize=11, verticalalignment='top', fontfamily='monospace',
-         bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
-
-# Bottom right: Win formula
-ax3 = fig.add_subplot(gs[1, 1])
-ax3.axis('off')
-
-formula = """
+FORMULA = """
 🏆 WINNING FORMULA:
 
 ✅ DEFENSE FIRST:
-   Hold opponents < 62 pts
+   Hold opponents < {target} pts
 
 ✅ REBOUND:
    Abu + Glo dominate glass
@@ -131,62 +48,214 @@ formula = """
 🎯 Goal: Use data to go on a run!
 """
 
-ax3.text(0.05, 0.95, formula, transform=ax3.transAxes,
-         fontsize=11, verticalalignment='top', fontfamily='monospace',
-         bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
-
-# Stats comparison box
-ax4 = fig.add_subplot(gs[2, :])
-ax4.axis('off')
-
-# Calculate key numbers
-wins = df['Win'].sum()
-losses = len(df) - wins
-avg_opp_pts_win = df[df['Win']==1][[f'opp{i}_Points' for i in range(1,6)]].sum(axis=1).mean()
-avg_opp_pts_loss = df[df['Win']==0][[f'opp{i}_Points' for i in range(1,6)]].sum(axis=1).mean()
-
-stats_summary = f"""
+STATS_SUMMARY = """
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-RECORD: {wins}-{losses}  |  BIGGEST CORRELATION: Opponent Points (-0.748)  |  TARGET: Hold opponents < 62 points per game
+RECORD: {wins}-{losses}  |  BIGGEST CORRELATION: Opponent Points (-0.748)  |  TARGET: Hold opponents < {target} points per game
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 """
 
-ax4.text(0.5, 0.5, stats_summary, transform=ax4.transAxes,
-         fontsize=11, ha='center', va='center', fontfamily='monospace',
-         bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.3))
-
-plt.savefig('complete_winning_formula.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-# Print summary
-print("\n" + "=" * 90)
-print(" " * 25 + "🏀 COMPLETE ANALYSIS SUMMARY 🏀")
-print("=" * 90)
-print(f"\nCURRENT RECORD: {wins} Wins - {losses} Losses (9-9)\n")
-
-print("TOP 5 OFFENSIVE FACTORS (What WE do to win):")
-print("-" * 90)
-for i, row in top_offense.iterrows():
-    print(f"  {row['Factor'].replace(chr(10), ' ')}: {row['Correlation']:+.3f}")
-
-print("\nTOP 4 DEFENSIVE VULNERABILITIES (What OPPONENTS do to beat us):")
-print("-" * 90)
-for i, row in top_defense.iterrows():
-    print(f"  {row['Factor'].replace(chr(10), ' ')}: {row['Correlation']:+.3f}")
-
-print("\n" + "=" * 90)
-print("💡 THE BOTTOM LINE:")
-print("=" * 90)
-print("""
+BOTTOM_LINE = """
 Defense matters MORE than offense. The opponent scoring correlation (-0.748) is nearly 
 TWICE as strong as your best offensive stat (Abu Rebounds: +0.471).
 
 GAME PLAN:
-1. DEFENSE FIRST - Hold teams under 62 points
+1. DEFENSE FIRST - Hold teams under {target} points
 2. Abu & Glo - Dominate the boards  
 3. tymelxss - Facilitate over scoring
 4. Everyone - Energy, communication, contest shots
 
 Apply these insights and watch your record improve! 📈
-""")
-print("=" * 90)
\ No newline at end of file
+"""
+
+# The opponent total the scoring target is read from
+TARGET_COLUMN = 'Opp_Total_Points'
+
+# How print_report() names one more of each stat
+UNIT_NAMES = {'Points': 'point', 'Rebounds': 'rebound', 'Assists': 'assist', 'FGM': 'make'}
+
+
+@timed('analyze.final')
+@memoized('final')
+def analyze(df, win_corr=None, win_sig=None, model=None):
+    # Correlate our stats (offense) and opponent totals (defense) with wins in one pass
+    columns = ([f"{player}_{stat}" for player in team_players for stat in stats] +
+               [f'Opp_Total_{stat}' for stat in stats])
+    if win_corr is None:
+        win_corr = win_correlations(df, columns)
+    win_corr = select_columns(win_corr, columns)
+
+    # Bootstrap CIs and permutation p-values (18 games is a small sample)
+    if win_sig is None:
+        win_sig = win_significance(df, columns, seed=0)
+    win_sig = select_columns(win_sig, columns)
+
+    # Create DataFrame and get top factors
+    all_factors = pd.DataFrame({
+        'Factor': win_corr['Player'] + '\n' + win_corr['Stat'],
+        'Correlation': win_corr['Correlation'],
+        'Type': np.where(win_corr['Player'] == 'Opponent', 'Defense', 'Offense'),
+        'CI_Low': win_sig['CI_Low'],
+        'CI_High': win_sig['CI_High'],
+        'P_Value': win_sig['P_Value'],
+    })
+    all_factors['Abs_Correlation'] = all_factors['Correlation'].abs()
+
+    # Get top 5 offensive and top 4 defensive
+    top_offense = all_factors[all_factors['Type'] == 'Offense'].nlargest(5, 'Correlation')
+    top_defense = all_factors[all_factors['Type'] == 'Defense'].nsmallest(4, 'Correlation')
+
+    # Combine
+    key_factors = pd.concat([top_defense, top_offense]).reset_index(drop=True)
+
+    # All stats in one logistic model, so collinear ones (Points/FGM) split their credit;
+    # warm-started from the last saved fit
+    if model is None:
+        model, _ = win_model.refit(df)
+    model_coef = win_model.coefficients(model)
+    model_coef = model_coef.reindex(model_coef['Coefficient'].abs().sort_values(ascending=False).index)
+
+    return top_offense, top_defense, key_factors, model_coef
+
+
+def scoring_target(df, thresholds=None):
+    """The 'hold opponents under N points' number: the best win-rate cutoff on opponent points."""
+    if thresholds is None:
+        thresholds = win_thresholds(df, [TARGET_COLUMN], seed=0)
+    row = thresholds.set_index('Column').loc[TARGET_COLUMN]
+    if row['Direction'] == '<':
+        return f"{row['Cutoff']:g}"
+    # No cutoff below which we win more often; fall back to what opponents score in our wins
+    return f"{df.loc[df['Win'], TARGET_COLUMN].mean():.0f}"
+
+
+def plot_winning_formula(key_factors, top_defense, wins, losses, target):
+    import matplotlib.pyplot as plt
+
+    # Create the comprehensive visualization
+    fig = plt.figure(figsize=(16, 10))
+    gs = fig.add_gridspec(3, 2, height_ratios=[2, 1, 1], hspace=0.4, wspace=0.3)
+
+    # Main chart: What drives wins and losses
+    ax1 = fig.add_subplot(gs[0, :])
+
+    colors = ['#d32f2f' if x < 0 else '#388e3c' for x in key_factors['Correlation']]
+    bars = ax1.barh(range(len(key_factors)), key_factors['Correlation'], 
+                    color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
+
+    ax1.set_yticks(range(len(key_factors)))
+    ax1.set_yticklabels(key_factors['Factor'], fontsize=11, fontweight='bold')
+    ax1.set_xlabel('Impact on Winning', fontsize=14, fontweight='bold')
+    ax1.set_title('COMPLETE WINNING FORMULA: Top Offensive Strengths vs Defensive Weaknesses', 
+                  fontsize=16, fontweight='bold', pad=20)
+    ax1.axvline(x=0, color='black', linewidth=2)
+    ax1.grid(axis='x', alpha=0.3)
+
+    # Add value labels
+    for i, (factor, corr, type_) in enumerate(zip(key_factors['Factor'], 
+                                                    key_factors['Correlation'],
+                                                    key_factors['Type'])):
+        label = f'{corr:.3f}'
+        ax1.text(corr + 0.03 if corr > 0 else corr - 0.03, i, label,
+                 ha='left' if corr > 0 else 'right', va='center', 
+                 fontweight='bold', fontsize=10)
+
+    # Add section labels
+    defense_end = len(top_defense) - 0.5
+    ax1.axhline(y=defense_end, color='black', linestyle='--', linewidth=2, alpha=0.5)
+    ax1.text(ax1.get_xlim()[0] * 0.95, len(key_factors) - 1, 'OFFENSIVE\nSTRENGTHS', 
+             fontsize=12, fontweight='bold', ha='left', va='top', 
+             bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.7))
+    ax1.text(ax1.get_xlim()[0] * 0.95, 0, 'DEFENSIVE\nWEAKNESSES', 
+             fontsize=12, fontweight='bold', ha='left', va='bottom',
+             bbox=dict(boxstyle='round', facecolor='lightcoral', alpha=0.7))
+
+    # Bottom left: Key takeaways
+    ax2 = fig.add_subplot(gs[1, 0])
+    ax2.axis('off')
+
+    takeaways = TAKEAWAYS.format(target=target)
+
+    ax2.text(0.05, 0.95, takeaways, transform=ax2.transAxes,
+             fontsize=11, verticalalignment='top', fontfamily='monospace',
+             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+
+    # Bottom right: Win formula
+    ax3 = fig.add_subplot(gs[1, 1])
+    ax3.axis('off')
+
+    formula = FORMULA.format(target=target)
+
+    ax3.text(0.05, 0.95, formula, transform=ax3.transAxes,
+             fontsize=11, verticalalignment='top', fontfamily='monospace',
+             bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
+
+    # Stats comparison box
+    ax4 = fig.add_subplot(gs[2, :])
+    ax4.axis('off')
+
+    stats_summary = STATS_SUMMARY.format(wins=wins, losses=losses, target=target)
+
+    ax4.text(0.5, 0.5, stats_summary, transform=ax4.transAxes,
+             fontsize=11, ha='center', va='center', fontfamily='monospace',
+             bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.3))
+    return fig
+
+
+def print_report(top_offense, top_defense, wins, losses, target, model_coef=None):
+    print("\n" + "=" * 90)
+    print(" " * 25 + "🏀 COMPLETE ANALYSIS SUMMARY 🏀")
+    print("=" * 90)
+    print(f"\nCURRENT RECORD: {wins} Wins - {losses} Losses (9-9)\n")
+
+    print("TOP 5 OFFENSIVE FACTORS (What WE do to win):")
+    print("-" * 90)
+    for i, row in top_offense.iterrows():
+        print(f"  {row['Factor'].replace(chr(10), ' ')}: {row['Correlation']:+.3f}"
+              f"  (95% CI {row['CI_Low']:+.2f} to {row['CI_High']:+.2f}, p={row['P_Value']:.3f})")
+
+    print("\nTOP 4 DEFENSIVE VULNERABILITIES (What OPPONENTS do to beat us):")
+    print("-" * 90)
+    for i, row in top_defense.iterrows():
+        print(f"  {row['Factor'].replace(chr(10), ' ')}: {row['Correlation']:+.3f}"
+              f"  (95% CI {row['CI_Low']:+.2f} to {row['CI_High']:+.2f}, p={row['P_Value']:.3f})")
+
+    if model_coef is not None:
+        print("\nWIN MODEL (all stats together; log-odds per standard deviation):")
+        print("-" * 90)
+        for _, row in model_coef.head(8).iterrows():
+            print(f"  {row['Player']} {row['Stat']}: {row['Coefficient']:+.3f}"
+                  f"  (odds x{row['Odds_Ratio']:.2f} per extra {UNIT_NAMES.get(row['Stat'], 'unit')})")
+
+    print("\n" + "=" * 90)
+    print("💡 THE BOTTOM LINE:")
+    print("=" * 90)
+    print(BOTTOM_LINE.format(target=target))
+    print("=" * 90)
+
+
+def figures(key_factors, top_defense, wins, losses, target):
+    return [FigureJob('complete_winning_formula.png', plot_winning_formula,
+                      (key_factors, top_defense, wins, losses, target))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Complete winning formula dashboard.')
+    args = add_log_args(add_profile_args(add_render_args(parser))).parse_args(argv)
+
+    with profile_from_args(args, 'final_data'):
+        # Load your data
+        df = load_games(args.log)
+
+        top_offense, top_defense, key_factors, model_coef = analyze(df)
+
+        # Calculate key numbers
+        wins = df['Win'].sum()
+        losses = len(df) - wins
+        target = scoring_target(df)
+
+        render_from_args(figures(key_factors, top_defense, wins, losses, target), args)
+        print_report(top_offense, top_defense, wins, losses, target, model_coef)
+
+
+if __name__ == '__main__':
+    main()
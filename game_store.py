@@ -0,0 +1,543 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from instrument import stage
+
+try:
+    import pyarrow  # noqa: F401  (only needed for pandas' multithreaded CSV engine)
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+DATA_PATH = './data/pro_am_games.csv'
+CACHE_DIR = './data/.cache'
+
+team_players = ['tymelxss', 'AbuTalibaan', 'Glo4Prezz', 'Yurselln', 'MajinKemboi']
+opp_players = [f'opp{i}' for i in range(1, 6)]
+stats = ['Points', 'Rebounds', 'Assists', 'FGM']
+
+# Convert letter grades to numerical values
+grade_map = {
+    'A+': 4.3, 'A': 4.0, 'A-': 3.7,
+    'B+': 3.3, 'B': 3.0, 'B-': 2.7,
+    'C+': 2.3, 'C': 2.0, 'C-': 1.7,
+    'D+': 1.3, 'D': 1.0, 'D-': 0.7,
+    'F': 0.0
+}
+
+# Grades are stored as an ordered categorical; its codes index grade_points
+grade_order = sorted(grade_map, key=grade_map.get)
+grade_dtype = pd.CategoricalDtype(grade_order, ordered=True)
+grade_points = np.array([grade_map[grade] for grade in grade_order], dtype=np.float32)
+result_dtype = pd.CategoricalDtype(['L', 'W'])
+
+# Dates in the log carry no year: the first game is taken to fall in this year,
+# and every time the month goes backwards (Dec -> Jan) the year rolls over.
+SEASON_YEAR = 2025
+DATE_FORMAT = '%m/%d %I:%M%p'
+
+# Bump this whenever derive_columns() changes so stale caches are rebuilt
+CACHE_VERSION = 2
+
+# Games per chunk when streaming a log (read_chunks)
+CHUNK_ROWS = 100_000
+
+# Bad cells quoted in a SchemaError or warning; the rest are counted
+_REPORT_LIMIT = 10
+_PROBLEM_COLUMNS = ['Row', 'Column', 'Value', 'Problem']
+
+
+class SchemaError(ValueError):
+    """A game log broke the declared schema; `problems` has one row per bad cell."""
+
+    def __init__(self, problems, source='game log'):
+        self.problems = problems
+        super().__init__(f"{len(problems)} value(s) in {source} break the schema:\n"
+                         + describe_problems(problems))
+
+
+def grade_codes(values):
+    """Codes into grade_order for a 2D block (or 1D array) of letter grades; -1 where unknown."""
+    values = np.asarray(values, dtype=object)
+    # One hash pass over every grade cell instead of a .map per column
+    codes = pd.Categorical(values.ravel(), dtype=grade_dtype).codes
+    return codes.reshape(values.shape)
+
+
+def grade_numeric(codes):
+    """grade_points lookup for grade codes; unknown grades become NaN."""
+    codes = np.asarray(codes)
+    return np.where(codes >= 0, grade_points[codes], np.float32(np.nan))
+
+
+def count_dtype(values):
+    # Smallest unsigned type that holds every count; float32 once anything is missing
+    if np.isnan(values).any():
+        return np.float32
+    if len(values) and values.min() < 0:
+        return np.int32
+    top = values.max() if len(values) else 0
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if top <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def parse_dates(dates, season_year=SEASON_YEAR, last_month=None):
+    """
+    Parse 'MM/DD h:mmpm' stamps, inferring the year from month rollovers.
+
+    `last_month` is the month of the game just before these (when parsing a log in
+    chunks), so a chunk that starts in January after a December one moves up a year.
+    """
+    dates = pd.Series(dates).astype(str).str.strip()
+    month = pd.to_numeric(dates.str.extract(r'^(\d{1,2})/', expand=False), errors='coerce').to_numpy()
+    # A month lower than the previous game's means the season crossed New Year
+    first = bool(last_month is not None and len(month) and month[0] < last_month)
+    rollover = np.concatenate([[first], np.diff(month) < 0]).cumsum()
+    years = pd.Series(season_year + rollover, index=dates.index).astype(str)
+    return pd.to_datetime(years + ' ' + dates, format='%Y ' + DATE_FORMAT, errors='coerce')
+
+
+def format_dates(stamps):
+    """Timestamps as the log's own 'MM/DD h:mmpm' text (no year, no leading zero on the hour)."""
+    stamps = pd.Series(stamps)
+    hour = stamps.dt.hour
+    text = (stamps.dt.month.astype(str).str.zfill(2) + '/' + stamps.dt.day.astype(str).str.zfill(2) + ' '
+            + ((hour + 11) % 12 + 1).astype(str) + ':' + stamps.dt.minute.astype(str).str.zfill(2)
+            + np.where(hour < 12, 'am', 'pm'))
+    return text.where(stamps.notna(), '').to_numpy()
+
+
+def apply_schema(df, season_year=SEASON_YEAR):
+    """
+    Convert a raw game frame to the compact typed layout in one pass per column group:
+    grades -> ordered categorical, counts -> smallest unsigned int, Result -> categorical,
+    Date -> timestamps.
+    """
+    grade_cols = [col for col in df.columns if col.endswith('_Grade')]
+    count_cols = [col for col in df.columns
+                  if col not in grade_cols and col not in ('Date', 'Result')
+                  and pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])]
+
+    typed = {}
+    # Columns read through the declared schema (read_log) already hold grade_dtype
+    grade_cols = [col for col in grade_cols if df[col].dtype != grade_dtype]
+    if grade_cols:
+        codes = grade_codes(df[grade_cols].to_numpy())
+        for j, col in enumerate(grade_cols):
+            typed[col] = pd.Categorical.from_codes(codes[:, j], dtype=grade_dtype)
+    if count_cols:
+        block = df[count_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        for j, col in enumerate(count_cols):
+            typed[col] = block[:, j].astype(count_dtype(block[:, j]))
+    if 'Result' in df:
+        typed['Result'] = pd.Categorical(df['Result'], dtype=result_dtype)
+    if 'Date' in df and not pd.api.types.is_datetime64_any_dtype(df['Date']):
+        typed['Date'] = parse_dates(df['Date'], season_year).to_numpy()
+
+    return df.assign(**typed)
+
+
+def column_kind(col):
+    """The declared type of a log column: date, number (Game #), result, grade or count."""
+    if col == 'Date':
+        return 'date'
+    if col == 'Game #':
+        return 'number'
+    if col == 'Result':
+        return 'result'
+    return 'grade' if col.endswith('_Grade') else 'count'
+
+
+def csv_dtypes(columns, strict=True):
+    """
+    read_csv dtypes for the log's columns, so nothing is inferred from the text.
+
+    Grades and Result are read as categories (one string per distinct value, not per
+    cell) and counts as float32. With strict=False numbers are read as text, which
+    lets check_schema() report a stray 'x' in a count instead of the parser failing.
+    """
+    kinds = {'date': str, 'result': 'category', 'grade': 'category',
+             'number': np.float64 if strict else str, 'count': np.float32 if strict else str}
+    return {col: kinds[column_kind(col)] for col in columns}
+
+
+def _vocab_check(values, vocab, dtype):
+    # Category codes of the values in `vocab`, plus a mask of cells outside it
+    values = values.astype('category')
+    outside = np.append(~values.cat.categories.isin(vocab), False)
+    codes = values.cat.codes.to_numpy()
+    return values.cat.set_categories(dtype.categories, ordered=dtype.ordered), outside[codes]
+
+
+def _numbers(values):
+    # Float values plus a mask of cells that were given but aren't numbers
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=np.float64, na_value=np.nan), np.zeros(len(values), dtype=bool)
+    numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    given = values.notna().to_numpy() & (values.astype(str).str.strip() != '').to_numpy()
+    return numbers, given & np.isnan(numbers)
+
+
+def check_schema(raw, first_row=1, season_year=SEASON_YEAR, last_month=None):
+    """
+    Validate a frame read with csv_dtypes() and type it; returns (typed, problems).
+
+    The declared schema: Result is W or L, grades come from grade_map, counts are
+    whole and non-negative (blank is allowed), Game # is a whole number and Date
+    parses. Each check is one mask over a column, and `problems` has a row per bad
+    cell (Row, counted from `first_row`, Column, Value, Problem). Bad cells come back
+    missing in `typed`.
+    """
+    typed, found = {}, []
+    for col in raw.columns:
+        kind = column_kind(col)
+        if kind == 'grade':
+            typed[col], bad = _vocab_check(raw[col], grade_order, grade_dtype)
+            problem = 'is not a letter grade'
+        elif kind == 'result':
+            typed[col], bad = _vocab_check(raw[col], result_dtype.categories, result_dtype)
+            bad |= raw[col].isna().to_numpy()
+            problem = 'must be W or L'
+        elif kind == 'date':
+            stamps = parse_dates(raw[col], season_year, last_month)
+            typed[col] = stamps.to_numpy()
+            bad = stamps.isna().to_numpy()
+            problem = 'is not a date like 11/29 12:23pm'
+            last_month = None
+        else:
+            numbers, bad = _numbers(raw[col])
+            with np.errstate(invalid='ignore'):
+                bad |= (numbers < 0) | (numbers % 1 > 0)
+            if kind == 'number':
+                bad |= np.isnan(numbers)
+            typed[col] = np.where(bad, np.nan, numbers).astype(np.float32 if kind == 'count' else np.float64)
+            problem = 'is not a game number' if kind == 'number' else 'is not a count'
+        rows = np.flatnonzero(bad)
+        if len(rows):
+            found.append(pd.DataFrame({'Row': first_row + rows, 'Column': col,
+                                       'Value': raw[col].to_numpy()[rows].astype(str), 'Problem': problem}))
+
+    if not found:
+        return raw.assign(**typed), pd.DataFrame(columns=_PROBLEM_COLUMNS)
+    problems = pd.concat(found).sort_values('Row', kind='stable').reset_index(drop=True)
+    return raw.assign(**typed), problems
+
+
+def describe_problems(problems, limit=_REPORT_LIMIT):
+    lines = [f"  row {row.Row}: {row.Column} '{row.Value}' {row.Problem}"
+             for row in problems.head(limit).itertuples()]
+    if len(problems) > limit:
+        lines.append(f"  ... and {len(problems) - limit} more")
+    return '\n'.join(lines)
+
+
+def _resolve(typed, problems, errors, source, first_row=1):
+    # errors='raise' stops at any bad cell; 'coerce' keeps the game with the cell
+    # missing and 'drop' skips the game, both with a warning on stderr
+    if problems.empty:
+        return typed
+    if errors == 'raise':
+        raise SchemaError(problems, source)
+    action = 'dropped those games' if errors == 'drop' else 'read them as missing'
+    print(f"Warning: {len(problems)} value(s) in {source} break the schema; {action}:\n"
+          f"{describe_problems(problems)}", file=sys.stderr)
+    if errors == 'drop':
+        typed = typed.drop(index=typed.index[problems['Row'].unique() - first_row])
+    return typed
+
+
+def read_log(path=DATA_PATH, errors='coerce', engine=None, season_year=SEASON_YEAR):
+    """
+    The raw log read with declared dtypes and checked by check_schema().
+
+    Uses pandas' multithreaded pyarrow parser when pyarrow is installed, the C parser
+    otherwise. See _resolve() for `errors`.
+    """
+    engine = engine or CSV_ENGINE
+    columns = pd.read_csv(path, nrows=0).columns
+    try:
+        raw = pd.read_csv(path, dtype=csv_dtypes(columns), engine=engine)
+    except ValueError:
+        # Text in a numeric column: re-read numbers as text so every bad cell is reported
+        raw = pd.read_csv(path, dtype=csv_dtypes(columns, strict=False), engine=engine)
+    typed, problems = check_schema(raw, season_year=season_year)
+    return _resolve(typed, problems, errors, path)
+
+
+class _LogSpan(io.RawIOBase):
+    """The log's header line followed by bytes [start, end) of it, as one file."""
+
+    def __init__(self, path, start, end):
+        self._file = open(path, 'rb')
+        self._pending = self._file.readline()
+        self._file.seek(start)
+        self._left = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self._pending:
+            self._pending = self._file.read(min(len(buffer), self._left, 1 << 20))
+            self._left -= len(self._pending)
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _typed_chunks(path, chunk_rows, season_year, span, last_month=None, first_row=1):
+    # (typed chunk, problems, first row) for each chunk of the log; `season_year` and
+    # `last_month` are those of the game before the first row (see read_chunks)
+    columns = pd.read_csv(path, nrows=0).columns
+    done, strict, year = 0, True, season_year
+    while True:
+        source = io.BufferedReader(_LogSpan(path, *span)) if span else path
+        # After a failed strict parse, start over with numbers as text, past the chunks already yielded
+        skip = range(1, done * chunk_rows + 1) if done else None
+        with pd.read_csv(source, dtype=csv_dtypes(columns, strict), chunksize=chunk_rows,
+                         skiprows=skip) as reader:
+            while True:
+                try:
+                    raw = next(reader)
+                except StopIteration:
+                    return
+                except ValueError:
+                    if not strict:
+                        raise
+                    strict = False
+                    break
+                row = first_row + done * chunk_rows
+                raw.index = pd.RangeIndex(row - 1, row - 1 + len(raw))
+                typed, problems = check_schema(raw, row, year, last_month)
+                stamps = typed['Date'].dropna()
+                if len(stamps):
+                    year, last_month = stamps.iloc[-1].year, stamps.iloc[-1].month
+                yield typed, problems, row
+                done += 1
+
+
+def read_chunks(path=DATA_PATH, chunk_rows=CHUNK_ROWS, errors='coerce', season_year=SEASON_YEAR, span=None,
+                last_month=None, first_row=1):
+    """
+    The log as typed, validated frames of at most `chunk_rows` games.
+
+    Folding these into running aggregates (accumulator.GameAccumulator) keeps memory at
+    one chunk however long the log is. Chunks come from the C parser, because pandas'
+    pyarrow engine can't stream. `span` = (start, end) reads only the rows in those
+    bytes of the file; pass the year and month of the game before the span as
+    `season_year` and `last_month`, and the span's first row number as `first_row`, so
+    dates and reported rows carry on from the rest of the log.
+    """
+    for typed, problems, row in _typed_chunks(path, chunk_rows, season_year, span, last_month, first_row):
+        yield _resolve(typed, problems, errors, path, row)
+
+
+def check_log(path=DATA_PATH, chunk_rows=CHUNK_ROWS):
+    """(games, problems) for the whole log, streamed in chunks."""
+    games, found = 0, []
+    for typed, problems, _ in _typed_chunks(path, chunk_rows, SEASON_YEAR, None):
+        games += len(typed)
+        if len(problems):
+            found.append(problems)
+    return games, pd.concat(found, ignore_index=True) if found else pd.DataFrame(columns=_PROBLEM_COLUMNS)
+
+
+def derive_columns(df):
+    """Type a raw game frame and add Win, <player>_Grade_Numeric and Opp_Total_<stat>."""
+    df = apply_schema(df)
+    df['Win'] = (df['Result'] == 'W').to_numpy(dtype=bool)
+
+    grade_cols = [c for c in df.columns if c.endswith('_Grade')]
+    if grade_cols:
+        numeric = grade_numeric(np.column_stack([df[col].cat.codes for col in grade_cols]))
+        for j, col in enumerate(grade_cols):
+            df[f'{col}_Numeric'] = numeric[:, j]
+
+    for col, total in opponent_totals(df).items():
+        df[col] = total
+
+    return df
+
+
+def log_view(df):
+    """The loaded games as the CSV has them: its own columns and dates, none of the derived ones."""
+    derived = {'Win'} | {f'Opp_Total_{stat}' for stat in stats}
+    columns = [c for c in df.columns if c not in derived and not c.endswith('_Grade_Numeric')]
+    return df[columns].assign(Date=format_dates(df['Date'])) if 'Date' in df else df[columns]
+
+
+def opponent_totals(df):
+    """Opp_Total_<stat> for every stat, summed over opp1..opp5."""
+    totals = {}
+    for stat in stats:
+        # Upcast before summing so five uint8 lines can't wrap
+        block = df[[f'{opp}_{stat}' for opp in opp_players]].to_numpy(dtype=np.float64, na_value=np.nan)
+        total = block.sum(axis=1)
+        totals[f'Opp_Total_{stat}'] = total.astype(count_dtype(total))
+    return pd.DataFrame(totals, index=df.index)
+
+
+def file_signature(path):
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def file_digest(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_path_for(path, cache_dir=CACHE_DIR):
+    # Keyed by the absolute path too, so two games.csv in different folders don't share a cache
+    name = os.path.splitext(os.path.basename(path))[0]
+    key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:12]
+    return os.path.join(cache_dir, f'{name}_{key}.npz')
+
+
+def _write_cache(df, cache_file, meta):
+    # One array per column; categoricals as their codes, object columns as fixed-width unicode
+    arrays = {}
+    kinds = {}
+    categories = {}
+    for i, col in enumerate(df.columns):
+        values = df[col].to_numpy()
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            values = df[col].cat.codes.to_numpy()
+            kinds[col] = 'category'
+            categories[col] = {'values': [str(c) for c in df[col].cat.categories],
+                               'ordered': bool(df[col].cat.ordered)}
+        elif values.dtype == object or pd.api.types.is_string_dtype(df[col]):
+            values = df[col].astype(str).to_numpy(dtype=str)
+            kinds[col] = 'str'
+        else:
+            kinds[col] = str(values.dtype)
+        arrays[f'c{i}'] = values
+    meta = dict(meta, columns=list(df.columns), kinds=kinds, categories=categories, version=CACHE_VERSION)
+    arrays['__meta__'] = np.array(json.dumps(meta))
+
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp = cache_file + '.tmp.npz'
+    np.savez(tmp, **arrays)
+    os.replace(tmp, cache_file)
+
+
+def _read_cache_meta(cache_file):
+    with np.load(cache_file, allow_pickle=False) as z:
+        return json.loads(str(z['__meta__']))
+
+
+def _read_cache(cache_file):
+    with np.load(cache_file, allow_pickle=False) as z:
+        meta = json.loads(str(z['__meta__']))
+        data = {}
+        for i, col in enumerate(meta['columns']):
+            values = z[f'c{i}']
+            if meta['kinds'][col] == 'category':
+                cats = meta['categories'][col]
+                values = pd.Categorical.from_codes(
+                    values, dtype=pd.CategoricalDtype(cats['values'], ordered=cats['ordered']))
+            elif meta['kinds'][col] == 'str':
+                values = values.astype(object)
+            data[col] = values
+    return pd.DataFrame(data, columns=meta['columns'])
+
+
+def _cache_is_fresh(path, cache_file):
+    """Return (fresh, meta, touched). Size/mtime are checked first; the content hash settles a mismatch."""
+    if not os.path.exists(cache_file):
+        return False, None, False
+    try:
+        meta = _read_cache_meta(cache_file)
+    except (OSError, ValueError, KeyError):
+        return False, None, False
+    if meta.get('version') != CACHE_VERSION:
+        return False, None, False
+
+    sig = file_signature(path)
+    if sig['size'] == meta['size'] and sig['mtime_ns'] == meta['mtime_ns']:
+        return True, meta, False
+    if sig['size'] == meta['size'] and file_digest(path) == meta['sha1']:
+        # Touched but unchanged (e.g. re-saved from a spreadsheet)
+        return True, dict(meta, **sig), True
+    return False, None, False
+
+
+def load_games(path=DATA_PATH, use_cache=True, cache_dir=CACHE_DIR):
+    """Load the game log with derived columns, reusing the binary cache when the CSV is unchanged."""
+    if path.endswith('.gamelog'):
+        # Already binary and memory-mapped (see gamelog.py); nothing to cache
+        from gamelog import load_log
+        with stage('load.gamelog'):
+            return load_log(path)
+
+    cache_file = cache_path_for(path, cache_dir)
+
+    if use_cache:
+        fresh, meta, touched = _cache_is_fresh(path, cache_file)
+        if fresh:
+            with stage('load.cache_read'):
+                df = _read_cache(cache_file)
+            if touched:
+                _write_cache(df, cache_file, meta)
+            return df
+
+    with stage('load.parse_csv'):
+        raw = read_log(path)
+    with stage('load.derive'):
+        df = derive_columns(raw)
+
+    if use_cache:
+        with stage('load.cache_write'):
+            meta = dict(file_signature(path), sha1=file_digest(path), source=os.path.abspath(path))
+            _write_cache(df, cache_file, meta)
+
+    return df
+
+
+def add_log_args(parser):
+    # --csv is the older spelling, kept for the scripts that had it
+    parser.add_argument('--log', '--csv', dest='log', default=DATA_PATH, metavar='PATH',
+                        help="game log to read: a CSV or a binary .gamelog (see gamelog.py)")
+    return parser
+
+
+def clear_cache(path=DATA_PATH, cache_dir=CACHE_DIR):
+    cache_file = cache_path_for(path, cache_dir)
+    if os.path.exists(cache_file):
+        os.remove(cache_file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check a game log against the declared schema.')
+    parser.add_argument('csv', nargs='?', default=DATA_PATH)
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="games parsed at a time")
+    parser.add_argument('--limit', type=int, default=50, help="bad cells to list")
+    args = parser.parse_args(argv)
+
+    games, problems = check_log(args.csv, args.chunk_rows)
+    print(f"{games} games in {args.csv}: {len(problems)} value(s) break the schema "
+          f"({problems['Row'].nunique()} game(s))")
+    if len(problems):
+        print(describe_problems(problems, args.limit))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
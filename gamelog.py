@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import struct
+import time
+
+import numpy as np
+import pandas as pd
+
+from game_store import (CHUNK_ROWS, DATA_PATH, column_kind, count_dtype, derive_columns, format_dates, grade_dtype,
+                        read_chunks, result_dtype)
+
+LOG_PATH = './data/pro_am_games.gamelog'
+
+# File layout: MAGIC, a little-endian uint32 header length, the JSON header padded to
+# HEADER_ALIGN bytes, then one fixed-width record per game. The game count is never
+# stored; it is the file size over the record size, so an append is a single write.
+MAGIC = b'PROAMLOG'
+FORMAT_VERSION = 1
+HEADER_ALIGN = 4096
+
+# Counts are uint16 with this value standing in for a blank cell
+MISSING_COUNT = np.iinfo(np.uint16).max
+
+# On-disk type of each column kind (see game_store.column_kind); grades and Result are
+# codes into grade_dtype / result_dtype with -1 for missing
+_FIELD_TYPES = {'date': '<M8[s]', 'number': '<u4', 'result': 'i1', 'grade': 'i1', 'count': '<u2'}
+
+
+def record_dtype(columns):
+    """The structured record for a log with these CSV columns, in the same order."""
+    return np.dtype([(col, _FIELD_TYPES[column_kind(col)]) for col in columns])
+
+
+def _header_bytes(columns):
+    meta = {'version': FORMAT_VERSION, 'columns': list(columns),
+            'fields': [[col, _FIELD_TYPES[column_kind(col)]] for col in columns],
+            'grades': list(grade_dtype.categories), 'results': list(result_dtype.categories),
+            'missing_count': int(MISSING_COUNT)}
+    body = json.dumps(meta).encode()
+    size = -(-(len(MAGIC) + 4 + len(body)) // HEADER_ALIGN) * HEADER_ALIGN
+    return (MAGIC + struct.pack('<I', size) + body).ljust(size, b' ')
+
+
+def read_header(path):
+    """(columns, record dtype, byte offset of the first record)."""
+    with open(path, 'rb') as f:
+        head = f.read(len(MAGIC) + 4)
+        if head[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} is not a game log')
+        size, = struct.unpack('<I', head[len(MAGIC):])
+        meta = json.loads(f.read(size - len(head)))
+    if meta['version'] != FORMAT_VERSION:
+        raise ValueError(f"{path} is game log format {meta['version']}; this reader knows {FORMAT_VERSION}")
+    return meta['columns'], np.dtype([tuple(field) for field in meta['fields']]), size
+
+
+def encode(typed):
+    """Records for a frame typed by game_store.read_log / read_chunks (before derive_columns)."""
+    records = np.zeros(len(typed), dtype=record_dtype(typed.columns))
+    for col in typed.columns:
+        kind = column_kind(col)
+        values = typed[col]
+        if kind in ('grade', 'result'):
+            dtype = grade_dtype if kind == 'grade' else result_dtype
+            records[col] = pd.Categorical(values, dtype=dtype).codes
+        elif kind == 'date':
+            records[col] = values.to_numpy(dtype='datetime64[s]')
+        else:
+            numbers = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            top = MISSING_COUNT - 1 if kind == 'count' else np.iinfo(np.uint32).max
+            if (numbers > top).any() or (kind == 'number' and np.isnan(numbers).any()):
+                raise ValueError(f'{col} has values a game log record cannot hold')
+            records[col] = np.where(np.isnan(numbers), MISSING_COUNT, numbers)
+    return records
+
+
+def decode(records):
+    """A typed raw frame (the layout game_store.read_log returns) for a slice of records."""
+    data = {}
+    for col in records.dtype.names:
+        kind = column_kind(col)
+        values = records[col]
+        if kind in ('grade', 'result'):
+            data[col] = pd.Categorical.from_codes(values, dtype=grade_dtype if kind == 'grade' else result_dtype)
+        elif kind == 'count':
+            missing = values == MISSING_COUNT
+            if missing.any():
+                data[col] = np.where(missing, np.nan, values).astype(np.float32)
+            else:
+                data[col] = values.astype(count_dtype(values))
+        elif kind == 'date':
+            # The unit game_store.parse_dates produces
+            data[col] = values.astype('datetime64[us]')
+        else:
+            data[col] = np.asarray(values)
+    return pd.DataFrame(data, columns=list(records.dtype.names))
+
+
+def create(path, columns):
+    """Start an empty log for these CSV columns (overwrites `path`)."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(_header_bytes(columns))
+
+
+def append(path, typed):
+    """
+    Append games to the log in O(games added): one write at the end of the file.
+
+    Games must not be dated before the log's last game, which keeps the log sorted for
+    date_slice(). A record left half-written by a crashed append is cut off first.
+    """
+    columns, dtype, offset = read_header(path)
+    if list(typed.columns) != columns:
+        raise ValueError(f'{path} holds columns {columns}, not {list(typed.columns)}')
+    records = encode(typed)
+    with open(path, 'r+b') as f:
+        size = f.seek(0, os.SEEK_END)
+        whole = offset + (size - offset) // dtype.itemsize * dtype.itemsize
+        if whole != size:
+            f.truncate(whole)
+        dates = records['Date'][~np.isnat(records['Date'])]
+        if len(dates):
+            if whole > offset:
+                f.seek(whole - dtype.itemsize)
+                last = np.frombuffer(f.read(dtype.itemsize), dtype=dtype)['Date'][0]
+                dates = np.concatenate([[last], dates]) if not np.isnat(last) else dates
+            if (np.diff(dates) < np.timedelta64(0, 's')).any():
+                raise ValueError('games must be appended in date order')
+        f.seek(whole)
+        f.write(records.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    return len(records)
+
+
+def open_log(path=LOG_PATH):
+    """
+    Every record, memory-mapped read-only: nothing is parsed or copied until used.
+
+    Columns are strided views (records['tymelxss_Points']); slices are views too.
+    """
+    columns, dtype, offset = read_header(path)
+    games = (os.path.getsize(path) - offset) // dtype.itemsize
+    if games == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(games,))
+
+
+def date_slice(records, start=None, end=None):
+    """The records dated in [start, end), found by binary search (the log is date-sorted)."""
+    dates = records['Date']
+    lo = np.searchsorted(dates, np.datetime64(pd.Timestamp(start), 's')) if start is not None else 0
+    hi = np.searchsorted(dates, np.datetime64(pd.Timestamp(end), 's')) if end is not None else len(records)
+    return records[lo:hi]
+
+
+def load_log(path=LOG_PATH, start=None, end=None):
+    """The log (or games dated in [start, end)) in the same layout game_store.load_games returns."""
+    return derive_columns(decode(date_slice(open_log(path), start, end)))
+
+
+def from_csv(csv_path=DATA_PATH, path=LOG_PATH, chunk_rows=CHUNK_ROWS):
+    """Convert a CSV log, streamed in chunks; any value outside the schema stops it (lossless or nothing)."""
+    columns = pd.read_csv(csv_path, nrows=0).columns
+    tmp = path + '.tmp'
+    create(tmp, columns)
+    games = 0
+    for chunk in read_chunks(csv_path, chunk_rows, errors='raise'):
+        games += append(tmp, chunk)
+    os.replace(tmp, path)
+    return games
+
+
+def to_csv(path=LOG_PATH, csv_path=DATA_PATH, chunk_rows=CHUNK_ROWS):
+    """Write the log back out in the CSV layout, chunk by chunk."""
+    records = open_log(path)
+    with open(csv_path, 'w', newline='') as f:
+        f.write(','.join(records.dtype.names) + '\n')
+        for start in range(0, len(records), chunk_rows):
+            block = records[start:start + chunk_rows]
+            text = {}
+            for col in block.dtype.names:
+                kind = column_kind(col)
+                values = block[col]
+                if kind == 'date':
+                    text[col] = format_dates(values)
+                elif kind in ('grade', 'result'):
+                    categories = np.append((grade_dtype if kind == 'grade' else result_dtype).categories, '')
+                    text[col] = categories[values]
+                elif kind == 'count':
+                    text[col] = np.where(values == MISSING_COUNT, '', values.astype(str))
+                else:
+                    text[col] = values.astype(str)
+            pd.DataFrame(text).to_csv(f, header=False, index=False, lineterminator='\n')
+    return len(records)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert, export or summarize the binary game log.')
+    parser.add_argument('action', choices=['import', 'export', 'info'],
+                        help="import: CSV -> binary log, export: binary log -> CSV, info: summary")
+    parser.add_argument('--log', default=LOG_PATH, help="binary log path")
+    parser.add_argument('--csv', default=DATA_PATH, help="CSV path to read (import) or write (export)")
+    parser.add_argument('--start', default=None, help="info: first date to include (e.g. 2025-12-01)")
+    parser.add_argument('--end', default=None, help="info: date to stop before")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="games converted at a time")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.action == 'import':
+        games = from_csv(args.csv, args.log, args.chunk_rows)
+        print(f"Imported {games} games from {args.csv} into {args.log} ({os.path.getsize(args.log) / 2 ** 20:.1f} MB)")
+    elif args.action == 'export':
+        games = to_csv(args.log, args.csv, args.chunk_rows)
+        print(f"Exported {games} games from {args.log} to {args.csv}")
+    else:
+        records = date_slice(open_log(args.log), args.start, args.end)
+        wins = int((records['Result'] == 1).sum())
+        print(f"{args.log}: {len(records)} games ({wins} W - {len(records) - wins} L), "
+              f"{records.dtype.itemsize} bytes per game")
+        if len(records):
+            print(f"Dates {records['Date'][0]} to {records['Date'][-1]}, "
+                  f"games #{records['Game #'][0]} to #{records['Game #'][-1]}")
+    print(f"({time.perf_counter() - start:.3f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,312 @@
+import argparse
+import asyncio
+import io
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import accumulator
+from game_store import DATA_PATH, DATE_FORMAT, check_schema, column_kind, load_games
+from rendering import render_figures
+
+INBOX_DIR = './data/inbox'
+HOST = '127.0.0.1'
+PORT = 8765
+
+# Reports refreshed after every game, and the ones whose text is printed
+DEFAULT_REPORTS = ['final', 'build', 'team_stats', 'team_data', 'four_quad', 'opp']
+DEFAULT_PRINT = ['build']
+
+# Any leap year; upload dates are checked in one so 02/29 is a real day
+LEAP_YEAR = 2000
+
+# Largest request body the POST endpoint accepts
+MAX_BODY = 1 << 20
+
+
+def log_columns(path=DATA_PATH):
+    with open(path, newline='') as f:
+        return f.readline().strip().split(',')
+
+
+def validate_games(frame, columns, last_game):
+    """
+    Check new raw rows against the log's layout; returns (rows ready to append, errors).
+
+    Game # and Date may be left out: games are numbered after `last_game` and stamped
+    with the current time. Any error rejects the whole batch, so a half-valid upload
+    never leaves half its games in the log.
+    """
+    errors = []
+    frame = frame.copy()
+    frame.columns = [str(col).strip() for col in frame.columns]
+    if frame.empty:
+        return frame, ['no games in the upload']
+
+    if 'Game #' not in frame:
+        frame['Game #'] = np.arange(last_game + 1, last_game + 1 + len(frame))
+    if 'Date' not in frame:
+        now = datetime.now()
+        # The log's own style: 11/29 1:08pm
+        frame['Date'] = f"{now:%m/%d} {now.hour % 12 or 12}:{now:%M}{'am' if now.hour < 12 else 'pm'}"
+
+    missing = [col for col in columns if col not in frame]
+    unknown = [col for col in frame.columns if col not in columns]
+    if missing:
+        errors.append(f"missing columns: {', '.join(missing)}")
+    if unknown:
+        errors.append(f"unknown columns: {', '.join(unknown)}")
+    if errors:
+        return frame, errors
+
+    # Same spelling as the log before the schema check: W/L and grades in upper case,
+    # and a blank cell is missing (a grade nobody logged, as check_schema allows)
+    for col in columns:
+        if column_kind(col) in ('result', 'grade'):
+            text = frame[col].astype(str).str.strip().str.upper()
+            frame[col] = text.mask(frame[col].isna() | (text == ''))
+    frame['Date'] = frame['Date'].astype(str).str.strip()
+
+    # Date is checked on its own: check_schema() puts the stamps in the season's
+    # years, and a game on 02/29 is only wrong there if that year has no such day
+    typed, problems = check_schema(frame[columns].drop(columns='Date'))
+    errors += [f"row {row.Row}: {row.Column} '{row.Value}' {row.Problem}" for row in problems.itertuples()]
+
+    rows = frame.index + 1
+    dates = pd.to_datetime(f'{LEAP_YEAR} ' + frame['Date'], format=f'%Y {DATE_FORMAT}', errors='coerce')
+    for row in rows[dates.isna().to_numpy()]:
+        errors.append(f"row {row}: Date must look like 11/29 12:23pm")
+
+    numbers = typed['Game #']
+    bad = numbers.notna() & ((numbers <= last_game) | numbers.duplicated(keep=False))
+    for row in rows[bad.to_numpy()]:
+        errors.append(f"row {row}: Game # must be a new whole number after {last_game}")
+    if errors:
+        return frame[columns], errors
+
+    # Whole numbers are written back as whole numbers (the log has no '3.0' counts)
+    for col in columns:
+        if column_kind(col) in ('number', 'count'):
+            frame[col] = typed[col].round().astype('Int64')
+    return frame[columns], errors
+
+
+def append_games(path, rows):
+    """Append validated rows to the CSV log; the log is only ever appended to."""
+    text = rows.to_csv(header=False, index=False, lineterminator='\n')
+    with open(path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                text = '\n' + text
+        f.write(text.encode())
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def parse_upload(body, content_type=''):
+    """Raw game rows from a POST body: CSV with a header line, or a JSON object/list of objects."""
+    text = body.decode('utf-8-sig')
+    if 'json' in content_type or text.lstrip()[:1] in ('{', '['):
+        data = json.loads(text)
+        return pd.DataFrame(data if isinstance(data, list) else [data])
+    return pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False)
+
+
+class IngestService:
+    """
+    Appends validated games to the log and refreshes the reports after each one.
+
+    Games come in through the inbox folder or the POST endpoint. Each accepted batch
+    is folded into the running aggregates (update_from_csv reads only the new bytes)
+    and onto the games kept in memory, so the log is parsed once per service rather
+    than once per game. The Win correlations every report shares come straight from
+    the aggregates. Each batch queues one report refresh; games that arrive
+    mid-refresh are picked up by the next one rather than each starting their own.
+    Only figures whose inputs changed are redrawn (see rendering.render_figures).
+    """
+
+    def __init__(self, path=DATA_PATH, inbox=INBOX_DIR, reports=None, show=None, render=True, workers=None,
+                 state_path=None):
+        self.path = path
+        # The running sums of this log, never another log's
+        self.state_path = state_path or accumulator.state_path_for(path)
+        self.inbox = inbox
+        self.reports = reports or DEFAULT_REPORTS
+        self.show = DEFAULT_PRINT if show is None else show
+        self.render = render
+        self.workers = workers
+        self.columns = log_columns(path)
+        self.games = load_games(path)
+        self.last_game = int(self.games['Game #'].max())
+        self.acc = accumulator.refresh(path, self.state_path)
+        self._lock = asyncio.Lock()
+        self._dirty = asyncio.Event()
+
+    def status(self):
+        wins, losses = self.acc.record()
+        return {'games': wins + losses, 'wins': wins, 'losses': losses, 'last_game': self.last_game}
+
+    async def ingest(self, frame, source):
+        """Validate and append one batch of raw rows; returns a JSON-ready summary."""
+        async with self._lock:
+            rows, errors = validate_games(frame, self.columns, self.last_game)
+            if errors:
+                print(f"[{source}] rejected: " + '; '.join(errors))
+                return {'added': 0, 'errors': errors, **self.status()}
+            append_games(self.path, rows)
+            self.last_game = int(rows['Game #'].max())
+            frames = []
+            added = self.acc.update_from_csv(self.path, frames=frames)
+            if added is None:
+                # The log was edited under us; rebuild the aggregates and games from scratch
+                self.acc = accumulator.refresh(self.path, self.state_path)
+                self.games = load_games(self.path)
+            else:
+                self.acc.save(self.state_path)
+                self.games = pd.concat([self.games, *frames], ignore_index=True)
+            self._dirty.set()
+
+        status = self.status()
+        print(f"[{source}] added {len(rows)} game(s), now {status['wins']}-{status['losses']}")
+        return {'added': len(rows), 'errors': [], **status}
+
+    def _refresh_reports(self, df, win_corr):
+        from pipeline import pipeline
+
+        start = time.perf_counter()
+        results = pipeline.run(self.reports, {'load': df, 'correlate': win_corr})
+        for name in self.show:
+            if name in results:
+                results[name].print()
+        return results, time.perf_counter() - start
+
+    def _render(self, results):
+        start = time.perf_counter()
+        jobs = [job for name in self.reports for job in results[name].figures]
+        written = render_figures(jobs, headless=True, workers=self.workers)
+        return written, time.perf_counter() - start
+
+    async def refresher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._dirty.wait()
+            self._dirty.clear()
+            async with self._lock:
+                # Taken between appends, so the reports never see half a batch
+                df = self.games
+                win_corr = self.acc.split_table()[['Column', 'Player', 'Stat', 'Correlation']]
+            # Text first, so the new recommendations are out before any figure is drawn
+            results, seconds = await loop.run_in_executor(None, self._refresh_reports, df, win_corr)
+            print(f"Reports refreshed in {seconds:.2f}s")
+            if self.render:
+                written, seconds = await loop.run_in_executor(None, self._render, results)
+                redrawn = ', '.join(os.path.basename(path) for path in written) or 'none changed'
+                print(f"Figures redrawn in {seconds:.2f}s: {redrawn}")
+
+    async def watch(self, interval=0.5):
+        """Poll the inbox for dropped CSV files; accepted ones move to processed/, others to rejected/."""
+        os.makedirs(self.inbox, exist_ok=True)
+        while True:
+            for name in sorted(os.listdir(self.inbox)):
+                path = os.path.join(self.inbox, name)
+                if not name.endswith('.csv') or not os.path.isfile(path):
+                    continue
+                try:
+                    frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+                    result = await self.ingest(frame, name)
+                except (OSError, ValueError) as e:
+                    result = {'added': 0, 'errors': [str(e)]}
+                folder = os.path.join(self.inbox, 'processed' if result['added'] else 'rejected')
+                os.makedirs(folder, exist_ok=True)
+                shutil.move(path, os.path.join(folder, f"{datetime.now():%Y%m%d-%H%M%S}_{name}"))
+                if result['errors']:
+                    with open(os.path.join(folder, f'{name}.errors.txt'), 'w') as f:
+                        f.write('\n'.join(result['errors']) + '\n')
+            await asyncio.sleep(interval)
+
+    async def handle_http(self, reader, writer):
+        # Minimal HTTP/1.1: POST /games with CSV or JSON rows, GET /status
+        try:
+            request = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                key, _, value = line.partition(':')
+                headers[key.strip().lower()] = value.strip()
+
+            method, target = (request + ['', ''])[:2]
+            length = int(headers.get('content-length', 0))
+            if method == 'GET' and target == '/status':
+                code, payload = 200, self.status()
+            elif method == 'POST' and target == '/games':
+                if length > MAX_BODY:
+                    code, payload = 413, {'errors': [f'body larger than {MAX_BODY} bytes']}
+                else:
+                    body = await reader.readexactly(length)
+                    try:
+                        payload = await self.ingest(parse_upload(body, headers.get('content-type', '')), 'POST')
+                    except ValueError as e:
+                        payload = {'added': 0, 'errors': [f'could not parse the upload: {e}']}
+                    code = 200 if payload['added'] else 422
+            else:
+                code, payload = 404, {'errors': ['use POST /games or GET /status']}
+        except (asyncio.IncompleteReadError, ValueError) as e:
+            code, payload = 400, {'errors': [str(e)]}
+
+        body = json.dumps(payload).encode()
+        reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+                  422: 'Unprocessable Entity'}[code]
+        writer.write(f'HTTP/1.1 {code} {reason}\r\nContent-Type: application/json\r\n'
+                     f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode() + body)
+        await writer.drain()
+        writer.close()
+
+    async def serve(self, host=HOST, port=PORT, watch=True, http=True):
+        tasks = [asyncio.create_task(self.refresher())]
+        if watch:
+            tasks.append(asyncio.create_task(self.watch()))
+            print(f"Watching {os.path.abspath(self.inbox)} for CSV files")
+        if http:
+            server = await asyncio.start_server(self.handle_http, host, port)
+            tasks.append(asyncio.create_task(server.serve_forever()))
+            print(f"Accepting games at http://{host}:{port}/games")
+        await asyncio.gather(*tasks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Accept new games (inbox folder or HTTP POST) and refresh the reports.')
+    parser.add_argument('--csv', default=DATA_PATH, help="game log to append to")
+    parser.add_argument('--inbox', default=INBOX_DIR, help="folder watched for dropped CSV files")
+    parser.add_argument('--state', default=None, help="saved running sums (default: one file per log under data/.cache)")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--no-watch', action='store_true', help="don't watch the inbox folder")
+    parser.add_argument('--no-http', action='store_true', help="don't listen for POSTs")
+    parser.add_argument('--reports', nargs='+', default=DEFAULT_REPORTS, help="reports to refresh after each game")
+    parser.add_argument('--print', nargs='*', default=DEFAULT_PRINT, dest='show', metavar='REPORT',
+                        help="reports whose text is printed after each refresh")
+    parser.add_argument('--no-plots', action='store_true', help="refresh the analyses but not the PNGs")
+    parser.add_argument('--workers', type=int, default=None, help="processes for rendering figures")
+    args = parser.parse_args(argv)
+
+    service = IngestService(args.csv, args.inbox, args.reports, args.show, render=not args.no_plots,
+                            workers=args.workers, state_path=args.state)
+    status = service.status()
+    print(f"Log has {status['games']} games ({status['wins']}-{status['losses']}), last game #{status['last_game']}")
+    try:
+        asyncio.run(service.serve(args.host, args.port, watch=not args.no_watch, http=not args.no_http))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
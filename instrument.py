@@ -0,0 +1,177 @@
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+import pandas as pd
+
+PROFILE_DIR = './profiles'
+
+# The profile stages report into, or None; with no profile running a stage costs one check
+_active = None
+
+
+class Profile:
+    """
+    Wall time and (optionally) tracemalloc peak memory per named stage.
+
+    Stages nest: a stage opened inside another is recorded as 'outer/inner'. A stage
+    entered several times (one per figure, say) accumulates its calls and time and keeps
+    its highest peak.
+    """
+
+    def __init__(self, name, trace_memory=True):
+        self.name = name
+        self.trace_memory = trace_memory
+        self.created = datetime.now().isoformat(timespec='seconds')
+        self.stages = {}
+        self._stack = []
+        self._start = None
+        self._owns_tracing = False
+
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        self._start = time.perf_counter()
+        return self
+
+    def stop(self):
+        self.total_seconds = time.perf_counter() - self._start
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            if self._owns_tracing:
+                tracemalloc.stop()
+        return self
+
+    @contextmanager
+    def stage(self, name):
+        path = '/'.join([frame[0] for frame in self._stack] + [name])
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # Fold the peak so far into the enclosing stage before resetting it
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+            tracemalloc.reset_peak()
+        else:
+            current = 0
+        # Registered on entry, so the table lists stages in the order they started
+        entry = self.stages.setdefault(path, {'stage': path, 'calls': 0, 'seconds': 0.0,
+                                              'peak_bytes': 0, 'peak_added_bytes': 0})
+        frame = [name, 0]
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+            peak = max(frame[1], tracemalloc.get_traced_memory()[1]) if tracing else 0
+            if tracing and self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+
+            entry['calls'] += 1
+            entry['seconds'] += seconds
+            entry['peak_bytes'] = max(entry['peak_bytes'], peak)
+            entry['peak_added_bytes'] = max(entry['peak_added_bytes'], peak - current)
+
+    def to_dict(self):
+        return {
+            'script': self.name,
+            'created': self.created,
+            'argv': sys.argv[1:],
+            'trace_memory': self.trace_memory,
+            'total_seconds': getattr(self, 'total_seconds', None),
+            'peak_bytes': getattr(self, 'peak_bytes', None),
+            'stages': list(self.stages.values()),
+        }
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=1)
+        return path
+
+    def table(self):
+        table = pd.DataFrame(list(self.stages.values()),
+                             columns=['stage', 'calls', 'seconds', 'peak_bytes', 'peak_added_bytes'])
+        table['peak_MB'] = table.pop('peak_bytes') / 2 ** 20
+        table['added_MB'] = table.pop('peak_added_bytes') / 2 ** 20
+        return table.set_index('stage')
+
+    def print_summary(self, file=None):
+        file = file or sys.stdout
+        print("=" * 80, file=file)
+        print(f"PROFILE: {self.name} ({self.total_seconds:.3f}s total)", file=file)
+        print("=" * 80, file=file)
+        table = self.table()
+        if not self.trace_memory:
+            table = table.drop(columns=['peak_MB', 'added_MB'])
+        print(table.to_string(float_format=lambda x: f'{x:.3f}'), file=file)
+
+
+@contextmanager
+def stage(name):
+    """Time the block as `name` in the running profile, if there is one."""
+    if _active is None:
+        yield
+        return
+    with _active.stage(name):
+        yield
+
+
+def timed(name):
+    """Decorator form of stage()."""
+    def wrap(func):
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with _active.stage(name):
+                return func(*args, **kwargs)
+        return call
+    return wrap
+
+
+@contextmanager
+def profiling(name, path=None, summary=False, trace_memory=True):
+    """Profile the block; writes the JSON to `path` and/or prints the summary table."""
+    global _active
+    previous, _active = _active, Profile(name, trace_memory).start()
+    profile = _active
+    try:
+        yield profile
+    finally:
+        _active = previous
+        profile.stop()
+        if path:
+            profile.write(path)
+            print(f"\nProfile written to {path}")
+        if summary:
+            print()
+            profile.print_summary()
+
+
+def add_profile_args(parser):
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='PATH',
+                        help="write per-stage timings and peak memory as JSON "
+                             "(default path: profiles/<script>_<timestamp>.json)")
+    parser.add_argument('--profile-summary', action='store_true', help="print the per-stage table at the end")
+    parser.add_argument('--no-trace-memory', action='store_true',
+                        help="time stages without tracemalloc (which slows allocation-heavy stages)")
+    return parser
+
+
+def profile_from_args(args, script):
+    """profiling() driven by the flags from add_profile_args(); a no-op when neither flag is set."""
+    if args.profile is None and not args.profile_summary:
+        return nullcontext()
+    name = os.path.splitext(os.path.basename(script))[0]
+    path = args.profile or (os.path.join(PROFILE_DIR, f"{name}_{datetime.now():%Y%m%d-%H%M%S}.json")
+                            if args.profile is not None else None)
+    return profiling(name, path, args.profile_summary, trace_memory=not args.no_trace_memory)
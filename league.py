@@ -0,0 +1,164 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from correlations import grouped_corr
+from four_quad_char import QUADRANTS, quadrant_codes
+from game_store import load_games, stats
+from nba_player_update import BUILDS, build_codes, impact_table
+from roster import ROSTER_PATH, load_rosters
+from tidy import melt_games, player_stats, win_loss_means
+
+
+def load_league(rosters=None):
+    """
+    One long table (see tidy.melt_games) for every roster, keyed by a `team` categorical.
+
+    game_id restarts at 0 per team, so (team, game_id) identifies a game. Only players
+    listed in a team's roster are kept on its side; all five opponent slots are kept.
+    """
+    rosters = load_rosters() if rosters is None else rosters
+    frames = []
+    for roster in rosters:
+        long_df = melt_games(load_games(roster.path), stats=player_stats)
+        on_team = long_df['side'] == 'team'
+        missing = set(roster.players) - set(long_df.loc[on_team, 'player'].unique())
+        if missing:
+            raise ValueError(f"{roster.team}: no columns for {', '.join(sorted(missing))} in {roster.path}")
+        frames.append(long_df[~on_team | long_df['player'].isin(roster.players)])
+
+    lengths = [len(frame) for frame in frames]
+    # Rosters name different players, so their categoricals are merged rather than concatenated
+    players = union_categoricals([frame['player'] for frame in frames])
+    league = pd.concat([frame.drop(columns='player') for frame in frames], ignore_index=True)
+    league.insert(0, 'team', pd.Categorical.from_codes(
+        np.repeat(np.arange(len(rosters), dtype=np.int32), lengths), categories=[r.team for r in rosters]))
+    league.insert(4, 'player', players)
+    return league
+
+
+def team_records(league):
+    games = league.drop_duplicates(['team', 'game_id'])
+    record = games.groupby('team', observed=True)['Win'].agg(['size', 'sum'])
+    record.columns = ['Games', 'Wins']
+    record['Losses'] = record['Games'] - record['Wins']
+    record['Win_Rate'] = record['Wins'] / record['Games']
+    return record
+
+
+def team_correlations(league):
+    """Win correlation of every (team, player, stat), plus each team's opponent totals."""
+    team_rows = league[league['side'] == 'team']
+    players = grouped_corr(team_rows, ['team', 'player', 'stat'], 'value', 'Win')
+
+    # Opponent totals per game, then correlated per (team, stat) the same way
+    opp_rows = league[league['side'] == 'opp']
+    totals = (opp_rows[opp_rows['stat'] != 'Grade']
+              .groupby(['team', 'game_id', 'stat'], observed=True)
+              .agg(value=('value', 'sum'), Win=('Win', 'first'))
+              .reset_index())
+    opponent = grouped_corr(totals, ['team', 'stat'], 'value', 'Win').reset_index()
+    opponent.insert(1, 'player', 'Opponent')
+
+    corr = pd.concat([players.reset_index(), opponent], ignore_index=True)
+    corr['player'] = corr['player'].astype(str)
+    corr['stat'] = corr['stat'].astype(str)
+    return corr
+
+
+def _player_matrix(corr):
+    # (team, player) x stat correlations for the rostered players only
+    rows = corr[corr['player'] != 'Opponent']
+    return rows.set_index(['team', 'player', 'stat'])['Correlation'].unstack('stat').rename_axis(columns=None)
+
+
+def team_quadrants(corr):
+    """Four-quadrant placement of every player, with midpoints taken within each team."""
+    wide = _player_matrix(corr)
+    quad = pd.DataFrame({
+        'Grade_Correlation': wide['Grade'],
+        'Stat_Correlation': wide[stats].mean(axis=1),
+    })
+    mids = quad.groupby(level='team', observed=True).transform('mean')
+    codes = quadrant_codes(quad['Stat_Correlation'], quad['Grade_Correlation'],
+                           mids['Stat_Correlation'].to_numpy(), mids['Grade_Correlation'].to_numpy())
+    quad['Quadrant'] = np.array([name for _, name, _ in QUADRANTS])[codes]
+    return quad.reset_index()
+
+
+def team_builds(corr):
+    """Impact scores and build recommendation for every player, neediest first within each team."""
+    builds = impact_table(_player_matrix(corr))
+    builds['Build'] = np.array(BUILDS)[build_codes(builds)]
+    builds = builds.reset_index()
+    order = np.lexsort((-builds['Inefficiency_Score'].to_numpy(), builds['team'].cat.codes.to_numpy()))
+    return builds.iloc[order].reset_index(drop=True)
+
+
+def summarize(league):
+    """One row per team: record, strongest win driver and the player who most needs a new build."""
+    corr = team_correlations(league)
+    summary = team_records(league)
+
+    team_side = corr[corr['player'] != 'Opponent'].dropna(subset=['Correlation'])
+    top = team_side.loc[team_side.groupby('team', observed=True)['Correlation'].idxmax()].set_index('team')
+    summary['Top_Driver'] = top['player'] + ' ' + top['stat']
+    summary['Top_Correlation'] = top['Correlation']
+
+    opp_points = corr[(corr['player'] == 'Opponent') & (corr['stat'] == 'Points')].set_index('team')
+    summary['Opp_Points_Correlation'] = opp_points['Correlation']
+
+    builds = team_builds(corr)
+    neediest = builds.groupby('team', observed=True).head(1).set_index('team')
+    summary['Build_Priority'] = neediest['player']
+    summary['Build'] = neediest['Build']
+    return summary, corr, builds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the per-team analyses across every roster at once.')
+    parser.add_argument('--rosters', default=ROSTER_PATH, help="roster config (default: %(default)s)")
+    parser.add_argument('--team', help="team to benchmark against the ladder (default: first roster)")
+    parser.add_argument('--top', type=int, default=20, help="teams to list, by win rate")
+    parser.add_argument('--out', help="directory to write the full per-team tables to as CSV")
+    args = parser.parse_args(argv)
+
+    rosters = load_rosters(args.rosters)
+    league = load_league(rosters)
+    summary, corr, builds = summarize(league)
+
+    print("=" * 100)
+    print(f"LEAGUE SUMMARY: {len(summary)} teams, {int(summary['Games'].sum())} games")
+    print("=" * 100)
+    ranked = summary.sort_values('Win_Rate', ascending=False, kind='stable')
+    print(ranked.head(args.top).to_string(float_format=lambda x: f'{x:.3f}'))
+
+    team = args.team or rosters[0].team
+    if team not in summary.index:
+        parser.error(f"unknown team '{team}'")
+    row = summary.loc[team]
+    rank = int((summary['Win_Rate'] > row['Win_Rate']).sum()) + 1
+    print("\n" + "=" * 100)
+    print(f"{team}: {int(row['Wins'])}-{int(row['Losses'])} ({row['Win_Rate']:.1%}), "
+          f"ranked {rank} of {len(summary)} by win rate")
+    print(f"  Strongest win driver: {row['Top_Driver']} ({row['Top_Correlation']:+.3f})")
+    print(f"  Opponent points vs wins: {row['Opp_Points_Correlation']:+.3f} "
+          f"(ladder median {summary['Opp_Points_Correlation'].median():+.3f})")
+    print(f"  Build priority: {row['Build_Priority']} -> {row['Build']}")
+    print("=" * 100)
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        summary.to_csv(os.path.join(args.out, 'league_summary.csv'))
+        corr.to_csv(os.path.join(args.out, 'league_correlations.csv'), index=False)
+        win_loss_means(league, by=['team']).to_csv(os.path.join(args.out, 'league_splits.csv'))
+        team_quadrants(corr).to_csv(os.path.join(args.out, 'league_quadrants.csv'), index=False)
+        builds.to_csv(os.path.join(args.out, 'league_builds.csv'), index=False)
+        print(f"\nTables written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
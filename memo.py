@@ -0,0 +1,181 @@
+import argparse
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import time
+from contextlib import contextmanager
+
+from game_store import CACHE_DIR
+from rendering import _feed
+
+MEMO_DIR = os.path.join(CACHE_DIR, 'memo')
+
+# Total size the memo store may reach before the least recently used tables are evicted
+MAX_BYTES = 256 * 1024 * 1024
+
+_REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+_enabled = True
+
+
+@contextmanager
+def disabled():
+    """Run the block without reading or writing memoized results (e.g. while timing)."""
+    global _enabled
+    previous, _enabled = _enabled, False
+    try:
+        yield
+    finally:
+        _enabled = previous
+
+
+def _is_local(module):
+    path = getattr(module, '__file__', None)
+    return path is not None and os.path.dirname(os.path.abspath(path)) == _REPO_DIR
+
+
+@functools.lru_cache(maxsize=None)
+def _module_key(name):
+    # Source of a repo module and of every repo module it uses, so editing a helper
+    # (say correlations.py) invalidates the tables built with it
+    seen, todo, h = set(), [name], hashlib.sha1()
+    while todo:
+        module = sys.modules[todo.pop()]
+        if module.__name__ in seen:
+            continue
+        seen.add(module.__name__)
+        for value in vars(module).values():
+            used = value if inspect.ismodule(value) else sys.modules.get(getattr(value, '__module__', None) or '')
+            if used is not None and used.__name__ not in seen and _is_local(used):
+                todo.append(used.__name__)
+    # By file rather than module name, so a script run directly (__main__) shares its
+    # entries with the same module imported by the pipeline
+    for path in sorted({os.path.abspath(sys.modules[module_name].__file__) for module_name in seen}):
+        with open(path, 'rb') as f:
+            h.update(os.path.basename(path).encode() + b'\0' + f.read())
+    return h.hexdigest()
+
+
+def call_key(name, func, args=(), kwargs=None):
+    """Hash of the analysis name, its code (and the repo modules it uses) and its inputs."""
+    bound = inspect.signature(func).bind(*args, **(kwargs or {}))
+    bound.apply_defaults()
+    h = hashlib.sha1(name.encode())
+    h.update(_module_key(func.__module__).encode())
+    _feed(h, dict(bound.arguments))
+    return h.hexdigest()
+
+
+def _entry_path(name, key, memo_dir):
+    return os.path.join(memo_dir, f'{name}-{key}.pkl')
+
+
+def entries(memo_dir=MEMO_DIR):
+    """(name, path, bytes, last used) for every stored table, least recently used first."""
+    if not os.path.isdir(memo_dir):
+        return []
+    rows = []
+    for file_name in os.listdir(memo_dir):
+        if not file_name.endswith('.pkl'):
+            continue
+        path = os.path.join(memo_dir, file_name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        rows.append((file_name.rsplit('-', 1)[0], path, st.st_size, st.st_mtime))
+    return sorted(rows, key=lambda row: row[3])
+
+
+def evict(max_bytes=MAX_BYTES, memo_dir=MEMO_DIR):
+    """Drop least recently used tables until the store fits in `max_bytes`; returns how many went."""
+    rows = entries(memo_dir)
+    total = sum(row[2] for row in rows)
+    removed = 0
+    for _, path, size, _ in rows:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def invalidate(name=None, memo_dir=MEMO_DIR):
+    """Forget every stored result of `name` (or everything); returns how many were removed."""
+    removed = 0
+    for entry_name, path, _, _ in entries(memo_dir):
+        if name is None or entry_name == name:
+            os.remove(path)
+            removed += 1
+    return removed
+
+
+def cached_call(name, func, *args, memo_dir=MEMO_DIR, max_bytes=MAX_BYTES, **kwargs):
+    """
+    func(*args, **kwargs), read back from disk when the same code already ran on equal inputs.
+
+    Results are keyed by `name`, the source of func's module (plus the repo modules it
+    uses) and a content hash of every argument, so new games, different parameters or an
+    edited analysis all miss and recompute. A hit refreshes the entry's mtime, which is
+    what least-recently-used eviction goes by.
+    """
+    if not _enabled:
+        return func(*args, **kwargs)
+
+    path = _entry_path(name, call_key(name, func, args, kwargs), memo_dir)
+    try:
+        with open(path, 'rb') as f:
+            result = pickle.load(f)
+        os.utime(path)
+        return result
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        pass
+
+    result = func(*args, **kwargs)
+    os.makedirs(memo_dir, exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    evict(max_bytes, memo_dir)
+    return result
+
+
+def memoized(name):
+    """Decorator form of cached_call() for an analysis function."""
+    def wrap(func):
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            return cached_call(name, func, *args, **kwargs)
+        call.uncached = func
+        return call
+    return wrap
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect or clear the memoized analysis tables.')
+    parser.add_argument('--clear', nargs='?', const='', metavar='NAME',
+                        help="remove every stored table, or only NAME's")
+    parser.add_argument('--max-mb', type=float, default=None, help="evict down to this many MB")
+    args = parser.parse_args(argv)
+
+    if args.clear is not None:
+        removed = invalidate(args.clear or None)
+        print(f"Removed {removed} stored table(s)")
+    if args.max_mb is not None:
+        print(f"Evicted {evict(int(args.max_mb * 1024 * 1024))} table(s)")
+
+    rows = entries()
+    print(f"{len(rows)} stored table(s), {sum(row[2] for row in rows) / 1024:.1f} KB in {MEMO_DIR}")
+    for name, path, size, used in reversed(rows):
+        print(f"  {name:<20} {size / 1024:8.1f} KB  last used {time.strftime('%Y-%m-%d %H:%M', time.localtime(used))}")
+
+
+if __name__ == '__main__':
+    main()
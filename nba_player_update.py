@@ -1,232 +1,320 @@
+import argparse
+from collections import namedtuple
+from itertools import product
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-# Load your data
-df = pd.read_csv('./data/pro_am_games.csv')
-df['Win'] = (df['Result'] == 'W').astype(int)
+from correlations import select_columns, win_correlations
+from game_store import add_log_args, load_games, team_players, stats
+from instrument import add_profile_args, profile_from_args, timed
+from memo import memoized
+from rendering import FigureJob, add_render_args, render_from_args
+from significance import win_significance
+from splits import player_splits, result_splits
 
-team_players = ['tymelxss', 'AbuTalibaan', 'Glo4Prezz', 'Yurselln', 'MajinKemboi']
-stats = ['Points', 'Rebounds', 'Assists', 'FGM']
 
-# Analyze each player's stat correlations and performance
+def impact_table(corr):
+    """
+    Role impacts from a players x stats table of Win correlations.
 
-player_analysis = []
+    `corr` is indexed by player (or by (team, player) for a league) with one column per
+    stat; every score is a column operation, so a whole league is scored at once.
+    """
+    table = corr[stats].add_suffix('_Corr')
 
-for player in team_players:
-    points_corr = df[f"{player}_Points"].corr(df['Win'])
-    rebounds_corr = df[f"{player}_Rebounds"].corr(df['Win'])
-    assists_corr = df[f"{player}_Assists"].corr(df['Win'])
-    fgm_corr = df[f"{player}_FGM"].corr(df['Win'])
-    
     # Calculate offensive vs supporting roles
-    offensive_impact = (points_corr + fgm_corr) / 2
-    supporting_impact = (rebounds_corr + assists_corr) / 2
-    total_impact = np.mean([points_corr, rebounds_corr, assists_corr, fgm_corr])
-    
-    # Get averages in wins vs losses
-    pts_win = df[df['Win'] == 1][f"{player}_Points"].mean()
-    pts_loss = df[df['Win'] == 0][f"{player}_Points"].mean()
-    reb_win = df[df['Win'] == 1][f"{player}_Rebounds"].mean()
-    reb_loss = df[df['Win'] == 0][f"{player}_Rebounds"].mean()
-    ast_win = df[df['Win'] == 1][f"{player}_Assists"].mean()
-    ast_loss = df[df['Win'] == 0][f"{player}_Assists"].mean()
-    
+    table['Offensive_Impact'] = (corr['Points'] + corr['FGM']) / 2
+    table['Supporting_Impact'] = (corr['Rebounds'] + corr['Assists']) / 2
+    table['Total_Impact'] = corr[stats].mean(axis=1, skipna=False)
+
     # Calculate "inefficiency score" - how much they do things that don't help win
-    inefficiency = 0
-    if points_corr < 0:
-        inefficiency += abs(points_corr)
-    if rebounds_corr < 0:
-        inefficiency += abs(rebounds_corr)
-    if assists_corr < 0:
-        inefficiency += abs(assists_corr)
-    
-    player_analysis.append({
-        'Player': player,
-        'Points_Corr': points_corr,
-        'Rebounds_Corr': rebounds_corr,
-        'Assists_Corr': assists_corr,
-        'FGM_Corr': fgm_corr,
-        'Offensive_Impact': offensive_impact,
-        'Supporting_Impact': supporting_impact,
-        'Total_Impact': total_impact,
-        'Inefficiency_Score': inefficiency,
-        'Pts_Win_Avg': pts_win,
-        'Pts_Loss_Avg': pts_loss,
-        'Reb_Win_Avg': reb_win,
-        'Reb_Loss_Avg': reb_loss,
-        'Ast_Win_Avg': ast_win,
-        'Ast_Loss_Avg': ast_loss
-    })
+    table['Inefficiency_Score'] = (-corr[['Points', 'Rebounds', 'Assists']]).clip(lower=0).sum(axis=1)
+    return table
+
+
+@timed('analyze.build')
+@memoized('build')
+def analyze(df, win_corr=None, win_sig=None, splits=None):
+    # Analyze each player's stat correlations and performance
+
+    # Stat correlations and win/loss averages for every player in one pass each
+    columns = [f"{player}_{stat}" for player in team_players for stat in stats]
+    if win_corr is None:
+        win_corr = win_correlations(df, columns)
+    stat_corr = select_columns(win_corr, columns).pivot(index='Player', columns='Stat', values='Correlation')
+    # Permutation p-values, so a +0.3 on 18 games isn't mistaken for a sure thing
+    if win_sig is None:
+        win_sig = win_significance(df, columns, seed=0)
+    stat_p = select_columns(win_sig, columns).pivot(index='Player', columns='Stat', values='P_Value')
+    if splits is None:
+        splits = result_splits(df, columns)
+    splits = player_splits(splits, team_players, stats)
+
+    impacts = impact_table(stat_corr.reindex(team_players))
+
+    # Get averages in wins vs losses
+    averages = splits[['Win_Avg', 'Loss_Avg']].unstack('stat')
+    averages = averages.reindex(team_players).rename_axis(index=None)
+
+    analysis_df = pd.concat([
+        impacts[[f'{stat}_Corr' for stat in stats]],
+        stat_p.reindex(team_players)[stats].add_suffix('_P'),
+        impacts[['Offensive_Impact', 'Supporting_Impact', 'Total_Impact', 'Inefficiency_Score']],
+        pd.DataFrame({
+            f'{short}_{result}_Avg': averages[(f'{result}_Avg', stat)]
+            for short, stat in [('Pts', 'Points'), ('Reb', 'Rebounds'), ('Ast', 'Assists')]
+            for result in ['Win', 'Loss']
+        }),
+    ], axis=1).rename_axis('Player').reset_index()
+
+    # Sort by inefficiency score to find who needs build change most
+    analysis_df = analysis_df.sort_values('Inefficiency_Score', ascending=False)
+
+    return analysis_df
+
+
+# A condition is (column, comparison, threshold); a rule holds where all of its
+# conditions do, so a rule with none holds everywhere
+_COMPARE = {'>': np.greater, '>=': np.greater_equal, '<': np.less, '<=': np.less_equal}
+
+# Build archetypes in priority order: each player gets the first build whose rule holds.
+# Advice lines are what print_report() says, filled from the player's row.
+BuildRule = namedtuple('BuildRule', ['build', 'conditions', 'advice'])
+
+BUILD_RULES = [
+    BuildRule('PURE PLAYMAKER', [('Assists_Corr', '>', 0.3), ('Points_Corr', '<', 0)],
+              ["→ PURE PLAYMAKER (e.g., 'Pace Commander', 'Dot Dispenser')",
+               "→ Focus: Max passing, ball handle, speed with ball",
+               "→ Why: Your assists win games ({Assists_Corr:+.3f}), but scoring doesn't ({Points_Corr:+.3f})"]),
+    BuildRule('REBOUNDING SPECIALIST', [('Rebounds_Corr', '>', 0.4)],
+              ["→ REBOUNDING SPECIALIST (e.g., 'Pitbull', 'The Guard Dog')",
+               "→ Focus: Max rebounding, interior defense, strength",
+               "→ Why: Your boards are critical to winning ({Rebounds_Corr:+.3f})"]),
+    BuildRule('TWO-WAY BUILD', [('Offensive_Impact', '>', 0.2), ('Supporting_Impact', '>', 0.2)],
+              ["→ TWO-WAY BUILD (e.g., 'Mr. Two Way', 'Big Glide')",
+               "→ Focus: Balanced scoring and supporting stats",
+               "→ Why: You impact winning in multiple ways"]),
+    BuildRule('SCORING BUILD', [('Offensive_Impact', '>', 0.2)],
+              ["→ SCORING BUILD (e.g., 'Swish Lord', 'Unguardable')",
+               "→ Focus: Max shooting, driving, finishing",
+               "→ Why: Your offense drives wins"]),
+    BuildRule('REBUILD NEEDED', [('Inefficiency_Score', '>', 0.3)],
+              ["→ REBUILD NEEDED - Current build not matching role",
+               "→ Pick ONE identity: Either pure playmaker OR pure scorer"]),
+    BuildRule('CURRENT BUILD IS WORKING', [],
+              ["→ CURRENT BUILD IS WORKING - Minor adjustments only"]),
+]
+BUILDS = [rule.build for rule in BUILD_RULES]
+BUILD_ADVICE = [rule.advice for rule in BUILD_RULES]
+
+# A stat's Win correlation above STRENGTH_AT is a strength to keep (HELPING in the
+# report), below WEAKNESS_AT a weakness to fix (HURTING)
+STRENGTH_AT = 0.2
+WEAKNESS_AT = -0.1
+TagRule = namedtuple('TagRule', ['column', 'strength', 'weakness'])
+TAG_RULES = [
+    TagRule('Points_Corr', 'Scoring', 'Scoring hurts team'),
+    TagRule('Rebounds_Corr', 'Rebounding', 'Rebounding not needed'),
+    TagRule('Assists_Corr', 'Playmaking', 'Over-passing'),
+]
+VERDICTS = ['❌ HURTING', '✅ HELPING', '→ NEUTRAL']
+
+# How urgently a player needs a new build: the first tier whose minimum Inefficiency_Score
+# they exceed, with its chart color
+PRIORITY_TIERS = [('🔴 PRIORITY', 0.3, '#d32f2f'), ('🟡 CONSIDER', 0.15, '#ff9800'), ('🟢 OPTIMAL', -np.inf, '#4caf50')]
+
+
+def rule_mask(table, conditions):
+    """Rows of `table` where every (column, comparison, threshold) condition holds."""
+    mask = np.ones(len(table), dtype=bool)
+    for column, op, threshold in conditions:
+        mask &= _COMPARE[op](table[column].to_numpy(dtype=np.float64, na_value=np.nan), threshold)
+    return mask
+
+
+def build_codes(table, rules=BUILD_RULES):
+    """Index into `rules` (BUILDS by default) for every row of an impact table (see impact_table)."""
+    return np.select([rule_mask(table, rule.conditions) for rule in rules], range(len(rules)),
+                     default=len(rules) - 1)
+
+
+def verdict_codes(values):
+    """Index into VERDICTS for an array of Win correlations."""
+    values = np.asarray(values, dtype=np.float64)
+    return np.select([values < WEAKNESS_AT, values > STRENGTH_AT], [0, 1], default=2)
+
+
+def priority_codes(scores):
+    """Index into PRIORITY_TIERS for an array of inefficiency scores."""
+    scores = np.asarray(scores, dtype=np.float64)
+    return np.select([scores > minimum for _, minimum, _ in PRIORITY_TIERS[:-1]],
+                     range(len(PRIORITY_TIERS) - 1), default=len(PRIORITY_TIERS) - 1)
+
+
+def recommend(analysis_df, rules=BUILD_RULES):
+    """
+    One row per player: build, priority tier, strengths and weaknesses.
 
-analysis_df = pd.DataFrame(player_analysis)
-
-# Sort by inefficiency score to find who needs build change most
-analysis_df = analysis_df.sort_values('Inefficiency_Score', ascending=False)
-
-# Create visualization
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-
-# Chart 1: Player stat correlations heatmap
-ax1 = axes[0, 0]
-corr_data = analysis_df[['Player', 'Points_Corr', 'Rebounds_Corr', 'Assists_Corr', 'FGM_Corr']].set_index('Player')
-sns.heatmap(corr_data.T, annot=True, fmt='.3f', cmap='RdYlGn', center=0, 
-            vmin=-0.5, vmax=0.5, ax=ax1, cbar_kws={'label': 'Correlation'})
-ax1.set_title('Player Stat Correlations with Wins\n(Red = Hurting, Green = Helping)', 
-              fontsize=13, fontweight='bold')
-ax1.set_xlabel('')
-ax1.set_ylabel('Stat Type', fontsize=11, fontweight='bold')
-
-# Chart 2: Inefficiency scores (who's doing things that don't help)
-ax2 = axes[0, 1]
-colors_ineff = ['#d32f2f' if x > 0.3 else '#ff9800' if x > 0.15 else '#4caf50' 
-                for x in analysis_df['Inefficiency_Score']]
-bars = ax2.barh(analysis_df['Player'], analysis_df['Inefficiency_Score'], 
-                color=colors_ineff, alpha=0.8, edgecolor='black', linewidth=1.5)
-ax2.set_xlabel('Inefficiency Score (Higher = Need Build Change)', fontsize=11, fontweight='bold')
-ax2.set_title('Who Needs a New Build Most?\n(Based on Negative Stat Correlations)', 
-              fontsize=13, fontweight='bold')
-ax2.grid(axis='x', alpha=0.3)
-
-# Add value labels
-for i, (player, score) in enumerate(zip(analysis_df['Player'], analysis_df['Inefficiency_Score'])):
-    ax2.text(score + 0.01, i, f'{score:.3f}', ha='left', va='center', fontweight='bold')
-
-# Chart 3: Role mismatch - Offensive vs Supporting impact
-ax3 = axes[1, 0]
-scatter = ax3.scatter(analysis_df['Offensive_Impact'], analysis_df['Supporting_Impact'],
-                     s=500, alpha=0.6, c=analysis_df['Inefficiency_Score'], 
-                     cmap='RdYlGn_r', edgecolors='black', linewidth=2)
-ax3.axhline(y=0, color='black', linestyle='--', linewidth=1)
-ax3.axvline(x=0, color='black', linestyle='--', linewidth=1)
-ax3.set_xlabel('Offensive Impact (Scoring) →', fontsize=11, fontweight='bold')
-ax3.set_ylabel('Supporting Impact (Rebounds/Assists) →', fontsize=11, fontweight='bold')
-ax3.set_title('Current Role vs Ideal Role\n(Color shows need for change)', 
-              fontsize=13, fontweight='bold')
-ax3.grid(True, alpha=0.3)
-
-# Add player labels
-for _, row in analysis_df.iterrows():
-    ax3.annotate(row['Player'], (row['Offensive_Impact'], row['Supporting_Impact']),
-                fontsize=9, fontweight='bold', ha='center', va='center')
-
-plt.colorbar(scatter, ax=ax3, label='Need for Build Change')
-
-# Chart 4: What they should focus on
-ax4 = axes[1, 1]
-ax4.axis('off')
-
-# Generate recommendations
-recommendations = []
-for _, row in analysis_df.iterrows():
-    player = row['Player']
-    
-    # Determine what they should focus on
-    strengths = []
-    weaknesses = []
-    
-    if row['Points_Corr'] > 0.2:
-        strengths.append('Scoring')
-    elif row['Points_Corr'] < -0.1:
-        weaknesses.append('Scoring hurts team')
-    
-    if row['Rebounds_Corr'] > 0.2:
-        strengths.append('Rebounding')
-    elif row['Rebounds_Corr'] < -0.1:
-        weaknesses.append('Rebounding not needed')
-    
-    if row['Assists_Corr'] > 0.2:
-        strengths.append('Playmaking')
-    elif row['Assists_Corr'] < -0.1:
-        weaknesses.append('Over-passing')
-    
-    recommendations.append({
-        'Player': player,
-        'Strengths': strengths,
-        'Weaknesses': weaknesses,
-        'Score': row['Inefficiency_Score']
+    Every rule is a mask over all players at once, so a whole league's table costs a
+    handful of array comparisons and lookups, with no per-player Python.
+    """
+    # Each player's verdicts on the tagged stats as one mixed-radix code, and the
+    # (strengths, weaknesses) of every possible code, built once and looked up
+    codes = np.zeros(len(analysis_df), dtype=np.intp)
+    for tag in TAG_RULES:
+        codes = codes * len(VERDICTS) + verdict_codes(analysis_df[tag.column])
+    combos = list(product(range(len(VERDICTS)), repeat=len(TAG_RULES)))
+    strengths, weaknesses = np.empty(len(combos), dtype=object), np.empty(len(combos), dtype=object)
+    for i, combo in enumerate(combos):
+        strengths[i] = tuple(tag.strength for tag, code in zip(TAG_RULES, combo) if code == 1)
+        weaknesses[i] = tuple(tag.weakness for tag, code in zip(TAG_RULES, combo) if code == 0)
+
+    return pd.DataFrame({
+        'Player': analysis_df['Player'].to_numpy(),
+        'Build': np.array([rule.build for rule in rules])[build_codes(analysis_df, rules)],
+        'Tier': np.array([name for name, _, _ in PRIORITY_TIERS])[priority_codes(analysis_df['Inefficiency_Score'])],
+        'Strengths': strengths[codes],
+        'Weaknesses': weaknesses[codes],
+        'Score': analysis_df['Inefficiency_Score'].to_numpy(),
     })
 
-# Display recommendations
-rec_text = "🔧 BUILD CHANGE PRIORITY:\n\n"
-for i, rec in enumerate(recommendations[:3], 1):  # Top 3
-    rec_text += f"{i}. {rec['Player']}\n"
-    if rec['Weaknesses']:
-        rec_text += f"   ❌ Fix: {', '.join(rec['Weaknesses'])}\n"
-    if rec['Strengths']:
-        rec_text += f"   ✅ Keep: {', '.join(rec['Strengths'])}\n"
-    rec_text += "\n"
-
-ax4.text(0.05, 0.95, rec_text, transform=ax4.transAxes, fontsize=11,
-         verticalalignment='top', fontfamily='monospace',
-         bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.9))
-
-plt.tight_layout()
-plt.savefig('build_recommendations.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-# Print detailed analysis
-print("\n" + "=" * 100)
-print(" " * 30 + "🏀 BUILD CHANGE RECOMMENDATIONS 🏀")
-print("=" * 100)
-
-print("\nRANKED BY WHO NEEDS A NEW BUILD MOST:\n")
-print("-" * 100)
-
-for i, row in analysis_df.iterrows():
-    player = row['Player']
-    print(f"\n{'🔴 PRIORITY' if row['Inefficiency_Score'] > 0.3 else '🟡 CONSIDER' if row['Inefficiency_Score'] > 0.15 else '🟢 OPTIMAL'}: {player}")
-    print(f"Inefficiency Score: {row['Inefficiency_Score']:.3f}")
-    print(f"\nStat Correlations:")
-    print(f"  Points:   {row['Points_Corr']:+.3f} {'❌ HURTING' if row['Points_Corr'] < -0.1 else '✅ HELPING' if row['Points_Corr'] > 0.2 else '→ NEUTRAL'}")
-    print(f"  Rebounds: {row['Rebounds_Corr']:+.3f} {'❌ HURTING' if row['Rebounds_Corr'] < -0.1 else '✅ HELPING' if row['Rebounds_Corr'] > 0.2 else '→ NEUTRAL'}")
-    print(f"  Assists:  {row['Assists_Corr']:+.3f} {'❌ HURTING' if row['Assists_Corr'] < -0.1 else '✅ HELPING' if row['Assists_Corr'] > 0.2 else '→ NEUTRAL'}")
-    print(f"  FGM:      {row['FGM_Corr']:+.3f} {'❌ HURTING' if row['FGM_Corr'] < -0.1 else '✅ HELPING' if row['FGM_Corr'] > 0.2 else '→ NEUTRAL'}")
-    
-    print(f"\nWins vs Losses Performance:")
-    print(f"  Scoring:    {row['Pts_Win_Avg']:.1f} (wins) vs {row['Pts_Loss_Avg']:.1f} (losses)")
-    print(f"  Rebounding: {row['Reb_Win_Avg']:.1f} (wins) vs {row['Reb_Loss_Avg']:.1f} (losses)")
-    print(f"  Assists:    {row['Ast_Win_Avg']:.1f} (wins) vs {row['Ast_Loss_Avg']:.1f} (losses)")
-    
-    # Recommend builds based on the data
-    print(f"\n💡 BUILD RECOMMENDATION:")
-    
-    if row['Assists_Corr'] > 0.3 and row['Points_Corr'] < 0:
-        print(f"   → PURE PLAYMAKER (e.g., 'Pace Commander', 'Dot Dispenser')")
-        print(f"   → Focus: Max passing, ball handle, speed with ball")
-        print(f"   → Why: Your assists win games ({row['Assists_Corr']:+.3f}), but scoring doesn't ({row['Points_Corr']:+.3f})")
-    
-    elif row['Rebounds_Corr'] > 0.4:
-        print(f"   → REBOUNDING SPECIALIST (e.g., 'Pitbull', 'The Guard Dog')")
-        print(f"   → Focus: Max rebounding, interior defense, strength")
-        print(f"   → Why: Your boards are critical to winning ({row['Rebounds_Corr']:+.3f})")
-    
-    elif row['Offensive_Impact'] > 0.2 and row['Supporting_Impact'] > 0.2:
-        print(f"   → TWO-WAY BUILD (e.g., 'Mr. Two Way', 'Big Glide')")
-        print(f"   → Focus: Balanced scoring and supporting stats")
-        print(f"   → Why: You impact winning in multiple ways")
-    
-    elif row['Offensive_Impact'] > 0.2:
-        print(f"   → SCORING BUILD (e.g., 'Swish Lord', 'Unguardable')")
-        print(f"   → Focus: Max shooting, driving, finishing")
-        print(f"   → Why: Your offense drives wins")
-    
-    elif row['Inefficiency_Score'] > 0.3:
-        print(f"   → REBUILD NEEDED - Current build not matching role")
-        print(f"   → Pick ONE identity: Either pure playmaker OR pure scorer")
-    
-    else:
-        print(f"   → CURRENT BUILD IS WORKING - Minor adjustments only")
-    
+
+def plot_build_recommendations(analysis_df, recommendations):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Create visualization
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+
+    # Chart 1: Player stat correlations heatmap
+    ax1 = axes[0, 0]
+    corr_data = analysis_df[['Player', 'Points_Corr', 'Rebounds_Corr', 'Assists_Corr', 'FGM_Corr']].set_index('Player')
+    sns.heatmap(corr_data.T, annot=True, fmt='.3f', cmap='RdYlGn', center=0, 
+                vmin=-0.5, vmax=0.5, ax=ax1, cbar_kws={'label': 'Correlation'})
+    ax1.set_title('Player Stat Correlations with Wins\n(Red = Hurting, Green = Helping)', 
+                  fontsize=13, fontweight='bold')
+    ax1.set_xlabel('')
+    ax1.set_ylabel('Stat Type', fontsize=11, fontweight='bold')
+
+    # Chart 2: Inefficiency scores (who's doing things that don't help)
+    ax2 = axes[0, 1]
+    colors_ineff = np.array([color for _, _, color in PRIORITY_TIERS])[priority_codes(analysis_df['Inefficiency_Score'])]
+    bars = ax2.barh(analysis_df['Player'], analysis_df['Inefficiency_Score'], 
+                    color=colors_ineff, alpha=0.8, edgecolor='black', linewidth=1.5)
+    ax2.set_xlabel('Inefficiency Score (Higher = Need Build Change)', fontsize=11, fontweight='bold')
+    ax2.set_title('Who Needs a New Build Most?\n(Based on Negative Stat Correlations)', 
+                  fontsize=13, fontweight='bold')
+    ax2.grid(axis='x', alpha=0.3)
+
+    # Add value labels
+    for i, (player, score) in enumerate(zip(analysis_df['Player'], analysis_df['Inefficiency_Score'])):
+        ax2.text(score + 0.01, i, f'{score:.3f}', ha='left', va='center', fontweight='bold')
+
+    # Chart 3: Role mismatch - Offensive vs Supporting impact
+    ax3 = axes[1, 0]
+    scatter = ax3.scatter(analysis_df['Offensive_Impact'], analysis_df['Supporting_Impact'],
+                         s=500, alpha=0.6, c=analysis_df['Inefficiency_Score'], 
+                         cmap='RdYlGn_r', edgecolors='black', linewidth=2)
+    ax3.axhline(y=0, color='black', linestyle='--', linewidth=1)
+    ax3.axvline(x=0, color='black', linestyle='--', linewidth=1)
+    ax3.set_xlabel('Offensive Impact (Scoring) →', fontsize=11, fontweight='bold')
+    ax3.set_ylabel('Supporting Impact (Rebounds/Assists) →', fontsize=11, fontweight='bold')
+    ax3.set_title('Current Role vs Ideal Role\n(Color shows need for change)', 
+                  fontsize=13, fontweight='bold')
+    ax3.grid(True, alpha=0.3)
+
+    # Add player labels
+    for _, row in analysis_df.iterrows():
+        ax3.annotate(row['Player'], (row['Offensive_Impact'], row['Supporting_Impact']),
+                    fontsize=9, fontweight='bold', ha='center', va='center')
+
+    plt.colorbar(scatter, ax=ax3, label='Need for Build Change')
+
+    # Chart 4: What they should focus on
+    ax4 = axes[1, 1]
+    ax4.axis('off')
+
+    # Display recommendations
+    rec_text = "🔧 BUILD CHANGE PRIORITY:\n\n"
+    for i, rec in enumerate(recommendations.head(3).itertuples(), 1):  # Top 3
+        rec_text += f"{i}. {rec.Player}\n"
+        if rec.Weaknesses:
+            rec_text += f"   ❌ Fix: {', '.join(rec.Weaknesses)}\n"
+        if rec.Strengths:
+            rec_text += f"   ✅ Keep: {', '.join(rec.Strengths)}\n"
+        rec_text += "\n"
+
+    ax4.text(0.05, 0.95, rec_text, transform=ax4.transAxes, fontsize=11,
+             verticalalignment='top', fontfamily='monospace',
+             bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.9))
+
+    plt.tight_layout()
+    return fig
+
+
+def print_report(analysis_df):
+    # Print detailed analysis
+    print("\n" + "=" * 100)
+    print(" " * 30 + "🏀 BUILD CHANGE RECOMMENDATIONS 🏀")
+    print("=" * 100)
+
+    print("\nRANKED BY WHO NEEDS A NEW BUILD MOST:\n")
     print("-" * 100)
 
-print("\n" + "=" * 100)
-print("🎯 BOTTOM LINE:")
-print("=" * 100)
+    tiers = priority_codes(analysis_df['Inefficiency_Score'])
+    verdicts = np.column_stack([verdict_codes(analysis_df[f'{stat}_Corr']) for stat in stats])
+    for build, tier, verdict, (_, row) in zip(build_codes(analysis_df), tiers, verdicts, analysis_df.iterrows()):
+        player = row['Player']
+        print(f"\n{PRIORITY_TIERS[tier][0]}: {player}")
+        print(f"Inefficiency Score: {row['Inefficiency_Score']:.3f}")
+        print(f"\nStat Correlations:")
+        for stat, code in zip(stats, verdict):
+            label = f'{stat}:'
+            print(f"  {label:<9} {row[f'{stat}_Corr']:+.3f} (p={row[f'{stat}_P']:.2f}) {VERDICTS[code]}")
+
+        print(f"\nWins vs Losses Performance:")
+        print(f"  Scoring:    {row['Pts_Win_Avg']:.1f} (wins) vs {row['Pts_Loss_Avg']:.1f} (losses)")
+        print(f"  Rebounding: {row['Reb_Win_Avg']:.1f} (wins) vs {row['Reb_Loss_Avg']:.1f} (losses)")
+        print(f"  Assists:    {row['Ast_Win_Avg']:.1f} (wins) vs {row['Ast_Loss_Avg']:.1f} (losses)")
+
+        # Recommend builds based on the data
+        print(f"\n💡 BUILD RECOMMENDATION:")
+
+        for line in BUILD_ADVICE[build]:
+            print("   " + line.format(**row))
+
+        print("-" * 100)
+
+    print("\n" + "=" * 100)
+    print("🎯 BOTTOM LINE:")
+    print("=" * 100)
+
+    worst_player = analysis_df.iloc[0]
+    print(f"\n{worst_player['Player']} needs a build change MOST.")
+    print(f"Their inefficiency score ({worst_player['Inefficiency_Score']:.3f}) shows they're doing things that don't help win.")
+    print(f"\nVisit https://www.nba2klab.com/nba2k-pro-tuned-builds to find the right Pro Tuned Build!")
+    print("=" * 100)
+
+
+def figures(analysis_df, recommendations):
+    return [FigureJob('build_recommendations.png', plot_build_recommendations,
+                      (analysis_df, recommendations))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build change recommendations per player.')
+    args = add_log_args(add_profile_args(add_render_args(parser))).parse_args(argv)
+
+    with profile_from_args(args, 'nba_player_update'):
+        # Load your data
+        df = load_games(args.log)
+
+        analysis_df = analyze(df)
+        recommendations = recommend(analysis_df)
+        render_from_args(figures(analysis_df, recommendations), args)
+        print_report(analysis_df)
+
 
-worst_player = analysis_df.iloc[0]
-print(f"\n{worst_player['Player']} needs a build change MOST.")
-print(f"Their inefficiency score ({worst_player['Inefficiency_Score']:.3f}) shows they're doing things that don't help win.")
-print(f"\nVisit https://www.nba2klab.com/nba2k-pro-tuned-builds to find the right Pro Tuned Build!")
-print("=" * 100)
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+import argparse
+from collections import namedtuple
+
+from correlations import numeric_columns, win_correlations
+from game_store import DATA_PATH, add_log_args, load_games, team_players, stats
+from instrument import add_profile_args, profile_from_args, stage as profile_stage
+from rendering import add_render_args, render_from_args
+from significance import win_significance
+from splits import result_splits
+from thresholds import threshold_columns, win_thresholds
+
+Stage = namedtuple('Stage', ['name', 'deps', 'func'])
+
+
+class Pipeline:
+    """
+    Named stages with explicit dependencies.
+
+    run() computes each requested stage and everything it depends on exactly once,
+    so reports that share an intermediate (Win correlations, win/loss splits, ...)
+    reuse the same result within one process.
+    """
+
+    def __init__(self):
+        self.stages = {}
+
+    def stage(self, name, deps=()):
+        def register(func):
+            self.stages[name] = Stage(name, tuple(deps), func)
+            return func
+        return register
+
+    def order(self, targets, known=()):
+        """Topological order of `targets` and their dependencies, short of the `known` stages."""
+        ordered, visiting, done = [], set(), set(known)
+
+        def visit(name):
+            if name in done:
+                return
+            if name not in self.stages:
+                raise KeyError(f"unknown stage '{name}'")
+            if name in visiting:
+                raise ValueError(f"dependency cycle through '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            ordered.append(name)
+
+        for target in targets:
+            visit(target)
+        return ordered
+
+    def run(self, targets, results=None):
+        """Compute `targets`; `results` may carry precomputed stages (e.g. a loaded frame)."""
+        results = dict(results or {})
+        for name in self.order(targets, results):
+            stage = self.stages[name]
+            with profile_stage(f'stage.{name}'):
+                results[name] = stage.func(*(results[dep] for dep in stage.deps))
+        return results
+
+
+pipeline = Pipeline()
+
+
+# -- shared intermediates --------------------------------------------------------
+
+
+@pipeline.stage('load')
+def _load():
+    # Parse + derive (Win, *_Grade_Numeric, Opp_Total_*) in one cached step
+    return load_games(DATA_PATH)
+
+
+@pipeline.stage('correlate', deps=['load'])
+def _correlate(df):
+    # Every numeric column against Win in one product; reports pick their rows
+    return win_correlations(df, numeric_columns(df))
+
+
+@pipeline.stage('significance', deps=['load'])
+def _significance(df):
+    columns = ([f"{player}_{stat}" for player in team_players for stat in stats] +
+               [f'Opp_Total_{stat}' for stat in stats])
+    return win_significance(df, columns, seed=0)
+
+
+@pipeline.stage('win_model', deps=['load'])
+def _win_model(df):
+    import win_model
+
+    # Warm-started from the last saved fit, so a rerun after a new game takes a step or two
+    model, _ = win_model.refit(df)
+    return model
+
+
+@pipeline.stage('thresholds', deps=['load'])
+def _thresholds(df):
+    # Win-rate-maximizing cutoff of every team stat and opponent total
+    return win_thresholds(df, threshold_columns(), seed=0)
+
+
+@pipeline.stage('split', deps=['load'])
+def _split(df):
+    # Means, quantiles, modes and differences by result for every stat, in one pass
+    return result_splits(df)
+
+
+# -- reports ---------------------------------------------------------------------
+# Each report stage returns (print_fn, figure_jobs) so text and rendering can be batched.
+# Report modules are imported inside their stage, so only the selected ones get loaded.
+
+Report = namedtuple('Report', ['print', 'figures'])
+
+
+@pipeline.stage('final', deps=['load', 'correlate', 'significance', 'win_model', 'thresholds'])
+def _final(df, win_corr, win_sig, model, thresholds):
+    import final_data
+
+    top_offense, top_defense, key_factors, model_coef = final_data.analyze(df, win_corr, win_sig, model)
+    wins = df['Win'].sum()
+    losses = len(df) - wins
+    target = final_data.scoring_target(df, thresholds)
+    return Report(lambda: final_data.print_report(top_offense, top_defense, wins, losses, target, model_coef),
+                  final_data.figures(key_factors, top_defense, wins, losses, target))
+
+
+@pipeline.stage('recommend', deps=['load', 'correlate', 'significance', 'split'])
+def _recommend(df, win_corr, win_sig, splits):
+    import nba_player_update
+
+    analysis_df = nba_player_update.analyze(df, win_corr, win_sig, splits)
+    return analysis_df, nba_player_update.recommend(analysis_df)
+
+
+@pipeline.stage('build', deps=['recommend'])
+def _build(recommendation):
+    import nba_player_update
+
+    analysis_df, recommendations = recommendation
+    return Report(lambda: nba_player_update.print_report(analysis_df),
+                  nba_player_update.figures(analysis_df, recommendations))
+
+
+@pipeline.stage('team_stats', deps=['load', 'correlate', 'split'])
+def _team_stats(df, win_corr, splits):
+    import team_stats
+
+    corr_df, splits = team_stats.analyze(df, win_corr, splits)
+
+    def show():
+        team_stats.print_correlations(corr_df)
+        team_stats.print_splits(df, splits)
+
+    return Report(show, team_stats.figures(corr_df))
+
+
+@pipeline.stage('team_data', deps=['load', 'correlate', 'split'])
+def _team_data(df, win_corr, splits):
+    import team_data
+
+    grade_corr_df = team_data.analyze(df, win_corr)
+
+    def show():
+        team_data.print_report(df, grade_corr_df, splits)
+        team_data.print_takeaway(grade_corr_df)
+
+    return Report(show, team_data.figures(df, grade_corr_df))
+
+
+@pipeline.stage('four_quad', deps=['load', 'correlate'])
+def _four_quad(df, win_corr):
+    import four_quad_char
+
+    player_df = four_quad_char.analyze(df, win_corr)
+    return Report(lambda: four_quad_char.print_report(player_df), four_quad_char.figures(player_df))
+
+
+@pipeline.stage('opp', deps=['load', 'split', 'thresholds'])
+def _opp(df, splits, thresholds):
+    import opp
+
+    opp_df = opp.analyze(df, splits, thresholds)
+
+    def show():
+        opp.print_summary(opp_df)
+        opp.print_breakdown(opp_df)
+
+    return Report(show, opp.figures(df, opp_df))
+
+
+@pipeline.stage('pairplot', deps=['load'])
+def _pairplot(df):
+    import snsplot
+
+    team = snsplot.team_stat_frame(df)
+    return Report(lambda: snsplot.print_report(team), snsplot.figures(team))
+
+
+REPORTS = ['final', 'build', 'team_stats', 'team_data', 'four_quad', 'opp', 'pairplot']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run any subset of the analyses in one process.')
+    parser.add_argument('reports', nargs='*', metavar='REPORT',
+                        help=f"reports to run (default: all of {', '.join(REPORTS)})")
+    parser.add_argument('--list', action='store_true', help="print the stage graph and exit")
+    args = add_log_args(add_profile_args(add_render_args(parser))).parse_args(argv)
+
+    if args.list:
+        for name in pipeline.order(REPORTS):
+            deps = pipeline.stages[name].deps
+            print(f"{name:<14} <- {', '.join(deps) if deps else '(source)'}")
+        return
+
+    unknown = [name for name in args.reports if name not in REPORTS]
+    if unknown:
+        parser.error(f"unknown report(s): {', '.join(unknown)}; choose from {', '.join(REPORTS)}")
+
+    reports = args.reports or REPORTS
+    with profile_from_args(args, 'pipeline'):
+        with profile_stage('stage.load'):
+            df = load_games(args.log)
+        results = pipeline.run(reports, {'load': df})
+
+        for name in reports:
+            results[name].print()
+
+        jobs = [job for name in reports for job in results[name].figures]
+        render_from_args(jobs, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from game_store import CACHE_DIR
+from instrument import stage
+
+MANIFEST_PATH = os.path.join(CACHE_DIR, 'render_manifest.json')
+
+# One PNG: plot(*args) must build and return a fresh matplotlib Figure.
+# Plot functions import matplotlib/seaborn themselves, so building jobs (and
+# everything in a --no-plots run) never pays for the plotting stack.
+FigureJob = namedtuple('FigureJob', ['path', 'plot', 'args', 'dpi'], defaults=[(), 300])
+
+
+def add_render_args(parser):
+    parser.add_argument('--no-plots', action='store_true',
+                        help="print the text reports only; matplotlib/seaborn are never imported")
+    parser.add_argument('--headless', action='store_true',
+                        help="render with the Agg backend and never call plt.show()")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processes for headless rendering (default: one per stale figure, up to CPU count)")
+    parser.add_argument('--force', action='store_true',
+                        help="re-render PNGs even when their inputs are unchanged")
+    return parser
+
+
+def use_headless():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _feed(h, obj):
+    # Stable content hash of plot inputs (frames hash by value, not by identity)
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        h.update(type(obj).__name__.encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        names = obj.columns if isinstance(obj, pd.DataFrame) else [obj.name]
+        h.update(repr([str(n) for n in names]).encode())
+        h.update(repr([str(t) for t in (obj.dtypes if isinstance(obj, pd.DataFrame) else [obj.dtype])]).encode())
+    elif isinstance(obj, np.ndarray):
+        h.update(f'{obj.dtype}{obj.shape}'.encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(b'{')
+        for key in sorted(obj, key=repr):
+            _feed(h, key)
+            _feed(h, obj[key])
+        h.update(b'}')
+    elif isinstance(obj, (list, tuple)):
+        h.update(b'[')
+        for item in obj:
+            _feed(h, item)
+        h.update(b']')
+    else:
+        h.update(pickle.dumps(obj, protocol=4))
+
+
+def job_key(job):
+    """Hash of the plot function's module source, its inputs and the output parameters."""
+    # memo imports this module, so its module hash is imported on use. The whole source
+    # (and the repo modules it uses) counts: a plot reads constants and helpers from
+    # outside its own body, and editing those must redraw it too
+    from memo import _module_key
+
+    h = hashlib.sha1(job.plot.__qualname__.encode())
+    h.update(_module_key(job.plot.__module__).encode())
+    _feed(h, job.args)
+    _feed(h, {'dpi': job.dpi, 'path': os.path.basename(job.path)})
+    return h.hexdigest()
+
+
+def _load_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(manifest, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _save(fig, job):
+    fig.savefig(job.path, dpi=job.dpi, bbox_inches='tight')
+
+
+def _render_one(job):
+    # Runs inside a worker process: draw, save, free
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig = job.plot(*job.args)
+    _save(fig, job)
+    plt.close(fig)
+    return job.path
+
+
+def render_figures(jobs, headless=False, workers=None, force=False, manifest_path=MANIFEST_PATH):
+    """
+    Render figure jobs, skipping any PNG whose inputs and parameters match the last render.
+
+    Headless mode uses Agg, never blocks on plt.show() and spreads stale figures over a
+    process pool. Interactive mode draws every figure so it can be shown, but still only
+    re-saves the stale PNGs. Returns the list of paths that were (re)written.
+    """
+    manifest = _load_manifest(manifest_path)
+    keys = {job.path: job_key(job) for job in jobs}
+    stale = [job for job in jobs
+             if force or manifest.get(os.path.abspath(job.path)) != keys[job.path]
+             or not os.path.exists(job.path)]
+
+    if headless:
+        use_headless()
+        if workers is None:
+            workers = min(len(stale), os.cpu_count() or 1)
+        if workers > 1 and len(stale) > 1:
+            # Per-figure work happens in the workers; the profile sees the pool as one stage
+            with stage('render.pool'), ProcessPoolExecutor(max_workers=workers) as pool:
+                written = list(pool.map(_render_one, stale))
+        else:
+            written = []
+            for job in stale:
+                with stage(f'render.{os.path.basename(job.path)}'):
+                    written.append(_render_one(job))
+    else:
+        with stage('render.import'):
+            import matplotlib.pyplot as plt
+
+        stale_paths = {job.path for job in stale}
+        written = []
+        for job in jobs:
+            with stage(f'render.{os.path.basename(job.path)}'):
+                fig = job.plot(*job.args)
+                if job.path in stale_paths:
+                    _save(fig, job)
+                    written.append(job.path)
+        plt.show()
+
+    for path in written:
+        manifest[os.path.abspath(path)] = keys[path]
+    if written:
+        _save_manifest(manifest, manifest_path)
+    return written
+
+
+def render_from_args(jobs, args):
+    """render_figures() driven by the flags from add_render_args()."""
+    if args.no_plots:
+        return []
+    return render_figures(jobs, headless=args.headless, workers=args.workers, force=args.force)
@@ -0,0 +1,243 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from correlations import split_column, win_correlations
+from game_store import add_log_args, load_games, team_players, stats
+from instrument import add_profile_args, profile_from_args, timed
+from rendering import FigureJob, add_render_args, render_from_args
+
+DEFAULT_WINDOWS = [10, 25, 50]
+
+
+def in_order(df):
+    """Games in the order they were played (Date, then Game #)."""
+    keys = [col for col in ('Date', 'Game #') if col in df]
+    return df.sort_values(keys, kind='stable').reset_index(drop=True) if keys else df
+
+
+def _window_sums(values, window):
+    """
+    Sum of each trailing `window` rows of a 2D array, for every row at once.
+
+    One cumulative sum, then each window is the difference of two prefix sums: O(1) per
+    step per column however long the window. Rows before the first full window are NaN.
+    """
+    prefix = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=prefix[1:])
+    sums = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        sums[window - 1:] = prefix[window:] - prefix[:-window]
+    return sums
+
+
+def _prepare(df, columns):
+    X = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    # Center on the overall mean so long prefix sums don't cancel away the precision
+    X = X - np.nanmean(X, axis=0)
+    present = ~np.isnan(X)
+    w = df['Win'].to_numpy(dtype=np.float64)[:, None]
+    return np.where(present, X, 0.0), present.astype(np.float64), w
+
+
+def rolling_win_correlations(df, columns, window):
+    """Win correlation of every column over each trailing window of games (rows in play order)."""
+    X, present, w = _prepare(df, columns)
+    wp = w * present
+    n = _window_sums(present, window)
+    sx = _window_sums(X, window)
+    sy = _window_sums(wp, window)
+    sxx = _window_sums(X * X, window)
+    sxy = _window_sums(X * w, window)
+    # Win is 0/1, so sum(y^2) == sum(y)
+    var_x = n * sxx - sx * sx
+    var_y = n * sy - sy * sy
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = (n * sxy - sx * sy) / np.sqrt(var_x * var_y)
+    # A window where a stat (or the result) never changed has no correlation, however
+    # much rounding noise the prefix-sum differences leave behind
+    corr[~(var_x > 1e-12 * n * sxx) | ~(var_y > 0.5)] = np.nan
+    return pd.DataFrame(corr, index=df.index, columns=columns)
+
+
+def rolling_splits(df, columns, window):
+    """Trailing-window averages in wins and losses, columns (Win_Avg|Loss_Avg|Diff, column)."""
+    X = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    present = ~np.isnan(X)
+    Xz = np.where(present, X, 0.0)
+    w = df['Win'].to_numpy(dtype=np.float64)[:, None]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        win_avg = _window_sums(Xz * w, window) / _window_sums(present * w, window)
+        loss_avg = _window_sums(Xz * (1 - w), window) / _window_sums(present * (1 - w), window)
+    return pd.concat({
+        'Win_Avg': pd.DataFrame(win_avg, index=df.index, columns=columns),
+        'Loss_Avg': pd.DataFrame(loss_avg, index=df.index, columns=columns),
+        'Diff': pd.DataFrame(win_avg - loss_avg, index=df.index, columns=columns),
+    }, axis=1)
+
+
+def rolling_means(df, columns, window):
+    X = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    present = ~np.isnan(X)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = _window_sums(np.where(present, X, 0.0), window) / _window_sums(present.astype(np.float64), window)
+    return pd.DataFrame(means, index=df.index, columns=columns)
+
+
+def rolling_win_rate(df, windows):
+    win = df['Win'].to_numpy(dtype=np.float64)[:, None]
+    return pd.DataFrame({f'Last_{window}': _window_sums(win, window)[:, 0] / window for window in windows},
+                        index=df.index)
+
+
+def streaks(df):
+    """Every run of consecutive wins or losses: Result, Start/End row, Length."""
+    win = df['Win'].to_numpy(dtype=bool)
+    if len(win) == 0:
+        return pd.DataFrame(columns=['Result', 'Start', 'End', 'Length'])
+    starts = np.flatnonzero(np.concatenate([[True], win[1:] != win[:-1]]))
+    ends = np.concatenate([starts[1:], [len(win)]]) - 1
+    return pd.DataFrame({
+        'Result': np.where(win[starts], 'W', 'L'),
+        'Start': starts,
+        'End': ends,
+        'Length': ends - starts + 1,
+    })
+
+
+def current_streak(df):
+    """Streak length at every game: +k after k straight wins, -k after k straight losses."""
+    runs = streaks(df)
+    if runs.empty:
+        return pd.Series(dtype=np.int64)
+    lengths = np.arange(len(df)) - np.repeat(runs['Start'].to_numpy(), runs['Length'].to_numpy()) + 1
+    sign = np.where(df['Win'].to_numpy(dtype=bool), 1, -1)
+    return pd.Series(sign * lengths, index=df.index, name='Streak')
+
+
+def form_columns(df, n=4):
+    # The team stats and opponent totals most tied to winning over the whole log
+    columns = [f"{player}_{stat}" for player in team_players for stat in stats] + [f'Opp_Total_{stat}' for stat in stats]
+    corr = win_correlations(df, columns)
+    return corr.reindex(corr['Correlation'].abs().sort_values(ascending=False).index)['Column'].head(n).tolist()
+
+
+@timed('analyze.rolling')
+def analyze(df, windows=None, columns=None):
+    df = in_order(df)
+    windows = windows or DEFAULT_WINDOWS
+    columns = columns or form_columns(df)
+    return {
+        'games': df,
+        'win_rate': rolling_win_rate(df, windows),
+        'correlations': {window: rolling_win_correlations(df, columns, window) for window in windows},
+        'opp_points': {window: rolling_means(df, ['Opp_Total_Points'], window)['Opp_Total_Points']
+                       for window in windows},
+        'splits': {window: rolling_splits(df, columns, window) for window in windows},
+        'streaks': streaks(df),
+        'streak': current_streak(df),
+    }
+
+
+def _label(col):
+    player, stat = split_column(col)
+    return f'{player} {stat}' if player else stat
+
+
+def print_report(form):
+    games = form['games']
+    print("=" * 80)
+    print(f"FORM OVER TIME ({len(games)} games)")
+    print("=" * 80)
+
+    for col in form['win_rate'].columns:
+        window = int(col.split('_')[1])
+        rate = form['win_rate'][col].iloc[-1] if len(games) else np.nan
+        if np.isnan(rate):
+            print(f"  Last {window} games: not enough games yet")
+            continue
+        opp_points = form['opp_points'][window].iloc[-1]
+        print(f"  Last {window} games: {rate:.0%} wins, opponents averaging {opp_points:.1f} points")
+        latest = form['correlations'][window].iloc[-1].dropna()
+        for column, corr in latest.items():
+            print(f"      {_label(column):<24} correlation with wins {corr:+.3f}")
+
+    runs = form['streaks']
+    if len(runs):
+        print("\nSTREAKS:")
+        now = form['streak'].iloc[-1]
+        noun = ('win' if abs(now) == 1 else 'wins') if now > 0 else ('loss' if abs(now) == 1 else 'losses')
+        print(f"  Current: {abs(now)} straight {noun}")
+        for result, name in (('W', 'win'), ('L', 'losing')):
+            longest = runs[runs['Result'] == result]
+            if len(longest):
+                best = longest.loc[longest['Length'].idxmax()]
+                first, last = games['Game #'].iloc[best['Start']], games['Game #'].iloc[best['End']]
+                print(f"  Longest {name} streak: {best['Length']} (games {first}-{last})")
+    print("=" * 80)
+
+
+def plot_form(win_rate, opp_points, correlations, streak):
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(3, 1, figsize=(14, 12), sharex=True)
+    x = np.arange(1, len(streak) + 1)
+
+    # Panel 1: rolling win rate, with win/loss streak bars underneath
+    ax1 = axes[0]
+    ax1.bar(x, streak.to_numpy() / max(1, streak.abs().max()) * 0.2, bottom=0.5,
+            color=np.where(streak.to_numpy() > 0, 'green', 'red'), alpha=0.25, width=1.0, label='Streak')
+    for col in win_rate.columns:
+        ax1.plot(x, win_rate[col], linewidth=2, label=col.replace('_', ' '))
+    ax1.axhline(y=0.5, color='black', linestyle='--', linewidth=1)
+    ax1.set_ylim(0, 1)
+    ax1.set_ylabel('Win Rate', fontsize=12, fontweight='bold')
+    ax1.set_title('Form Over Time', fontsize=16, fontweight='bold')
+    ax1.legend(loc='upper left')
+    ax1.grid(alpha=0.3)
+
+    # Panel 2: rolling opponent points
+    ax2 = axes[1]
+    for window, series in opp_points.items():
+        ax2.plot(x, series, linewidth=2, label=f'Last {window}')
+    ax2.set_ylabel('Opponent Points (avg)', fontsize=12, fontweight='bold')
+    ax2.legend(loc='upper left')
+    ax2.grid(alpha=0.3)
+
+    # Panel 3: rolling win correlations of the key stats (shortest window)
+    ax3 = axes[2]
+    for col in correlations.columns:
+        ax3.plot(x, correlations[col], linewidth=2, label=_label(col))
+    ax3.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
+    ax3.set_ylim(-1, 1)
+    ax3.set_xlabel('Game', fontsize=12, fontweight='bold')
+    ax3.set_ylabel('Correlation with Wins', fontsize=12, fontweight='bold')
+    ax3.legend(loc='upper left')
+    ax3.grid(alpha=0.3)
+
+    plt.tight_layout()
+    return fig
+
+
+def figures(form):
+    window = min(form['correlations'])
+    return [FigureJob('form_over_time.png', plot_form,
+                      (form['win_rate'], form['opp_points'], form['correlations'][window], form['streak']))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rolling-window form, win correlations and streaks.')
+    parser.add_argument('--windows', type=int, nargs='+', default=DEFAULT_WINDOWS, help="trailing window sizes in games")
+    args = add_log_args(add_profile_args(add_render_args(parser))).parse_args(argv)
+
+    with profile_from_args(args, 'rolling'):
+        df = load_games(args.log)
+        form = analyze(df, args.windows)
+        print_report(form)
+        render_from_args(figures(form), args)
+
+
+if __name__ == '__main__':
+    main()
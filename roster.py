@@ -0,0 +1,49 @@
+import json
+import os
+from collections import Counter, namedtuple
+
+from game_store import DATA_PATH, team_players
+
+ROSTER_PATH = './data/rosters.json'
+
+# One crew: its name, the player prefixes used in its game log's columns, and that log
+Roster = namedtuple('Roster', ['team', 'players', 'path'])
+
+DEFAULT_TEAM = 'Home'
+
+
+def default_roster():
+    return Roster(DEFAULT_TEAM, list(team_players), DATA_PATH)
+
+
+def load_rosters(path=ROSTER_PATH):
+    """
+    Read the roster config, a JSON list of {"team", "players", "path"} objects.
+
+    Relative log paths resolve against the config's directory. Without a config file
+    the project's own crew and game log are the only roster.
+    """
+    if not os.path.exists(path):
+        return [default_roster()]
+    with open(path) as f:
+        entries = json.load(f)
+
+    base = os.path.dirname(path)
+    rosters = []
+    for entry in entries:
+        log = entry.get('path', DATA_PATH)
+        if not os.path.isabs(log) and 'path' in entry:
+            log = os.path.join(base, log)
+        rosters.append(Roster(entry['team'], list(entry['players']), log))
+
+    counts = Counter(roster.team for roster in rosters)
+    duplicates = sorted(name for name, count in counts.items() if count > 1)
+    if duplicates:
+        raise ValueError(f"duplicate team name(s) in {path}: {', '.join(duplicates)}")
+    return rosters
+
+
+def save_rosters(rosters, path=ROSTER_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump([roster._asdict() for roster in rosters], f, indent=2)
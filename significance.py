@@ -0,0 +1,119 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from correlations import split_column, win_correlations
+from instrument import timed
+
+# Resamples per batch; keeps the (batch x games) index matrix a few MB at league scale
+BATCH_SIZE = 1000
+
+
+def _matrix(df, columns):
+    # Missing stats are mean-imputed so every resample keeps the same shape
+    X = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    if np.isnan(X).any():
+        X = np.where(np.isnan(X), np.nanmean(X, axis=0), X)
+    return X
+
+
+def _standardize(a, axis=0):
+    ac = a - a.mean(axis=axis, keepdims=True)
+    norm = np.sqrt((ac * ac).sum(axis=axis, keepdims=True))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return ac / np.where(norm > 0, norm, np.nan)
+
+
+def bootstrap_counts(rng, n_resamples, n):
+    """Draw a (resamples x n) index matrix and return how often each game was drawn."""
+    idx = rng.integers(0, n, size=(n_resamples, n))
+    flat = idx + (np.arange(n_resamples) * n)[:, None]
+    return np.bincount(flat.ravel(), minlength=n_resamples * n).reshape(n_resamples, n).astype(np.float64)
+
+
+def permutation_indices(rng, n_resamples, n):
+    return rng.random((n_resamples, n)).argsort(axis=1)
+
+
+def _bootstrap_batch(X, y, n_resamples, seed):
+    # Weighted sums over the resample counts turn every resample into one matmul
+    rng = np.random.default_rng(seed)
+    n = len(y)
+    W = bootstrap_counts(rng, n_resamples, n)
+
+    sx = W @ X
+    sxx = W @ (X * X)
+    sxy = W @ (X * y[:, None])
+    sy = (W @ y)[:, None]
+    syy = (W @ (y * y))[:, None]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = n * sxy - sx * sy
+        var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+        corr = cov / np.sqrt(var)
+    corr[~(var > 1e-12)] = np.nan
+    return corr
+
+
+def _permutation_batch(Z, yz, n_resamples, seed):
+    # Shuffling Win leaves its mean/std unchanged, so the standardized labels just permute
+    rng = np.random.default_rng(seed)
+    idx = permutation_indices(rng, n_resamples, len(yz))
+    return yz[idx] @ Z
+
+
+def _run_batches(func, data, n_resamples, seed, batch_size, workers):
+    sizes = [batch_size] * (n_resamples // batch_size)
+    if n_resamples % batch_size:
+        sizes.append(n_resamples % batch_size)
+    seeds = seed.spawn(len(sizes))
+
+    if workers and workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(func, *zip(*[(*data, size, s) for size, s in zip(sizes, seeds)])))
+    else:
+        parts = [func(*data, size, s) for size, s in zip(sizes, seeds)]
+    return np.vstack(parts)
+
+
+@timed('significance')
+def win_significance(df, columns, n_resamples=10000, confidence=0.95, seed=None,
+                     batch_size=BATCH_SIZE, workers=None, target='Win'):
+    """
+    Bootstrap confidence intervals and permutation p-values for stat-vs-Win correlations.
+
+    Every stat is handled at once per batch of resamples; batches can be spread over a
+    process pool with `workers`. Results are reproducible for a given seed regardless of
+    the number of workers.
+    """
+    columns = list(columns)
+    X = _matrix(df, columns)
+    y = df[target].to_numpy(dtype=np.float64)
+    seed = np.random.SeedSequence(seed)
+    boot_seed, perm_seed = seed.spawn(2)
+
+    observed = win_correlations(df, columns, target=target)['Correlation'].to_numpy()
+
+    boot = _run_batches(_bootstrap_batch, (X, y), n_resamples, boot_seed, batch_size, workers)
+    alpha = (1 - confidence) / 2
+    with np.errstate(invalid='ignore'):
+        low, high = np.nanquantile(boot, [alpha, 1 - alpha], axis=0)
+
+    perm = _run_batches(_permutation_batch, (_standardize(X), _standardize(y)),
+                        n_resamples, perm_seed, batch_size, workers)
+    # Two-sided, with the +1 correction so p is never exactly zero
+    extreme = (np.abs(perm) >= np.abs(observed) - 1e-12).sum(axis=0)
+    p_value = (extreme + 1) / (n_resamples + 1)
+    p_value[np.isnan(observed)] = np.nan
+
+    players, stat_names = zip(*(split_column(col) for col in columns))
+    return pd.DataFrame({
+        'Column': columns,
+        'Player': list(players),
+        'Stat': list(stat_names),
+        'Correlation': observed,
+        'CI_Low': low,
+        'CI_High': high,
+        'P_Value': p_value,
+    })
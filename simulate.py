@@ -0,0 +1,184 @@
+import argparse
+import re
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from game_store import add_log_args, load_games, stats
+from significance import _run_batches
+from tidy import split_players
+from win_model import L2_PENALTY, _sigmoid, fit, raw_weights
+
+# Games per batch; keeps each batch's (scenarios x games) probabilities a few MB per scenario
+BATCH_SIZE = 100_000
+DEFAULT_GAMES = 1_000_000
+
+# One what-if: which block's lines each block draws from, then X * scale + shift
+Scenario = namedtuple('Scenario', ['name', 'source', 'scale', 'shift'])
+
+_CHANGE = re.compile(r'^(?P<column>\w+?)\s*(?P<op>[+*-])\s*(?P<value>\d+(?:\.\d*)?|\.\d+)$')
+
+
+def stat_blocks(df):
+    """
+    Every team player's stat lines, plus the opponent totals, as (names, columns, lines).
+
+    Each block keeps whole lines (one row per game the player logged), so a simulated
+    game never pairs one night's points with another night's makes.
+    """
+    team, _ = split_players(df)
+    names = team + ['Opponent']
+    columns = [[f'{player}_{stat}' for stat in stats] for player in team] + [[f'Opp_Total_{stat}' for stat in stats]]
+    lines = []
+    for name, cols in zip(names, columns):
+        block = df[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        block = block[~np.isnan(block).any(axis=1)]
+        if not len(block):
+            raise ValueError(f'no complete stat lines for {name}')
+        lines.append(block)
+    return names, columns, lines
+
+
+def parse_scenario(text, names, columns):
+    """
+    A scenario from a comma-separated list of changes, e.g. 'AbuTalibaan_Rebounds+3',
+    'Opp_Total_Points-5', 'Glo4Prezz_Assists*1.2' or 'Yurselln=MajinKemboi' (Yurselln's
+    slot gets MajinKemboi's stat lines).
+    """
+    flat = [col for cols in columns for col in cols]
+    source = np.arange(len(names))
+    scale = np.ones(len(flat))
+    shift = np.zeros(len(flat))
+    for change in filter(None, (part.strip() for part in text.split(','))):
+        if '=' in change:
+            slot, player = (part.strip() for part in change.split('=', 1))
+            if slot not in names or player not in names:
+                raise ValueError(f"unknown player in '{change}' (players: {', '.join(names)})")
+            source[names.index(slot)] = names.index(player)
+            continue
+        match = _CHANGE.match(change)
+        if not match or match['column'] not in flat:
+            raise ValueError(f"can't read '{change}': expected COLUMN+N, COLUMN-N, COLUMN*N or PLAYER=PLAYER")
+        j, value = flat.index(match['column']), float(match['value'])
+        if match['op'] == '*':
+            scale[j] *= value
+            shift[j] *= value
+        else:
+            shift[j] += value if match['op'] == '+' else -value
+    return Scenario(text, source, scale, shift)
+
+
+def _simulate_batch(lines, sources, scales, shifts, weights, intercept, n_games, seed):
+    # One uniform per (game, block) is shared by every scenario (common random numbers),
+    # so the differences between scenarios carry far less noise than the rates themselves
+    rng = np.random.default_rng(seed)
+    u = rng.random((n_games, len(lines)))
+    width = lines[0].shape[1]
+    rows = {}
+
+    p = np.empty((len(sources), n_games))
+    for s, source in enumerate(sources):
+        logit = np.full(n_games, intercept)
+        for b, src in enumerate(source):
+            cols = slice(b * width, (b + 1) * width)
+            # The model is linear, so each possible line is scored once and games just look it up
+            table = np.maximum(lines[src] * scales[s, cols] + shifts[s, cols], 0) @ weights[cols]
+            if (b, src) not in rows:
+                rows[b, src] = (u[:, b] * len(lines[src])).astype(np.intp)
+            logit += table[rows[b, src]]
+        p[s] = _sigmoid(logit)
+    diff = p - p[0]
+    return np.concatenate([p.sum(axis=1), (p * p).sum(axis=1), (diff * diff).sum(axis=1)])[None, :]
+
+
+def simulate(df, scenarios=(), n_games=DEFAULT_GAMES, seed=None, batch_size=BATCH_SIZE, workers=None,
+             model=None, l2=L2_PENALTY):
+    """
+    Expected win rate over `n_games` simulated games for the log as-is and each scenario.
+
+    Every game draws one logged line per player (and one opponent total line), applies the
+    scenario's changes and is scored with the win model; the win rate is the mean win
+    probability. Batches can be spread over a process pool with `workers`, with the same
+    results for a given seed however many workers run.
+    """
+    names, columns, lines = stat_blocks(df)
+    flat = [col for cols in columns for col in cols]
+    model = model or fit(df, flat, l2)
+    weights, intercept = raw_weights(model)
+
+    scenarios = [parse_scenario('', names, columns)] + [
+        s if isinstance(s, Scenario) else parse_scenario(s, names, columns) for s in scenarios]
+    sources = np.array([s.source for s in scenarios])
+    scales = np.array([s.scale for s in scenarios])
+    shifts = np.array([s.shift for s in scenarios])
+
+    sums = _run_batches(_simulate_batch, (tuple(lines), sources, scales, shifts, weights, intercept),
+                        n_games, np.random.SeedSequence(seed), batch_size, workers).sum(axis=0)
+    total, squares, diff_squares = np.split(sums, 3)
+    rate = total / n_games
+    change = rate - rate[0]
+    return pd.DataFrame({
+        'Scenario': ['As logged'] + [s.name for s in scenarios[1:]],
+        'Win_Rate': rate,
+        'Std_Error': np.sqrt(np.maximum(squares / n_games - rate ** 2, 0) / n_games),
+        'Change': change,
+        'Change_SE': np.sqrt(np.maximum(diff_squares / n_games - change ** 2, 0) / n_games),
+    })
+
+
+def default_scenarios(df):
+    # +3 boards and +3 assists for each player, and holding opponents to 5 fewer points
+    team, _ = split_players(df)
+    return ([f'{player}_{stat}+3' for player in team for stat in ('Rebounds', 'Assists')] +
+            ['Opp_Total_Points-5'])
+
+
+def print_report(results, model, n_games, seconds, n_logged):
+    print("=" * 80)
+    print(f"WIN PROBABILITY WHAT-IFS ({n_games:,} simulated games, {seconds:.2f}s)")
+    print("=" * 80)
+    base = results.iloc[0]
+    print(f"As logged: {base['Win_Rate']:.1%} expected win rate (±{base['Std_Error']:.2%})")
+    print()
+    for _, row in results.iloc[1:].iterrows():
+        print(f"  {row['Scenario']:<40} {row['Win_Rate']:6.1%}   {row['Change']:+.1%} (±{row['Change_SE']:.2%})")
+
+    print("\nWIN MODEL (change in log-odds per standard deviation):")
+    coef = pd.Series(model.coef, index=model.columns)
+    for col, value in coef.reindex(coef.abs().sort_values(ascending=False).index).head(8).items():
+        print(f"  {col:<28} {value:+.3f}")
+    print(f"\nThe ± is simulation noise only; the model is fitted on {n_logged} logged games "
+          "and is far less certain than that.")
+    print("=" * 80)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Estimate how stat changes would move our win probability.')
+    parser.add_argument('scenarios', nargs='*',
+                        help="what-ifs such as 'AbuTalibaan_Rebounds+3', 'Opp_Total_Points-5', "
+                             "'Glo4Prezz_Assists*1.2', 'Yurselln=MajinKemboi'; comma-join to combine")
+    parser.add_argument('--games', type=int, default=DEFAULT_GAMES, help="games to simulate")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="spread batches over this many processes")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--l2', type=float, default=L2_PENALTY, help="ridge penalty of the win model")
+    args = add_log_args(parser).parse_args(argv)
+
+    df = load_games(args.log)
+    names, columns, _ = stat_blocks(df)
+    scenario_texts = args.scenarios or default_scenarios(df)
+    try:
+        scenarios = [parse_scenario(text, names, columns) for text in scenario_texts]
+    except ValueError as e:
+        parser.error(str(e))
+
+    model = fit(df, [col for cols in columns for col in cols], args.l2)
+    start = time.perf_counter()
+    results = simulate(df, scenarios, args.games, args.seed, args.batch_size, args.workers, model=model)
+    print_report(results, model, args.games, time.perf_counter() - start, len(df))
+
+
+if __name__ == '__main__':
+    main()
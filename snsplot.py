@@ -1,13 +1,12 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
+import os
 
-# Load your data
-df = pd.read_csv('./data/pro_am_games.csv')
+import numpy as np
 
-# Convert Result to binary (1 for Win, 0 for Loss)
-df['Win'] = (df['Result'] == 'W').astype(int)
+from correlations import win_correlations
+from game_store import add_log_args, load_games
+from instrument import add_profile_args, profile_from_args, timed
+from rendering import FigureJob, add_render_args, render_from_args
 
 # Select your team's stat columns (excluding opponent stats for cleaner visualization)
 your_team_stats = [
@@ -19,27 +18,259 @@ your_team_stats = [
     'Win'
 ]
 
-# Convert grades to numeric (A+ = 4.3, A = 4.0, etc.)
-grade_map = {
-    'A+': 4.3, 'A': 4.0, 'A-': 3.7,
-    'B+': 3.3, 'B': 3.0, 'B-': 2.7,
-    'C+': 2.3, 'C': 2.0, 'C-': 1.7,
-    'D+': 1.3, 'D': 1.0, 'D-': 0.7,
-    'F': 0.0
-}
+# Above this many games the pairplot switches to binned panels (see binned_pairs)
+LARGE_GAMES = 2000
+DEFAULT_BINS = 30
+KDE_GRID = 256
+
+# Inches per panel and the fixed margins around the grid in binned mode
+PANEL_SIZE = 1.6
+_MARGINS = {'left': 1.0, 'right': 0.3, 'top': 0.6, 'bottom': 0.9}
+
+
+def team_stat_frame(df):
+    # Use the loader's numeric grades (A+ = 4.3, A = 4.0, etc.)
+    team = df[your_team_stats].copy()
+    grade_columns = [col for col in your_team_stats if col.endswith('_Grade')]
+    for col in grade_columns:
+        team[col] = df[f'{col}_Numeric']
+    # Win is stored as bool; keep the 0/1 hue levels and legend
+    team['Win'] = team['Win'].astype(int)
+    return team
 
-grade_columns = [col for col in df.columns if 'Grade' in col]
-for col in grade_columns:
-    df[col] = df[col].map(grade_map)
 
 # Create pairplot
-sns.pairplot(df[your_team_stats], hue='Win', palette={0: 'red', 1: 'green'}, 
-             diag_kind='kde', plot_kws={'alpha': 0.6})
-plt.suptitle('Team Stats vs Wins', y=1.02)
-plt.tight_layout()
-plt.show()
-
-# Calculate correlations with Win to see which stats matter most
-correlations = df[your_team_stats].corr()['Win'].sort_values(ascending=False)
-print("\nCorrelation with Wins:")
-print(correlations)
\ No newline at end of file
+def plot_pairplot(team):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    grid = sns.pairplot(team, hue='Win', palette={0: 'red', 1: 'green'},
+                        diag_kind='kde', plot_kws={'alpha': 0.6})
+    plt.suptitle('Team Stats vs Wins', y=1.02)
+    plt.tight_layout()
+    return grid.figure
+
+
+def select_columns(columns, patterns):
+    """
+    The stat columns named by `patterns`: exact names, player names, stat names or
+    shell-style wildcards ('Abu*', '*_Rebounds'). Win is always kept for the hue.
+    """
+    from fnmatch import fnmatchcase
+
+    picked = [col for col in columns if col != 'Win' and any(
+        fnmatchcase(col, pattern) or col.startswith(f'{pattern}_') or col.endswith(f'_{pattern}')
+        for pattern in patterns)]
+    if not picked:
+        raise ValueError(f"no columns match {', '.join(patterns)}")
+    return picked + ['Win']
+
+
+def _bin_edges(values, bins):
+    # One bin per distinct value when there are few (counts, grades); even bins otherwise
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return np.array([0.0, 1.0])
+    levels = np.unique(values)
+    if len(levels) <= bins:
+        mids = (levels[1:] + levels[:-1]) / 2
+        pad = (levels[1] - levels[0]) / 2 if len(levels) > 1 else 0.5
+        return np.concatenate([[levels[0] - pad], mids, [levels[-1] + pad]])
+    return np.linspace(levels[0], levels[-1], bins + 1)
+
+
+def fft_kde(values, grid, bandwidth):
+    """
+    Gaussian KDE of `values` on an even `grid`: linear binning, then one FFT convolution.
+
+    O(n + G log G) instead of the O(n * G) of evaluating every kernel at every point.
+    """
+    step = grid[1] - grid[0]
+    pos = (values - grid[0]) / step
+    lo = np.clip(np.floor(pos).astype(np.intp), 0, len(grid) - 2)
+    frac = np.clip(pos - lo, 0, 1)
+    weights = np.bincount(lo, 1 - frac, minlength=len(grid)) + np.bincount(lo + 1, frac, minlength=len(grid))
+
+    # Kernel sampled at every grid offset, wrapped for a circular convolution over a
+    # buffer twice the grid so nothing wraps into view
+    size = 2 * len(grid)
+    offsets = np.minimum(np.arange(size), size - np.arange(size)) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    density = np.fft.irfft(np.fft.rfft(weights, size) * np.fft.rfft(kernel), size)[:len(grid)]
+    return np.maximum(density, 0) / len(values)
+
+
+@timed('pairplot.bin')
+def binned_pairs(team, columns=None, bins=DEFAULT_BINS, hue='Win'):
+    """
+    Everything the binned pairplot draws, reduced to arrays whose size doesn't grow with the log.
+
+    Each off-diagonal panel is a (loss, win) pair of 2D histograms from one bincount per
+    column pair; each diagonal is the per-result KDE (Scott bandwidth, scaled by the
+    result's share of games, like seaborn's default) computed by fft_kde.
+    """
+    columns = [col for col in (columns or list(team.columns)) if col != hue]
+    X = team[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    y = team[hue].to_numpy().astype(np.intp)
+
+    edges = [_bin_edges(X[:, j], bins) for j in range(len(columns))]
+    index = np.column_stack([np.clip(np.searchsorted(e[1:-1], X[:, j], side='right'), 0, len(e) - 2)
+                             for j, e in enumerate(edges)]) if len(columns) else np.empty((len(X), 0))
+    present = ~np.isnan(X)
+
+    pairs = {}
+    for i in range(len(columns)):
+        ni = len(edges[i]) - 1
+        for j in range(i):
+            nj = len(edges[j]) - 1
+            ok = present[:, i] & present[:, j]
+            flat = (y[ok] * ni + index[ok, i]) * nj + index[ok, j]
+            pairs[i, j] = np.bincount(flat, minlength=2 * ni * nj).reshape(2, ni, nj)
+
+    diag = []
+    for j in range(len(columns)):
+        values = X[present[:, j], j]
+        groups = y[present[:, j]]
+        grid = np.linspace(edges[j][0], edges[j][-1], KDE_GRID)
+        dens = np.zeros((2, KDE_GRID))
+        for g in (0, 1):
+            part = values[groups == g]
+            if len(part) > 1 and part.std() > 0:
+                bandwidth = part.std(ddof=1) * len(part) ** -0.2
+                dens[g] = fft_kde(part, grid, bandwidth) * len(part) / len(values)
+        diag.append((grid, dens))
+
+    return {'columns': columns, 'edges': edges, 'pairs': pairs, 'diag': diag, 'games': len(X)}
+
+
+def _panel_rows(binned, rows, first, last):
+    # Draw rows [rows] of the grid on their own figure and return its pixels; tiles of
+    # equal width and margins stack into the full pairplot
+    # An Agg canvas of its own instead of pyplot, so drawing a strip never switches the
+    # backend of the process it runs in (the caller's, when there's one strip)
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.colors import LinearSegmentedColormap
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import MaxNLocator
+
+    columns, edges = binned['columns'], binned['edges']
+    n = len(columns)
+    top = _MARGINS['top'] if first else 0.05
+    bottom = _MARGINS['bottom'] if last else 0.05
+    width = _MARGINS['left'] + _MARGINS['right'] + n * PANEL_SIZE
+    height = top + bottom + len(rows) * PANEL_SIZE
+    fig = Figure(figsize=(width, height), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    axes = fig.subplots(len(rows), n, squeeze=False)
+    fig.subplots_adjust(left=_MARGINS['left'] / width, right=1 - _MARGINS['right'] / width,
+                        bottom=bottom / height, top=1 - top / height, wspace=0.08, hspace=0.08)
+    win_rate_cmap = LinearSegmentedColormap.from_list('win_rate', ['red', 'gold', 'green'])
+
+    for r, i in enumerate(rows):
+        for j in range(n):
+            ax = axes[r, j]
+            if i == j:
+                # Densities stretched onto the row's value range, so the row shares one y scale
+                grid, dens = binned['diag'][i]
+                lo, hi = edges[i][0], edges[i][-1]
+                curves = lo + dens / (dens.max() or 1) * (hi - lo) * 0.95
+                ax.fill_between(grid, curves[0], lo, color='red', alpha=0.35, linewidth=1)
+                ax.fill_between(grid, curves[1], lo, color='green', alpha=0.35, linewidth=1)
+                ax.set_xlim(lo, hi)
+                ax.set_ylim(lo, hi)
+            else:
+                counts = binned['pairs'][i, j] if i > j else binned['pairs'][j, i].transpose(0, 2, 1)
+                total = counts.sum(axis=0)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    rate = counts[1] / total
+                # Color is the win rate in that bin; opacity grows with how many games it holds
+                rgba = win_rate_cmap(np.nan_to_num(rate))
+                rgba[..., 3] = np.where(total > 0, 0.25 + 0.75 * np.log1p(total) / np.log1p(total.max() or 1), 0)
+                ax.imshow(rgba, origin='lower', aspect='auto', interpolation='nearest',
+                          extent=(edges[j][0], edges[j][-1], edges[i][0], edges[i][-1]))
+            # Tick labels only along the outer edge, like seaborn's; a few ticks per axis
+            # keep tick layout (most of the drawing time) cheap
+            edge_row = last and r == len(rows) - 1
+            ax.xaxis.set_major_locator(MaxNLocator(3))
+            ax.yaxis.set_major_locator(MaxNLocator(3))
+            ax.tick_params(labelsize=6, length=2, labelleft=j == 0, labelbottom=edge_row)
+            if j == 0:
+                ax.set_ylabel(columns[i], fontsize=7)
+            if edge_row:
+                ax.set_xlabel(columns[j], fontsize=7)
+    if first:
+        fig.suptitle(f"Team Stats vs Wins ({binned['games']:,} games; color = win rate, "
+                     "opacity = games per bin)", fontsize=12, y=1 - 0.2 / height)
+
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba()).copy()
+
+
+def plot_pairplot_binned(binned, workers=None):
+    """
+    The binned pairplot, drawn as horizontal strips of panel rows in parallel and stacked.
+
+    Returns a figure holding the stacked image at 100 dpi (save it at dpi=100).
+    """
+    import matplotlib.pyplot as plt
+    from concurrent.futures import ProcessPoolExecutor
+
+    n = len(binned['columns'])
+    workers = workers or min(os.cpu_count() or 1, n)
+    strips = [list(rows) for rows in np.array_split(np.arange(n), max(1, min(workers, n))) if len(rows)]
+    args = [(binned, rows, k == 0, k == len(strips) - 1) for k, rows in enumerate(strips)]
+    if workers > 1 and len(strips) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tiles = list(pool.map(_panel_rows, *zip(*args)))
+    else:
+        tiles = [_panel_rows(*a) for a in args]
+
+    image = np.vstack(tiles)
+    fig = plt.figure(figsize=(image.shape[1] / 100, image.shape[0] / 100), dpi=100)
+    fig.figimage(image, 0, 0)
+    return fig
+
+
+def print_report(team):
+    # Calculate correlations with Win to see which stats matter most
+    correlations = win_correlations(team, your_team_stats).set_index('Column')['Correlation']
+    correlations = correlations.rename_axis(None).rename('Win').sort_values(ascending=False)
+    print("\nCorrelation with Wins:")
+    print(correlations)
+
+
+def figures(team, mode='auto', columns=None, bins=DEFAULT_BINS, workers=None):
+    """Pairplot job: seaborn's scatter/KDE grid for small logs, binned panels for large ones."""
+    if columns:
+        team = team[select_columns(list(team.columns), columns)]
+    if mode == 'binned' or (mode == 'auto' and len(team) > LARGE_GAMES):
+        binned = binned_pairs(team, bins=bins)
+        return [FigureJob('pairplot.png', plot_pairplot_binned, (binned, workers), dpi=100)]
+    # 26x26 panels: a lower dpi keeps the PNG a sane size
+    return [FigureJob('pairplot.png', plot_pairplot, (team,), dpi=100)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Exploratory pairplot of all team stats.')
+    parser.add_argument('--mode', choices=['auto', 'scatter', 'binned'], default='auto',
+                        help=f"binned panels for big logs (auto: above {LARGE_GAMES} games)")
+    parser.add_argument('--columns', nargs='+', metavar='PATTERN',
+                        help="only these stats: names, players, stats or wildcards (e.g. Abu* Rebounds)")
+    parser.add_argument('--bins', type=int, default=DEFAULT_BINS, help="max bins per axis in binned mode")
+    args = add_log_args(add_profile_args(add_render_args(parser))).parse_args(argv)
+
+    with profile_from_args(args, 'snsplot'):
+        # Load your data
+        df = load_games(args.log)
+        team = team_stat_frame(df)
+
+        try:
+            jobs = figures(team, args.mode, args.columns, args.bins, args.workers)
+        except ValueError as e:
+            parser.error(str(e))
+        render_from_args(jobs, args)
+        print_report(team)
+
+
+if __name__ == '__main__':
+    main()
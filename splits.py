@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+from accumulator import grade_vocab
+from correlations import numeric_columns, split_column
+from instrument import timed
+
+# Quantiles reported for each result besides the mean; 0.5 is reported as the median
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+def _quantile_name(q):
+    return 'Median' if q == 0.5 else f'Q{q * 100:g}'
+
+
+def _quantiles(S, n, q):
+    # Linear interpolation between order statistics (numpy's and pandas' default);
+    # each row of S is one column sorted, its n present values first
+    last = np.maximum(n - 1, 0)
+    pos = q * last
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, last)
+    rows = np.arange(S.shape[0])
+    a, b, t = S[rows, lo], S[rows, hi], pos - lo
+    diff = b - a
+    out = np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+    out[n == 0] = np.nan
+    return out
+
+
+def _modes(S, n):
+    # Longest run of equal values in each sorted row; the first (smallest) value wins
+    # a tie, as Series.mode().iloc[0] does
+    k, games = S.shape
+    flat = S.ravel()
+    new = np.ones(flat.shape, dtype=bool)
+    new[1:] = flat[1:] != flat[:-1]
+    new[::games] = True
+    starts = np.flatnonzero(new)
+    present = (np.arange(games) < n[:, None]).ravel()
+    lengths = np.bincount((np.cumsum(new) - 1)[present], minlength=len(starts))
+    run_col = starts // games
+    longest = np.maximum.reduceat(lengths, np.searchsorted(run_col, np.arange(k)))
+    best = np.flatnonzero(lengths == longest[run_col])
+    best = best[np.r_[True, run_col[best][1:] != run_col[best][:-1]]]
+    modes = flat[starts[best]]
+    modes[n == 0] = np.nan
+    return modes
+
+
+def _grade_modes(codes):
+    # Most common letter per column from one bincount; argmax keeps the alphabetically
+    # first of tied grades, as Series.mode() on the letters does
+    k = codes.shape[0]
+    known = codes >= 0
+    counts = np.bincount((codes + np.arange(k)[:, None] * len(grade_vocab))[known],
+                         minlength=k * len(grade_vocab)).reshape(k, len(grade_vocab))
+    letters = np.array(grade_vocab, dtype=object)[counts.argmax(axis=1)]
+    return np.where(counts.any(axis=1), letters, None)
+
+
+def _result_block(X, codes):
+    # X and codes hold one stat column per row
+    S = np.sort(X, axis=1)
+    n = (~np.isnan(X)).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(np.isnan(X), 0.0, X).sum(axis=1) / n
+    if not S.shape[1]:
+        S = np.full((len(X), 1), np.nan)
+    return n, mean, S, _grade_modes(codes)
+
+
+@timed('result_splits')
+def result_splits(df, columns=None, quantiles=QUANTILES, target='Win'):
+    """
+    Count, mean, quantiles and mode of every stat column in wins and losses, plus the
+    win-minus-loss differences, in one pass.
+
+    The games are partitioned by result once (a stable sort), and each partition is
+    sorted once down every column: the quantiles and modes all come from that sort.
+    `<player>_Grade_Numeric` rows also carry the most common letter grade (Win_Grade,
+    Loss_Grade). One row per column, indexed by Column, with Player and Stat as in
+    correlations.win_correlations.
+    """
+    columns = list(columns) if columns is not None else numeric_columns(df, exclude=(target, 'Game #'))
+    win = df[target].to_numpy(dtype=bool)
+    order = np.argsort(win, kind='stable')
+    losses = len(win) - int(win.sum())
+
+    # One row per stat column, games in result order, so every per-column pass is contiguous
+    X = np.ascontiguousarray(df[columns].to_numpy(dtype=np.float64, na_value=np.nan)[order].T)
+    letter_cols = [col[:-len('_Numeric')] if col.endswith('_Grade_Numeric') else None for col in columns]
+    codes = np.full((len(columns), len(df)), -1, dtype=np.int8)
+    for j, col in enumerate(letter_cols):
+        if col in df:
+            codes[j] = pd.Categorical(df[col], categories=grade_vocab).codes[order]
+
+    parts = {'Loss': _result_block(X[:, :losses], codes[:, :losses]),
+             'Win': _result_block(X[:, losses:], codes[:, losses:])}
+
+    players, stat_names = zip(*(split_column(col) for col in columns)) if columns else ((), ())
+    out = {'Player': list(players), 'Stat': list(stat_names)}
+    for result in ('Win', 'Loss'):
+        out[f'{result}_Games'] = parts[result][0]
+    for result in ('Win', 'Loss'):
+        out[f'{result}_Avg'] = parts[result][1]
+    out['Diff'] = out['Win_Avg'] - out['Loss_Avg']
+    for q in quantiles:
+        for result in ('Win', 'Loss'):
+            n, _, S, _ = parts[result]
+            out[f'{result}_{_quantile_name(q)}'] = _quantiles(S, n, q)
+    if 0.5 in quantiles:
+        out['Median_Diff'] = out['Win_Median'] - out['Loss_Median']
+    for result in ('Win', 'Loss'):
+        n, _, S, _ = parts[result]
+        out[f'{result}_Mode'] = _modes(S, n)
+    for result in ('Win', 'Loss'):
+        out[f'{result}_Grade'] = parts[result][3]
+    return pd.DataFrame(out, index=pd.Index(columns, name='Column'))
+
+
+def player_splits(splits, players, stats, fields=('Win_Avg', 'Loss_Avg', 'Diff')):
+    """Rows of result_splits() for every (player, stat), indexed that way (as tidy.win_loss_means is)."""
+    columns = [f'{player}_{stat}' for player in players for stat in stats]
+    index = pd.MultiIndex.from_product([players, stats], names=['player', 'stat'])
+    return splits.loc[columns, list(fields)].set_axis(index)
@@ -0,0 +1,139 @@
+import argparse
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from game_store import DATA_PATH, format_dates, grade_order, load_games, opp_players, stats
+from tidy import split_players
+
+# Per-result (0 = loss, 1 = win) rates, indexed [result, slot, stat], and grade
+# frequencies, indexed [result, slot, grade]. Slots are the team players then opp1..opp5.
+Profile = namedtuple('Profile', ['rates', 'grade_probs', 'win_rate'])
+
+# Floors keep a stat that was always 0 in the sample from freezing at 0 forever
+_MIN_RATE = 0.1
+_GRADE_PRIOR = 0.5
+
+
+def fit_profile(df):
+    """Fit per-slot Poisson rates and grade frequencies, split by result, from a derived log."""
+    team, _ = split_players(df)
+    slots = team + opp_players
+    win = df['Win'].to_numpy(dtype=bool)
+
+    rates = np.empty((2, len(slots), len(stats)))
+    grade_probs = np.empty((2, len(slots), len(grade_order)))
+    for result, rows in enumerate((~win, win)):
+        counts = df.loc[rows, [f'{slot}_{stat}' for slot in slots for stat in stats]]
+        rates[result] = counts.mean().to_numpy(dtype=np.float64).reshape(len(slots), len(stats))
+
+        grades = df.loc[rows, [f'{slot}_Grade' for slot in slots]]
+        for j, col in enumerate(grades.columns):
+            freq = grades[col].value_counts().reindex(grade_order, fill_value=0).to_numpy()
+            grade_probs[result, j] = (freq + _GRADE_PRIOR) / (freq.sum() + _GRADE_PRIOR * len(grade_order))
+
+    return Profile(np.maximum(np.nan_to_num(rates, nan=_MIN_RATE), _MIN_RATE), grade_probs, float(win.mean()))
+
+
+def _dates(rng, n_games, start):
+    # 25-45 minutes between games, with a 1-3 day break before roughly one game in six
+    gaps = rng.integers(25, 46, n_games).astype(np.int64)
+    breaks = rng.random(n_games) < 1 / 6
+    gaps[breaks] += rng.integers(1, 4, breaks.sum()) * 1440
+    gaps[:1] = 0
+    # Second resolution: a 10M-game log runs past the year 2262 limit of nanosecond stamps
+    start = np.datetime64(start, 's')
+    stamps = pd.Series(start + np.cumsum(gaps).astype('timedelta64[m]'))
+
+    # No games: nothing to stamp, and the next chunk starts where this one would have
+    return format_dates(stamps), stamps.to_numpy()[-1] if n_games else start
+
+
+def generate_games(n_games, win_rate=None, seed=None, players=None, profile=None,
+                   start='2025-11-29 12:00', first_game=1):
+    """
+    Draw a raw game log with the same columns and formats as data/pro_am_games.csv.
+
+    Results are Bernoulli(win_rate); given the result, each slot's FGM and extra points are
+    Poisson and its grade is drawn from that result's grade frequencies, so the usual
+    win correlations show up. Returns (frame, timestamp of the last game).
+    """
+    rng = np.random.default_rng(seed)
+    profile = profile or fit_profile(load_games(DATA_PATH))
+    win_rate = profile.win_rate if win_rate is None else win_rate
+    players = list(players) if players is not None else split_players(load_games(DATA_PATH))[0]
+    slots = players + opp_players
+    if len(slots) != profile.rates.shape[1]:
+        raise ValueError(f'profile has {profile.rates.shape[1] - len(opp_players)} team slots, got {len(players)} players')
+
+    win = rng.random(n_games) < win_rate
+    result = win.astype(np.intp)
+
+    # [game, slot, stat] rates for each game's result, then every count in one draw
+    lam = profile.rates[result]
+    i_points, i_fgm = stats.index('Points'), stats.index('FGM')
+    counts = rng.poisson(lam).astype(np.int64)
+    # Points = 2 per make plus free throws/threes, so a line never has fewer points than 2*FGM
+    extra = np.maximum(lam[:, :, i_points] - 2 * lam[:, :, i_fgm], _MIN_RATE)
+    counts[:, :, i_points] = 2 * counts[:, :, i_fgm] + rng.poisson(extra)
+    counts = np.minimum(counts, np.iinfo(np.uint8).max)
+
+    # Inverse-CDF grade draws, one searchsorted per (result, slot)
+    grade_idx = np.empty((n_games, len(slots)), dtype=np.intp)
+    u = rng.random((n_games, len(slots)))
+    cdf = np.cumsum(profile.grade_probs, axis=2)
+    for r in (0, 1):
+        rows = result == r
+        for j in range(len(slots)):
+            grade_idx[rows, j] = np.minimum(np.searchsorted(cdf[r, j], u[rows, j], side='right'),
+                                            len(grade_order) - 1)
+    grades = np.asarray(grade_order, dtype=object)[grade_idx]
+
+    dates, last = _dates(rng, n_games, start)
+    data = {
+        'Date': dates,
+        'Game #': np.arange(first_game, first_game + n_games),
+        'Result': np.where(win, 'W', 'L'),
+    }
+    for j, slot in enumerate(slots):
+        data[f'{slot}_Grade'] = grades[:, j]
+        for k, stat in enumerate(stats):
+            data[f'{slot}_{stat}'] = counts[:, j, k]
+    return pd.DataFrame(data), last
+
+
+def write_games(path, n_games, chunk_size=100_000, seed=None, **kwargs):
+    """Stream a synthetic log to CSV in chunks, so 10M rows never sit in memory at once."""
+    seeds = np.random.SeedSequence(seed).spawn(-(-n_games // chunk_size) or 1)
+    start = kwargs.pop('start', '2025-11-29 12:00')
+    profile = kwargs.pop('profile', None) or fit_profile(load_games(DATA_PATH))
+    kwargs.setdefault('players', split_players(load_games(DATA_PATH))[0])
+    written = 0
+    with open(path, 'w', newline='') as f:
+        for chunk_seed in seeds:
+            n = min(chunk_size, n_games - written)
+            frame, last = generate_games(n, seed=chunk_seed, profile=profile, start=start,
+                                         first_game=written + 1, **kwargs)
+            frame.to_csv(f, header=written == 0, index=False)
+            written += n
+            start = last + np.timedelta64(35, 'm')
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a synthetic game log with the real log\'s schema.')
+    parser.add_argument('games', type=int, help="number of games to generate")
+    parser.add_argument('--out', default=None, help="CSV path (default: data/synthetic_<games>.csv)")
+    parser.add_argument('--win-rate', type=float, default=None, help="P(win) per game (default: the real log's)")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    out = args.out or f'./data/synthetic_{args.games}.csv'
+    write_games(out, args.games, chunk_size=args.chunk_size, seed=args.seed, win_rate=args.win_rate)
+    print(f"Wrote {args.games} games to {out}")
+
+
+if __name__ == '__main__':
+    main()
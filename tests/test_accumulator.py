@@ -0,0 +1,89 @@
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from accumulator import GameAccumulator, refresh  # noqa: E402
+from game_store import DATA_PATH, derive_columns, load_games, read_chunks  # noqa: E402
+
+LOG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), DATA_PATH)
+
+
+def _copy_log(tmp_path):
+    path = str(tmp_path / 'games.csv')
+    shutil.copyfile(LOG, path)
+    return path
+
+
+def _empty_accumulator(path):
+    return GameAccumulator.from_frame(derive_columns(next(read_chunks(path, 100))).iloc[:0])
+
+
+def test_update_from_csv_only_reads_new_rows(tmp_path):
+    path = _copy_log(tmp_path)
+    acc = _empty_accumulator(path)
+    games = acc.update_from_csv(path)
+    assert games > 0
+    assert acc.source['offset'] == os.path.getsize(path)
+
+    # Nothing appended: nothing to fold in, and no rebuild
+    assert acc.update_from_csv(path) == 0
+
+    with open(path) as f:
+        last = f.read().splitlines()[-1]
+    with open(path, 'a') as f:
+        f.write(last + '\n')
+    assert acc.update_from_csv(path) == 1
+    assert sum(acc.record()) == games + 1
+
+    # A row caught mid-write is left alone, even with every comma in place
+    with open(path, 'a') as f:
+        f.write(last[:-1])
+    assert acc.update_from_csv(path) == 0
+    with open(path, 'a') as f:
+        f.write(last[-1:] + '\n')
+    assert acc.update_from_csv(path) == 1
+    assert acc.total.sum() == _empty_accumulator(path).add_games(load_games(path, use_cache=False)).total.sum()
+
+
+def test_refresh_reuses_saved_state(tmp_path):
+    path = _copy_log(tmp_path)
+    state = str(tmp_path / 'state.npz')
+    first = refresh(path, state)
+    offset = first.source['offset']
+
+    second = refresh(path, state)
+    assert second.source['offset'] == offset == os.path.getsize(path)
+    assert second.record() == first.record()
+
+
+# Three New Years and a leap day: 2025 -> 2029, with 02/29 falling in 2028
+SEASONS = ['11/29 12:23pm', '12/05 1:00pm', '12/20 2:00pm', '01/03 3:00pm', '06/01 4:00pm', '12/01 5:00pm',
+           '01/05 6:00pm', '05/05 7:00pm', '11/11 8:00pm', '01/10 9:00pm', '02/28 9:30pm', '02/29 9:43am',
+           '02/29 10:15am', '03/01 1:00pm', '03/02 2:00pm', '12/30 3:00pm', '01/02 4:00pm', '01/03 5:00pm']
+
+
+def test_update_from_csv_carries_the_year_across_updates(tmp_path, capsys):
+    raw = pd.read_csv(LOG, dtype=str, keep_default_na=False).assign(Date=SEASONS)
+    raw.loc[14, 'tymelxss_Grade'] = 'Q'
+    path = str(tmp_path / 'games.csv')
+    raw.iloc[:11].to_csv(path, index=False)
+    acc = _empty_accumulator(path)
+    acc.update_from_csv(path)
+    raw.iloc[11:].to_csv(path, mode='a', header=False, index=False)
+    assert acc.update_from_csv(path) == 7
+
+    assert (acc.source['year'], acc.source['month'], acc.source['rows']) == (2029, 1, 18)
+    # Only the bad grade is reported, at its row in the whole file; both leap days parse
+    warning = capsys.readouterr().err
+    assert 'row 15: tymelxss_Grade' in warning
+    assert 'Date' not in warning
+
+    whole = load_games(path, use_cache=False)
+    assert whole['Date'].notna().all()
+    full = GameAccumulator.from_frame(whole)
+    assert np.allclose(acc.total, full.total) and acc.record() == full.record()
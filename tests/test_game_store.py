@@ -0,0 +1,77 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from game_store import (DATA_PATH, cache_path_for, check_log, check_schema, csv_dtypes, derive_columns,  # noqa: E402
+                        grade_dtype, load_games, log_view, read_chunks, read_log)
+
+LOG = os.path.join(ROOT, DATA_PATH)
+
+
+def _bad_log(tmp_path):
+    # A grade that isn't one and text in a count
+    raw = pd.read_csv(LOG, dtype=str, keep_default_na=False)
+    raw.loc[2, 'tymelxss_Grade'] = 'Z'
+    raw.loc[15, 'Glo4Prezz_Points'] = 'x'
+    path = str(tmp_path / 'games.csv')
+    raw.to_csv(path, index=False)
+    return path
+
+
+def test_check_schema_flags_a_bad_grade_and_a_text_count(tmp_path):
+    path = _bad_log(tmp_path)
+    raw = pd.read_csv(path, dtype=csv_dtypes(pd.read_csv(path, nrows=0).columns, strict=False))
+    typed, problems = check_schema(raw)
+
+    assert problems[['Row', 'Column', 'Value']].values.tolist() == [
+        [3, 'tymelxss_Grade', 'Z'], [16, 'Glo4Prezz_Points', 'x']]
+    assert problems['Problem'].tolist() == ['is not a letter grade', 'is not a count']
+    assert pd.isna(typed.loc[2, 'tymelxss_Grade'])
+    assert pd.isna(typed.loc[15, 'Glo4Prezz_Points'])
+    assert typed['Glo4Prezz_Points'].notna().sum() == len(typed) - 1
+
+
+def test_read_chunks_matches_read_log(tmp_path):
+    whole = read_log(LOG)
+    # 13 puts a chunk boundary on the first game of the new year
+    for chunk_rows in (1, 4, 13, 100):
+        chunks = pd.concat(read_chunks(LOG, chunk_rows))
+        pd.testing.assert_frame_equal(chunks, whole)
+
+    path = _bad_log(tmp_path)
+    _, problems = check_schema(pd.read_csv(path, dtype=csv_dtypes(pd.read_csv(path, nrows=0).columns, strict=False)))
+    games, streamed = check_log(path, chunk_rows=4)
+    assert games == len(whole)
+    pd.testing.assert_frame_equal(streamed, problems)
+
+
+def test_load_games_keeps_the_compact_types_through_the_cache(tmp_path):
+    fresh = load_games(LOG, cache_dir=str(tmp_path))
+    assert os.path.exists(cache_path_for(LOG, str(tmp_path)))
+    cached = load_games(LOG, cache_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(cached, fresh)
+
+    assert fresh['tymelxss_Grade'].dtype == grade_dtype
+    assert fresh['tymelxss_Points'].dtype == np.uint8
+    assert fresh['Win'].dtype == bool
+    assert pd.api.types.is_datetime64_any_dtype(fresh['Date'])
+    # Written back out, the typed frame is the CSV again
+    raw = pd.read_csv(LOG, dtype=str, keep_default_na=False)
+    assert (log_view(fresh).astype(str).to_numpy() == raw.to_numpy()).all()
+
+
+def test_derive_columns_widens_counts_that_need_it():
+    raw = read_log(LOG).head(3).copy()
+    for opp in ('opp1', 'opp2', 'opp3', 'opp4', 'opp5'):
+        raw[f'{opp}_Points'] = np.float32(60)
+    raw.loc[1, 'tymelxss_Assists'] = np.nan
+    df = derive_columns(raw)
+    # Five uint8 lines of 60 sum past 255 without wrapping
+    assert df['Opp_Total_Points'].tolist() == [300, 300, 300]
+    assert df['Opp_Total_Points'].dtype == np.uint16
+    assert df['tymelxss_Assists'].dtype == np.float32
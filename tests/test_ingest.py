@@ -0,0 +1,46 @@
+import os
+import sys
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from game_store import DATA_PATH  # noqa: E402
+from ingest import log_columns, validate_games  # noqa: E402
+
+LOG = os.path.join(ROOT, DATA_PATH)
+
+
+def _upload(dates):
+    raw = pd.read_csv(LOG, dtype=str, keep_default_na=False)
+    last = int(raw['Game #'].astype(int).max())
+    rows = raw.tail(len(dates)).reset_index(drop=True)
+    rows['Game #'] = [str(last + 1 + i) for i in range(len(dates))]
+    rows['Date'] = dates
+    return rows, last
+
+
+def test_validate_games_accepts_leap_day():
+    rows, last = _upload(['02/29 7:00pm'])
+    valid, errors = validate_games(rows, log_columns(LOG), last)
+    assert errors == []
+    assert valid['Date'].tolist() == ['02/29 7:00pm']
+
+
+def test_validate_games_rejects_bad_values():
+    rows, last = _upload(['02/30 7:00pm', '11/29 1:08pm'])
+    rows.loc[0, 'Result'] = 'X'
+    rows.loc[1, 'Game #'] = str(last)
+    _, errors = validate_games(rows, log_columns(LOG), last)
+    assert "row 1: Result 'X' must be W or L" in errors
+    assert 'row 1: Date must look like 11/29 12:23pm' in errors
+    assert f'row 2: Game # must be a new whole number after {last}' in errors
+
+
+def test_validate_games_reads_a_blank_grade_as_missing():
+    rows, last = _upload(['11/29 1:08pm'])
+    rows.loc[0, 'Glo4Prezz_Grade'] = ''
+    valid, errors = validate_games(rows, log_columns(LOG), last)
+    assert errors == []
+    assert valid['Glo4Prezz_Grade'].isna().all()
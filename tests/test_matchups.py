@@ -0,0 +1,47 @@
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import matchups  # noqa: E402
+from game_store import DATA_PATH, derive_columns, load_games  # noqa: E402
+from matchups import KDTree, MatchupIndex  # noqa: E402
+from synth import fit_profile, generate_games  # noqa: E402
+from tidy import split_players  # noqa: E402
+
+
+def _games(tmp_path, n):
+    df = load_games(os.path.join(ROOT, DATA_PATH), cache_dir=str(tmp_path))
+    raw, _ = generate_games(n, seed=0, profile=fit_profile(df), players=split_players(df)[0])
+    return derive_columns(raw)
+
+
+def test_kdtree_candidates_cover_the_nearest_leaves():
+    points = np.random.default_rng(0).normal(size=(5000, 3))
+    tree = KDTree(points, leaf_size=16)
+    q = points[123]
+    found = tree.order[tree.candidates(q, 100)]
+    assert len(found) >= 100
+    assert len(set(found)) == len(found)
+    assert 123 in found
+
+
+def test_matchup_index_ranks_candidates_on_every_feature(tmp_path, monkeypatch):
+    monkeypatch.setattr(matchups, 'cKDTree', None)
+    games = _games(tmp_path, 3000)
+    queries = games.iloc[:50]
+
+    # Every game a candidate: the exact k nearest by full-feature distance
+    dist, idx = MatchupIndex(games, candidates=None).query_many(queries, 5)
+    points = MatchupIndex(games, candidates=None).points
+    d2 = ((points[:50, None, :] - points[None]) ** 2).sum(axis=2)
+    assert np.allclose(dist, np.sqrt(np.sort(d2, axis=1)[:, :5]))
+
+    # The projected tree finds nearly all of them from a tenth of the games
+    _, approx = MatchupIndex(games, candidates=300).query_many(queries, 5)
+    recall = np.mean([len(set(a) & set(b)) / 5 for a, b in zip(approx, idx)])
+    assert recall >= 0.8
+    assert (approx[:, 0] == np.arange(50)).all()
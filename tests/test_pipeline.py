@@ -0,0 +1,60 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pipeline import Pipeline  # noqa: E402
+
+
+def _pipeline(calls):
+    p = Pipeline()
+
+    @p.stage('load')
+    def load():
+        calls.append('load')
+        return 2
+
+    @p.stage('shared', deps=['load'])
+    def shared(x):
+        calls.append('shared')
+        return x * 10
+
+    @p.stage('left', deps=['load', 'shared'])
+    def left(x, s):
+        calls.append('left')
+        return x + s
+
+    @p.stage('right', deps=['shared'])
+    def right(s):
+        calls.append('right')
+        return s + 1
+
+    return p
+
+
+def test_run_computes_each_shared_stage_once():
+    calls = []
+    results = _pipeline(calls).run(['left', 'right'])
+    assert calls == ['load', 'shared', 'left', 'right']
+    assert (results['left'], results['right']) == (22, 21)
+
+
+def test_run_reuses_precomputed_stages():
+    calls = []
+    results = _pipeline(calls).run(['right'], {'shared': 5})
+    assert calls == ['right']
+    assert results['right'] == 6
+
+
+def test_order_rejects_unknown_stages_and_cycles():
+    p = _pipeline([])
+    with pytest.raises(KeyError):
+        p.order(['missing'])
+
+    p.stage('a', deps=['b'])(lambda b: b)
+    p.stage('b', deps=['a'])(lambda a: a)
+    with pytest.raises(ValueError):
+        p.order(['a'])
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rolling import current_streak, rolling_splits, rolling_win_correlations, streaks  # noqa: E402
+
+
+def _games(n=40):
+    rng = np.random.default_rng(5)
+    points = rng.integers(0, 30, n).astype(np.float64)
+    points[[3, 17]] = np.nan
+    return pd.DataFrame({'A_Points': points, 'A_Assists': rng.integers(0, 10, n), 'Win': rng.integers(0, 2, n) == 1})
+
+
+def test_rolling_matches_each_window_computed_alone():
+    df = _games()
+    columns = ['A_Points', 'A_Assists']
+    corr = rolling_win_correlations(df, columns, 8)
+    splits = rolling_splits(df, columns, 8)
+
+    assert corr.iloc[:7].isna().all().all()
+    for end in range(7, len(df)):
+        window = df.iloc[end - 7:end + 1]
+        for col in columns:
+            games = window[[col, 'Win']].dropna()
+            expected = np.corrcoef(games[col], games['Win'])[0, 1]
+            assert np.isclose(corr.loc[end, col], expected, equal_nan=True)
+            win_avg = games.loc[games['Win'], col].mean()
+            assert np.isclose(splits.loc[end, ('Win_Avg', col)], win_avg, equal_nan=True)
+            assert np.isclose(splits.loc[end, ('Diff', col)], win_avg - games.loc[~games['Win'], col].mean(),
+                              equal_nan=True)
+
+
+def test_streaks_and_current_streak():
+    df = pd.DataFrame({'Win': [True, True, False, True, True, True, False, False]})
+    runs = streaks(df)
+    assert runs['Result'].tolist() == ['W', 'L', 'W', 'L']
+    assert runs['Length'].tolist() == [2, 1, 3, 2]
+    assert current_streak(df).tolist() == [1, 2, -1, 1, 2, 3, -1, -2]
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from significance import permutation_indices, win_significance  # noqa: E402
+
+
+def _games():
+    rng = np.random.default_rng(7)
+    win = rng.integers(0, 2, 30)
+    return pd.DataFrame({
+        'A_Points': rng.integers(0, 30, 30) + 8 * win,
+        'A_Assists': rng.integers(0, 10, 30),
+        'Win': win,
+    })
+
+
+def test_win_significance_permutation_p_value_is_reproducible():
+    df = _games()
+    columns = ['A_Points', 'A_Assists']
+    table = win_significance(df, columns, n_resamples=500, seed=11, batch_size=200)
+
+    # The same shuffles one at a time: each batch has its own child of the permutation seed
+    _, perm_seed = np.random.SeedSequence(11).spawn(2)
+    win = df['Win'].to_numpy(dtype=np.float64)
+    shuffles = np.vstack([permutation_indices(np.random.default_rng(s), size, len(df))
+                          for size, s in zip([200, 200, 100], perm_seed.spawn(3))])
+    for column, p_value in zip(columns, table['P_Value']):
+        x = df[column].to_numpy(dtype=np.float64)
+        observed = abs(np.corrcoef(x, win)[0, 1])
+        extreme = sum(abs(np.corrcoef(x, win[idx])[0, 1]) >= observed - 1e-12 for idx in shuffles)
+        assert p_value == (extreme + 1) / 501
+
+    again = win_significance(df, columns, n_resamples=500, seed=11, batch_size=200, workers=2)
+    pd.testing.assert_frame_equal(table, again)
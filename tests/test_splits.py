@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from game_store import DATA_PATH, load_games  # noqa: E402
+from splits import result_splits  # noqa: E402
+
+LOG = os.path.join(ROOT, DATA_PATH)
+
+
+def test_result_splits_matches_pandas_per_result(tmp_path):
+    df = load_games(LOG, cache_dir=str(tmp_path))
+    df['tymelxss_Points'] = df['tymelxss_Points'].astype(np.float64)
+    df.loc[[0, 5], 'tymelxss_Points'] = np.nan
+    columns = ['tymelxss_Points', 'Glo4Prezz_Rebounds', 'tymelxss_Grade_Numeric', 'Opp_Total_Points']
+    table = result_splits(df, columns)
+
+    for result, games in (('Win', df[df['Win']]), ('Loss', df[~df['Win']])):
+        for col in columns:
+            values = games[col].dropna()
+            row = table.loc[col]
+            assert row[f'{result}_Games'] == len(values)
+            assert np.isclose(row[f'{result}_Avg'], values.mean())
+            assert np.isclose(row[f'{result}_Median'], values.median())
+            assert np.isclose(row[f'{result}_Q25'], values.quantile(0.25))
+            assert np.isclose(row[f'{result}_Q75'], values.quantile(0.75))
+            assert row[f'{result}_Mode'] == values.mode().iloc[0]
+        grades = games['tymelxss_Grade'].dropna().astype(str)
+        assert table.loc['tymelxss_Grade_Numeric', f'{result}_Grade'] == grades.mode().iloc[0]
+    assert np.isclose(table.loc['Opp_Total_Points', 'Diff'],
+                      table.loc['Opp_Total_Points', 'Win_Avg'] - table.loc['Opp_Total_Points', 'Loss_Avg'])
@@ -0,0 +1,17 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from game_store import DATA_PATH, load_games  # noqa: E402
+from synth import fit_profile, generate_games  # noqa: E402
+from tidy import split_players  # noqa: E402
+
+
+def test_generate_games_with_no_games(tmp_path):
+    df = load_games(os.path.join(ROOT, DATA_PATH), cache_dir=str(tmp_path))
+    empty, _ = generate_games(0, seed=0, profile=fit_profile(df), players=split_players(df)[0])
+    some, _ = generate_games(3, seed=0, profile=fit_profile(df), players=split_players(df)[0])
+    assert empty.empty
+    assert list(empty.columns) == list(some.columns)
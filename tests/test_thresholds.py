@@ -0,0 +1,41 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from thresholds import MIN_GAMES, win_thresholds  # noqa: E402
+
+
+def test_win_thresholds_finds_a_known_cutoff():
+    points = np.arange(1, 13)
+    df = pd.DataFrame({'P_Points': points, 'Opp_Total_Points': -points, 'Win': (points >= 9).astype(int)})
+    table = win_thresholds(df, ['P_Points', 'Opp_Total_Points'], seed=0).set_index('Column')
+
+    assert table.loc['P_Points', 'Direction'] == '>='
+    assert table.loc['P_Points', 'Cutoff'] == 9
+    assert table.loc['Opp_Total_Points', 'Direction'] == '<'
+    assert table.loc['Opp_Total_Points', 'Cutoff'] == -8
+    assert (table['Games'] == 4).all()
+    assert (table['Win_Rate'] == 1.0).all()
+    assert (table['Other_Win_Rate'] == 0.0).all()
+
+
+def test_win_thresholds_matches_a_scan_of_every_cutoff():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({'A_Points': rng.integers(0, 15, 60), 'Win': rng.integers(0, 2, 60)})
+    row = win_thresholds(df, ['A_Points'], n_resamples=0).iloc[0]
+
+    values, win = df['A_Points'].to_numpy(), df['Win'].to_numpy()
+    min_games = max(MIN_GAMES, np.ceil(0.25 * len(df)))
+    best = max(win[side].mean()
+               for cut in np.unique(values)[1:]
+               for side in (values < cut, values >= cut)
+               if side.sum() >= min_games)
+    assert row['Win_Rate'] == best
+    side = values < row['Cutoff'] if row['Direction'] == '<' else values >= row['Cutoff']
+    assert side.sum() == row['Games']
+    assert win[side].mean() == row['Win_Rate']
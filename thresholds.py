@@ -0,0 +1,221 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from correlations import split_column
+from game_store import add_log_args, load_games, stats, team_players
+from instrument import add_profile_args, profile_from_args, timed
+
+# A cutoff must leave at least this share of the games (and MIN_GAMES) on its side, so
+# a perfect record over two games doesn't count as a target
+MIN_SHARE = 0.25
+MIN_GAMES = 3
+
+# Values handled at once (games x columns when sorting, resamples x cells when
+# bootstrapping); bounds memory however many columns or games there are
+BLOCK_CELLS = 1 << 22
+
+
+def _best(rate, allowed, prefer_last):
+    # Index of the highest allowed rate down axis -2; ties go to the split that keeps
+    # more games on the rule's side (the last one for '<', the first for '>=')
+    rate = np.where(allowed, rate, -np.inf)
+    if prefer_last:
+        idx = rate.shape[-2] - 1 - np.argmax(rate[..., ::-1, :], axis=-2)
+    else:
+        idx = np.argmax(rate, axis=-2)
+    found = np.take_along_axis(allowed, idx[..., None, :], axis=-2)[..., 0, :]
+    return idx, found
+
+
+def _sweep(cnt, won, total, total_won, boundary, min_games):
+    """
+    Best '<' and '>=' split of every column from cumulative (weighted) games and wins.
+
+    cnt/won[..., i, j] are the games and wins among the i + 1 lowest values of column j;
+    splitting after position i puts those below the cutoff and the rest at or above it.
+    """
+    above, above_won = total[..., None, :] - cnt, total_won[..., None, :] - won
+    with np.errstate(invalid='ignore', divide='ignore'):
+        below_rate, above_rate = won / cnt, above_won / above
+    below = _best(below_rate, boundary & (cnt >= min_games), prefer_last=True)
+    above = _best(above_rate, boundary & (above >= min_games), prefer_last=False)
+    return (below, below_rate), (above, above_rate)
+
+
+def _pick(rate, idx):
+    return np.take_along_axis(rate, idx[..., None, :], axis=-2)[..., 0, :]
+
+
+def _value_groups(X, win):
+    """
+    Distinct values of every column with the games and wins at each, from one sort.
+
+    Returns (values, games, wins) shaped (distinct, columns) in ascending order, padded
+    with NaN/0 past each column's last value, plus the number of distinct values.
+    """
+    n, k = X.shape
+    order = np.argsort(X, axis=0, kind='stable')
+    S = np.take_along_axis(X, order, axis=0)
+    # NaN sorts last and never starts a group
+    new = ~np.isnan(S)
+    new[1:] &= S[1:] != S[:-1]
+    present = ~np.isnan(S)
+    group = np.cumsum(new, axis=0) - 1
+    distinct = new.sum(axis=0)
+    width = max(int(distinct.max()) if k else 0, 1)
+
+    cell = (group + np.arange(k) * width)[present]
+    games = np.bincount(cell, minlength=k * width).reshape(k, width).T.astype(np.float64)
+    wins = np.bincount(cell, weights=win[order][present], minlength=k * width).reshape(k, width).T
+    values = np.full((width, k), np.nan)
+    rows, cols = np.nonzero(new)
+    values[group[rows, cols], cols] = S[rows, cols]
+    return values, games, wins, distinct
+
+
+@timed('thresholds')
+def win_thresholds(df, columns, n_resamples=200, confidence=0.9, seed=None, target='Win',
+                   min_share=MIN_SHARE, block_cells=BLOCK_CELLS):
+    """
+    The cutoff of every stat column that maximizes the win rate on one side of it.
+
+    Each column is sorted once and collapsed to its distinct values (games and wins at
+    each). The win rate below and at-or-above every cut point then comes from one
+    cumulative sum, so all cutoffs cost one sweep rather than a rescan each, and a
+    column of counts sweeps a few dozen values however many games there are. A
+    bootstrap resample of the games is a multinomial draw over the (value, result)
+    cells, so resampling never touches the games again.
+
+    Returns one row per column: Direction ('<' or '>='), Cutoff (an observed value),
+    Games and Win_Rate on the rule's side, Other_Win_Rate, Lift over the column's overall
+    win rate, the bootstrap interval of the best cutoff (Cutoff_Low, Cutoff_High) and
+    Stability, the share of resamples in which the observed rule still wins more often
+    than the games outside it.
+    """
+    columns = list(columns)
+    win = df[target].to_numpy(dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    alpha = (1 - confidence) / 2
+    block = max(1, block_cells // max(len(win), 1))
+
+    parts = []
+    for start in range(0, len(columns), block):
+        cols = columns[start:start + block]
+        k = np.arange(len(cols))
+        values, games, wins, distinct = _value_groups(
+            df[cols].to_numpy(dtype=np.float64, na_value=np.nan), win)
+        width = len(values)
+        total, total_won = games.sum(axis=0), wins.sum(axis=0)
+        # A cut after value g puts values 0..g below the cutoff (the value g + 1)
+        boundary = np.arange(width)[:, None] < distinct - 1
+        min_games = np.maximum(MIN_GAMES, np.ceil(min_share * total))
+
+        cnt, won = np.cumsum(games, axis=0), np.cumsum(wins, axis=0)
+        (below, below_rate), (above, above_rate) = _sweep(cnt, won, total, total_won, boundary, min_games)
+        rate_b, rate_a = _pick(below_rate, below[0]), _pick(above_rate, above[0])
+
+        # '<' unless '>=' wins more often (or as often over more games)
+        games_b, games_a = _pick(cnt, below[0]), total - _pick(cnt, above[0])
+        use_above = above[1] & (~below[1] | (rate_a > rate_b) | ((rate_a == rate_b) & (games_a > games_b)))
+        found = below[1] | above[1]
+        split = np.where(use_above, above[0], below[0])
+        side = np.where(use_above, games_a, games_b)
+        side_won = np.where(use_above, total_won - won[split, k], won[split, k])
+        upper = np.minimum(split + 1, width - 1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rate = side_won / side
+            other = (total_won - side_won) / (total - side)
+            overall = total_won / total
+
+        # Resample cells: (value, loss) and (value, win) interleaved, padding last so the
+        # draw stops early; a column with no games gets one dummy cell
+        cells = np.stack([games - wins, wins], axis=1).reshape(2 * width, len(cols)).T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pvals = np.where(total[:, None] > 0, cells / total[:, None], 0.0)
+        pvals[total == 0, 0] = 1.0
+        batch = max(1, block_cells // (2 * width * len(cols)))
+
+        cutoffs = np.full((n_resamples, len(cols)), np.nan)
+        holds = np.zeros(len(cols))
+        for done in range(0, n_resamples, batch):
+            size = min(batch, n_resamples - done)
+            draws = rng.multinomial(total.astype(np.int64), pvals, size=(size, len(cols)))
+            draws = draws.reshape(size, len(cols), width, 2).transpose(0, 2, 1, 3).astype(np.float64)
+            Wc, Yc = np.cumsum(draws.sum(axis=3), axis=1), np.cumsum(draws[..., 1], axis=1)
+            (b_best, _), (a_best, _) = _sweep(Wc, Yc, Wc[:, -1], Yc[:, -1], boundary, min_games)
+            idx, ok = np.where(use_above, a_best[0], b_best[0]), np.where(use_above, a_best[1], b_best[1])
+            cutoffs[done:done + size] = np.where(ok, values[np.minimum(idx + 1, width - 1), k], np.nan)
+
+            # The observed rule in this resample
+            t, tw = Wc[:, -1], Yc[:, -1]
+            c, w = _pick(Wc, split[None, :]), _pick(Yc, split[None, :])
+            g, gw = np.where(use_above, t - c, c), np.where(use_above, tw - w, w)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                holds += (gw / g > (tw - gw) / (t - g)).sum(axis=0)
+
+        with np.errstate(invalid='ignore'):
+            if n_resamples:
+                low = np.nanquantile(cutoffs, alpha, axis=0, method='lower')
+                high = np.nanquantile(cutoffs, 1 - alpha, axis=0, method='higher')
+            else:
+                low = high = np.full(len(cols), np.nan)
+        players, stat_names = zip(*(split_column(col) for col in cols))
+        parts.append(pd.DataFrame({
+            'Column': cols,
+            'Player': list(players),
+            'Stat': list(stat_names),
+            'Direction': np.where(found, np.where(use_above, '>=', '<'), None),
+            'Cutoff': np.where(found, values[upper, k], np.nan),
+            'Games': np.where(found, side, 0).astype(np.int64),
+            'Win_Rate': np.where(found, rate, np.nan),
+            'Other_Win_Rate': np.where(found, other, np.nan),
+            'Lift': np.where(found, rate - overall, np.nan),
+            'Cutoff_Low': low,
+            'Cutoff_High': high,
+            'Stability': np.where(found, holds / max(n_resamples, 1), np.nan) if n_resamples else np.nan,
+        }))
+    return pd.concat(parts, ignore_index=True)
+
+
+def threshold_columns():
+    return ([f"{player}_{stat}" for player in team_players for stat in stats] +
+            [f'Opp_Total_{stat}' for stat in stats])
+
+
+def describe(row, unit=None):
+    """'< 62' style text for one row of win_thresholds(), or None when no cutoff was found."""
+    if row['Direction'] is None or pd.isna(row['Cutoff']):
+        return None
+    return f"{row['Direction']} {row['Cutoff']:g}" + (f' {unit}' if unit else '')
+
+
+def print_report(table, top=10):
+    print("=" * 90)
+    print("WIN-RATE THRESHOLDS (best single cutoff per stat)")
+    print("=" * 90)
+    print(f"(A rule must cover at least {MIN_SHARE:.0%} of the games; "
+          f"range is the bootstrap interval of the best cutoff)")
+    print()
+    table = table.dropna(subset=['Cutoff']).sort_values('Lift', ascending=False)
+    for _, row in table.head(top).iterrows():
+        print(f"  {row['Player']} {row['Stat']} {describe(row)}: "
+              f"{row['Win_Rate']:.0%} wins in {row['Games']} games vs {row['Other_Win_Rate']:.0%} otherwise  "
+              f"(cutoff range {row['Cutoff_Low']:g}-{row['Cutoff_High']:g}, holds in {row['Stability']:.0%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Win-rate-maximizing cutoff for every stat.')
+    parser.add_argument('--resamples', type=int, default=200, help="bootstrap resamples for stability")
+    parser.add_argument('--top', type=int, default=10, help="rows to print, by lift")
+    parser.add_argument('--seed', type=int, default=0)
+    args = add_log_args(add_profile_args(parser)).parse_args(argv)
+
+    with profile_from_args(args, 'thresholds'):
+        df = load_games(args.log)
+        print_report(win_thresholds(df, threshold_columns(), n_resamples=args.resamples, seed=args.seed), args.top)
+
+
+if __name__ == '__main__':
+    main()
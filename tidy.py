@@ -0,0 +1,120 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from game_store import grade_codes, grade_numeric
+from instrument import timed
+
+# Per-player stats recorded in the wide CSV, in column order
+player_stats = ['Grade', 'Points', 'Rebounds', 'Assists', 'FGM']
+
+_player_col = re.compile(r'^(?P<player>.+)_(?P<stat>Grade|Points|Rebounds|Assists|FGM)$')
+_opp_slot = re.compile(r'^opp\d+$')
+
+
+def split_players(df):
+    """Return (team_players, opp_players) in the order their columns appear."""
+    team, opp = [], []
+    for col in df.columns:
+        m = _player_col.match(col)
+        if not m or m['player'] == 'Opp_Total':
+            continue
+        player = m['player']
+        side = opp if _opp_slot.match(player) else team
+        if player not in side:
+            side.append(player)
+    return team, opp
+
+
+def _side_block(df, players, stats):
+    cols = [f'{player}_{stat}' for player in players for stat in stats]
+    block = np.empty((len(df), len(cols)), dtype=np.float32)
+    for j, col in enumerate(cols):
+        if col.endswith('_Grade'):
+            numeric = f'{col}_Numeric'
+            values = df[numeric] if numeric in df else pd.Series(grade_numeric(grade_codes(df[col])))
+        else:
+            values = df[col]
+        block[:, j] = values.to_numpy(dtype=np.float32, na_value=np.nan)
+    return block
+
+
+@timed('melt')
+def melt_games(df, stats=None, with_win=True):
+    """
+    Melt the wide game log into one row per (game, player, stat).
+
+    Columns: game_id, side, slot, player, stat, value (+ Win). Keys are categoricals
+    so groupby over players/stats stays cheap however many players there are.
+    """
+    stats = list(stats or player_stats)
+    team, opp = split_players(df)
+    n_games, n_stats = len(df), len(stats)
+
+    all_players = team + opp
+    frames = []
+    for side_code, players in enumerate((team, opp)):
+        if not players:
+            continue
+        block = _side_block(df, players, stats)
+        n_players = len(players)
+        width = n_players * n_stats
+        offset = 0 if side_code == 0 else len(team)
+        slots = np.tile(np.repeat(np.arange(n_players, dtype=np.int16), n_stats), n_games)
+
+        frames.append(pd.DataFrame({
+            'game_id': np.repeat(np.arange(n_games, dtype=np.int32), width),
+            'side': pd.Categorical.from_codes(
+                np.full(n_games * width, side_code, dtype=np.int8), categories=['team', 'opp']),
+            'slot': slots,
+            'player': pd.Categorical.from_codes(slots.astype(np.int32) + offset, categories=all_players),
+            'stat': pd.Categorical.from_codes(
+                np.tile(np.arange(n_stats, dtype=np.int8), n_games * n_players), categories=stats),
+            'value': block.ravel(),
+        }))
+
+    long_df = pd.concat(frames, ignore_index=True)
+
+    if with_win and 'Win' in df:
+        long_df['Win'] = df['Win'].to_numpy(dtype=np.int8)[long_df['game_id'].to_numpy()]
+
+    return long_df
+
+
+def pivot_wide(long_df, n_games=None):
+    """Inverse of melt_games(): one row per game, one `<player>_<stat>` column per pair."""
+    players = long_df['player'].cat.categories
+    stats = long_df['stat'].cat.categories
+    game_ids = long_df['game_id'].to_numpy()
+    if n_games is None:
+        n_games = int(game_ids.max()) + 1 if len(game_ids) else 0
+
+    out = np.full((n_games, len(players) * len(stats)), np.nan, dtype=np.float32)
+    col_idx = long_df['player'].cat.codes.to_numpy() * len(stats) + long_df['stat'].cat.codes.to_numpy()
+    out[game_ids, col_idx] = long_df['value'].to_numpy()
+
+    columns = [f'{player}_{stat}' for player in players for stat in stats]
+    wide = pd.DataFrame(out, columns=columns)
+    # Drop player/stat pairs that never appeared (e.g. a filtered-out side)
+    return wide.loc[:, ~np.isnan(out).all(axis=0)] if len(out) else wide
+
+
+@timed('win_loss_splits')
+def win_loss_means(long_df, side='team', by=()):
+    """
+    Mean of every (player, stat) in wins and losses, in one grouped pass.
+
+    `by` adds leading group keys (e.g. ['team'] for a league table from league.load_league).
+    """
+    rows = long_df[long_df['side'] == side]
+    # Average in float64 so printed splits match the wide-frame means
+    values = rows['value'].astype(np.float64)
+    keys = [rows[key] for key in by] + [rows['player'], rows['stat'], rows['Win']]
+    means = (values.groupby(keys, observed=True)
+             .mean()
+             .unstack('Win')
+             .reindex(columns=[1, 0])
+             .rename(columns={1: 'Win_Avg', 0: 'Loss_Avg'}))
+    means['Diff'] = means['Win_Avg'] - means['Loss_Avg']
+    return means[['Win_Avg', 'Loss_Avg', 'Diff']]
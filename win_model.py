@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from correlations import split_column
+from game_store import CACHE_DIR, add_log_args, load_games, stats
+from significance import _matrix
+from tidy import split_players
+
+MODEL_PATH = os.path.join(CACHE_DIR, 'win_model.npz')
+
+# Ridge penalty on the standardized coefficients: a couple dozen games can't pin down
+# two dozen free slopes on their own
+L2_PENALTY = 1.0
+
+# coef/intercept are on the standardized scale (log-odds per standard deviation);
+# mean/scale are the standardization the fit used
+WinModel = namedtuple('WinModel', ['columns', 'coef', 'intercept', 'mean', 'scale', 'l2',
+                                   'n_games', 'iterations'])
+
+
+def _sigmoid(z):
+    # tanh form never overflows, however far out the logits go
+    return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+def stat_columns(df):
+    """Every team player's box-score stats plus the opponent totals."""
+    team, _ = split_players(df)
+    return [f'{player}_{stat}' for player in team for stat in stats] + [f'Opp_Total_{stat}' for stat in stats]
+
+
+def raw_weights(model):
+    """The model's slopes and intercept on the original (unstandardized) stat scale."""
+    weights = model.coef / model.scale
+    return weights, model.intercept - weights @ model.mean
+
+
+def _irls(Z, y, beta, penalty, max_iter, tol):
+    # Newton steps on the penalized log-likelihood; each one is a weighted least-squares
+    # solve with weights p(1-p). Convex, so a nearby start needs only a couple of steps.
+    for iteration in range(1, max_iter + 1):
+        p = _sigmoid(Z @ beta)
+        grad = Z.T @ (y - p) - penalty * beta
+        hess = (Z * (p * (1 - p))[:, None]).T @ Z
+        hess[np.diag_indices_from(hess)] += penalty
+        step = np.linalg.solve(hess, grad)
+        beta = beta + step
+        if np.abs(step).max() < tol:
+            break
+    return beta, iteration
+
+
+def fit(df, columns=None, l2=L2_PENALTY, warm_start=None, max_iter=50, tol=1e-8):
+    """
+    Ridge-penalized logistic regression of Win on every column at once.
+
+    Unlike the per-stat correlations, collinear stats (Points and FGM) share their credit
+    instead of each claiming it. `warm_start` is an earlier fit on the same columns: its
+    prediction function is the starting point, so refitting after a few new games takes
+    a step or two rather than a fit from zero.
+    """
+    if columns is None:
+        columns = warm_start.columns if warm_start is not None else stat_columns(df)
+    columns = list(columns)
+    X = _matrix(df, columns)
+    y = df['Win'].to_numpy(dtype=np.float64)
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    scale = np.where(std > 0, std, 1.0)
+    Z = np.hstack([np.ones((len(X), 1)), (X - mean) / scale])
+
+    penalty = np.full(Z.shape[1], float(l2))
+    penalty[0] = 0.0  # the intercept is never shrunk
+
+    beta = np.zeros(Z.shape[1])
+    if warm_start is not None and list(warm_start.columns) == columns:
+        # Same prediction function, re-expressed on the new data's standardization
+        weights, intercept = raw_weights(warm_start)
+        beta[1:] = weights * scale
+        beta[0] = intercept + weights @ mean
+
+    beta, iterations = _irls(Z, y, beta, penalty, max_iter, tol)
+    return WinModel(columns, beta[1:], beta[0], mean, scale, float(l2), len(X), iterations)
+
+
+def predict_proba(model, df):
+    """Win probability of every game in `df` under the model."""
+    weights, intercept = raw_weights(model)
+    return _sigmoid(_matrix(df, model.columns) @ weights + intercept)
+
+
+def coefficients(model):
+    """One row per column: its coefficient per standard deviation, per unit, and odds ratio."""
+    players, stat_names = zip(*(split_column(col) for col in model.columns))
+    weights, _ = raw_weights(model)
+    return pd.DataFrame({
+        'Column': model.columns,
+        'Player': players,
+        'Stat': stat_names,
+        'Coefficient': model.coef,
+        'Per_Unit': weights,
+        'Odds_Ratio': np.exp(weights),
+    })
+
+
+def save_model(model, path=MODEL_PATH):
+    meta = {'columns': model.columns, 'intercept': float(model.intercept), 'l2': model.l2,
+            'n_games': int(model.n_games), 'iterations': int(model.iterations)}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp.npz'
+    np.savez(tmp, coef=model.coef, mean=model.mean, scale=model.scale, __meta__=np.array(json.dumps(meta)))
+    os.replace(tmp, path)
+
+
+def load_model(path=MODEL_PATH):
+    """The last saved fit, or None."""
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as z:
+        meta = json.loads(str(z['__meta__']))
+        return WinModel(meta['columns'], z['coef'], meta['intercept'], z['mean'], z['scale'],
+                        meta['l2'], meta['n_games'], meta['iterations'])
+
+
+def refit(df, l2=L2_PENALTY, path=MODEL_PATH):
+    """Fit on the current log, warm-started from the saved fit when it's compatible, and save."""
+    previous = load_model(path)
+    columns = stat_columns(df)
+    if previous is not None and (previous.l2 != l2 or list(previous.columns) != columns):
+        previous = None
+    model = fit(df, columns, l2, warm_start=previous)
+    save_model(model, path)
+    return model, previous
+
+
+def print_report(model, seconds=None, previous=None):
+    print("=" * 80)
+    print(f"WIN MODEL: ridge logistic regression on {len(model.columns)} stats, {model.n_games} games")
+    print("=" * 80)
+    how = f"warm start from {previous.n_games} games" if previous is not None else "cold start"
+    timing = f" in {seconds * 1000:.1f} ms" if seconds is not None else ""
+    print(f"Fitted{timing}: {model.iterations} IRLS step(s), {how}, L2 penalty {model.l2:g}")
+    print()
+    table = coefficients(model)
+    table = table.reindex(table['Coefficient'].abs().sort_values(ascending=False).index)
+    print(f"  {'Stat':<28} {'per SD':>8} {'per unit':>9} {'odds x':>8}")
+    for _, row in table.iterrows():
+        print(f"  {row['Column']:<28} {row['Coefficient']:+8.3f} {row['Per_Unit']:+9.3f} {row['Odds_Ratio']:8.3f}")
+    print("=" * 80)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fit the multivariate win model (warm-started from the last fit).')
+    parser.add_argument('--l2', type=float, default=L2_PENALTY, help="ridge penalty on standardized coefficients")
+    parser.add_argument('--cold', action='store_true', help="ignore the saved fit and start from zero")
+    args = add_log_args(parser).parse_args(argv)
+
+    df = load_games(args.log)
+    if args.cold and os.path.exists(MODEL_PATH):
+        os.remove(MODEL_PATH)
+    start = time.perf_counter()
+    model, previous = refit(df, args.l2)
+    print_report(model, time.perf_counter() - start, previous)
+
+
+if __name__ == '__main__':
+    main()